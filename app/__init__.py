@@ -1,13 +1,12 @@
 import logging
 import time
 import uuid
-from urllib.parse import urlparse
 
 from flask import Flask, g, jsonify, request
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
-from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 from config import get_config
 
@@ -52,6 +51,7 @@ def create_app():
 
     # Initialize MongoDB with retry logic
     init_db(app)
+    ensure_indexes(app)
 
     # Add request middleware
     setup_middleware(app)
@@ -62,37 +62,62 @@ def create_app():
     # Register error handlers
     register_error_handlers(app)
 
-    # Health check endpoint
+    from app.utils.db import get_circuit_breaker, get_pool_stats
+    from app.utils.health import get_health_monitor, readiness_problems
+    from app.utils.load_shedding import priority
+    from app.utils.rate_limit import rate_limit_exempt
+    from app.utils.single_flight import get_single_flight
+
+    # Health check endpoint (served from the background monitor's last ping)
     @app.route("/api/health", methods=["GET"])
+    @rate_limit_exempt
+    @priority("critical")
     def health_check():
-        try:
-            # Test database connection
-            app.db.command("ping")
-            return (
-                jsonify(
-                    {
-                        "status": "healthy",
-                        "database": "connected",
-                        "timestamp": time.time(),
-                        "version": APP_VERSION,
-                        "app": APP_NAME,
-                    }
-                ),
-                200,
-            )
-        except Exception as e:
-            app.logger.error(f"Health check failed: {str(e)}")
-            return (
-                jsonify(
-                    {
-                        "status": "unhealthy",
-                        "database": "disconnected",
-                        "error": str(e),
-                        "version": APP_VERSION,
-                    }
-                ),
-                503,
-            )
+        database = get_health_monitor().status()
+        breaker = get_circuit_breaker()
+        limiter = app.extensions.get("concurrency_limiter")
+        payload = {
+            "status": "healthy",
+            "database": database["database"],
+            "database_latency_ms": database.get("latency_ms"),
+            "checked_at": database.get("checked_at"),
+            "pool": get_pool_stats(),
+            "circuit_breaker": breaker.snapshot() if breaker else None,
+            "concurrency": limiter.snapshot() if limiter else None,
+            "single_flight": get_single_flight().snapshot(),
+            "timestamp": time.time(),
+            "version": APP_VERSION,
+            "app": APP_NAME,
+        }
+
+        if breaker is not None and breaker.state == breaker.OPEN:
+            payload["status"] = "degraded"
+            return jsonify(payload), 503, {"Retry-After": str(breaker.retry_after())}
+
+        if database["database"] != "connected":
+            app.logger.error(f"Health check failed: {database.get('error')}")
+            payload.update({"status": "unhealthy", "error": database.get("error")})
+            return jsonify(payload), 503
+
+        return jsonify(payload), 200
+
+    # Liveness: the worker answers requests; never depends on the database
+    @app.route("/api/health/live", methods=["GET"])
+    @rate_limit_exempt
+    @priority("critical")
+    def liveness_check():
+        return jsonify({"status": "alive", "timestamp": time.time()}), 200
+
+    # Readiness: the worker can serve traffic right now
+    @app.route("/api/health/ready", methods=["GET"])
+    @rate_limit_exempt
+    @priority("critical")
+    def readiness_check():
+        problems = readiness_problems(get_health_monitor().status())
+        if problems:
+            return jsonify({"status": "not ready", "reasons": problems}), 503
+
+        return jsonify({"status": "ready", "timestamp": time.time()}), 200
 
     @app.route("/api/test", methods=["GET"])
     def test_api():
@@ -126,6 +151,8 @@ def create_app():
                     "version": APP_VERSION,
                     "endpoints": {
                         "health": "/api/health",
+                        "liveness": "/api/health/live",
+                        "readiness": "/api/health/ready",
                         "test": "/api/test",
                         "docs": "/api/docs",  # For future API documentation
                     },
@@ -167,39 +194,26 @@ def setup_logging(app):
 
 def init_db(app):
     """Initialize database connection with retry logic"""
+    from app.utils.db import connect_db
+
     max_retries = 3
     retry_delay = 1
 
     for attempt in range(max_retries):
         try:
-            # Parse database name from URI properly
-            parsed_uri = urlparse(app.config["MONGODB_URI"])
-            db_name = parsed_uri.path.lstrip("/") or "interimapp"  # fallback name
-
-            mongodb_client = MongoClient(
-                app.config["MONGODB_URI"],
-                serverSelectionTimeoutMS=5000,  # 5 second timeout
-                connectTimeoutMS=10000,  # 10 second connection timeout
-                maxPoolSize=50,  # Connection pool size
-                retryWrites=True,
-            )
+            mongodb_client = connect_db(app)
 
             # Test the connection
             mongodb_client.admin.command("ping")
 
-            db = mongodb_client[db_name]
-
-            # Make instances available to the app
-            app.mongodb_client = mongodb_client
-            app.db = db
-
-            app.logger.info(f"Database connection established - DB: {db_name}")
+            app.logger.info(f"Database connection established - DB: {app.db.name}")
             return
 
         except ConnectionFailure as e:
             app.logger.warning(
                 f"Database connection attempt {attempt + 1}/{max_retries} failed: {str(e)}"
             )
+            app.mongodb_client.close()
             if attempt < max_retries - 1:
                 time.sleep(retry_delay)
                 retry_delay *= 2  # Exponential backoff
@@ -211,8 +225,42 @@ def init_db(app):
             raise
 
 
+def ensure_indexes(app):
+    """Create the indexes queries rely on, once per database at startup"""
+    from app.models.job import Job
+    from app.utils.exceptions import DatabaseError
+
+    with app.app_context():
+        try:
+            Job.ensure_indexes()
+        except DatabaseError as e:
+            # Queries still work without them, only slower
+            app.logger.error(f"Failed to create indexes: {str(e)}")
+
+
 def setup_jwt_handlers(app):
     """Setup JWT error handlers"""
+    from app.utils.token_store import get_revocation_store
+
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(jwt_header, jwt_payload):
+        # Only refresh tokens are rotated; access tokens stay stateless
+        if jwt_payload.get("type") != "refresh":
+            return False
+        return get_revocation_store().is_revoked(jwt_payload["jti"])
+
+    @jwt.revoked_token_loader
+    def revoked_token_callback(jwt_header, jwt_payload):
+        return (
+            jsonify(
+                {
+                    "error": "Token has been revoked",
+                    "message": "Please login again",
+                    "request_id": g.get("request_id"),
+                }
+            ),
+            401,
+        )
 
     @jwt.expired_token_loader
     def expired_token_callback(jwt_header, jwt_payload):
@@ -256,6 +304,39 @@ def setup_jwt_handlers(app):
 
 def setup_middleware(app):
     """Setup request/response middleware"""
+    from app.utils.compression import ResponseCompressor
+    from app.utils.db import end_session
+    from app.utils.deadlines import start_request_deadline
+    from app.utils.http_cache import apply_cache_policy
+    from app.utils.load_shedding import (
+        AdaptiveConcurrencyLimiter,
+        admit_request,
+        release_slot,
+    )
+    from app.utils.rate_limit import RateLimiter, check_rate_limit
+
+    # Behind a load balancer, remote_addr is the proxy's: trust the
+    # X-Forwarded-* headers set by that many proxies, and no more
+    proxy_hops = app.config.get("TRUSTED_PROXY_HOPS", 0)
+    if proxy_hops:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_hops, x_proto=proxy_hops)
+
+    # Created before gunicorn forks so workers share the bucket table
+    if app.config.get("RATE_LIMIT_ENABLED", True):
+        app.extensions["rate_limiter"] = RateLimiter.from_config(app.config)
+
+    if app.config.get("LOAD_SHEDDING_ENABLED", True):
+        app.extensions["concurrency_limiter"] = AdaptiveConcurrencyLimiter(
+            initial_limit=app.config.get("CONCURRENCY_LIMIT_INITIAL", 20),
+            min_limit=app.config.get("CONCURRENCY_LIMIT_MIN", 4),
+            max_limit=app.config.get("CONCURRENCY_LIMIT_MAX", 200),
+        )
+
+    # Registered first so it runs after every other after_request hook
+    if app.config.get("COMPRESSION_ENABLED", True):
+        compressor = ResponseCompressor.from_config(app.config)
+        app.extensions["response_compressor"] = compressor
+        app.after_request(compressor.compress_response)
 
     @app.before_request
     def add_request_id():
@@ -287,6 +368,61 @@ def setup_middleware(app):
                 413,
             )
 
+    @app.before_request
+    def enforce_rate_limit():
+        """Reject clients that exhausted their token bucket for this route"""
+        if "rate_limiter" not in app.extensions or request.method == "OPTIONS":
+            return None
+
+        result = check_rate_limit(app.view_functions.get(request.endpoint))
+        g.rate_limit = result
+        if result is None or result.allowed:
+            return None
+
+        app.logger.warning(
+            f"[{g.request_id}] Rate limit exceeded on {request.endpoint}"
+        )
+        return (
+            jsonify(
+                {
+                    "error": "Too many requests",
+                    "message": "Rate limit exceeded",
+                    "request_id": g.request_id,
+                }
+            ),
+            429,
+            {"Retry-After": str(result.retry_after)},
+        )
+
+    @app.before_request
+    def set_request_deadline():
+        """Give the request a time budget that database queries inherit"""
+        start_request_deadline(app.view_functions.get(request.endpoint))
+
+    @app.before_request
+    def shed_load():
+        """Fail fast with a 503 when this worker is over its concurrency limit"""
+        if request.method == "OPTIONS":
+            return None
+
+        if admit_request(app.view_functions.get(request.endpoint)):
+            g.admitted_at = time.perf_counter()
+
+    @app.teardown_appcontext
+    def end_db_session(exc):
+        """End the context's causally consistent session, if one was started"""
+        end_session()
+
+    @app.teardown_request
+    def release_concurrency_slot(exc):
+        """Feed the request latency back into the concurrency limit"""
+        release_slot()
+
+    @app.after_request
+    def set_cache_headers(response):
+        """Apply the route's Cache-Control policy and surrogate keys"""
+        return apply_cache_policy(app.view_functions.get(request.endpoint), response)
+
     @app.after_request
     def after_request(response):
         """Add security headers and request ID to response"""
@@ -296,6 +432,11 @@ def setup_middleware(app):
         response.headers["X-XSS-Protection"] = "1; mode=block"
         response.headers["X-Request-ID"] = g.get("request_id", "")
 
+        rate_limit = g.get("rate_limit")
+        if rate_limit is not None:
+            response.headers["X-RateLimit-Limit"] = str(rate_limit.limit)
+            response.headers["X-RateLimit-Remaining"] = str(rate_limit.remaining)
+
         # Log response in debug mode
         if app.debug:
             app.logger.debug(f"[{g.request_id}] Response: {response.status_code}")
@@ -425,6 +566,37 @@ def register_error_handlers(app):
             500,
         )
 
+    from app.utils.exceptions import DeadlineExceededError, ServiceUnavailableError
+
+    @app.errorhandler(DeadlineExceededError)
+    def deadline_exceeded(e):
+        app.logger.warning(f"[{g.get('request_id')}] Deadline exceeded: {str(e)}")
+        return (
+            jsonify(
+                {
+                    "error": "Request timeout",
+                    "message": "The request took too long, please retry",
+                    "request_id": g.get("request_id"),
+                }
+            ),
+            504,
+        )
+
+    @app.errorhandler(ServiceUnavailableError)
+    def service_unavailable(e):
+        app.logger.warning(f"[{g.get('request_id')}] Service unavailable: {str(e)}")
+        return (
+            jsonify(
+                {
+                    "error": "Service unavailable",
+                    "message": "Server is busy, please retry shortly",
+                    "request_id": g.get("request_id"),
+                }
+            ),
+            503,
+            {"Retry-After": str(e.retry_after)},
+        )
+
     # Handle custom database errors (if they exist)
     try:
         from app.utils.db import DatabaseError, InvalidObjectIdError
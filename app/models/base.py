@@ -56,6 +56,22 @@ class BaseModel:
         data["updated_at"] = now
         return data
 
+    @classmethod
+    def _store_rehashed_password(cls, item_id, old_hash, new_hash):
+        """Replace a password hash made with outdated parameters
+
+        Only applies while the stored hash is still ``old_hash``, so a
+        password changed in the meantime is never overwritten, and keeps
+        ``updated_at`` since nothing visible changed.
+        """
+        return update_one(
+            cls.COLLECTION,
+            item_id,
+            {"password": new_hash},
+            condition={"password": old_hash},
+            touch=False,
+        )
+
     @classmethod
     def find_by_id(cls, item_id):
         """Find item by ID"""
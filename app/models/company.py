@@ -1,7 +1,15 @@
+import functools
+
 from app.models.base import BaseModel
 from app.models.exceptions import ValidationError
 from app.utils.db import find_many, find_one, insert_one, update_one
-from app.utils.security import hash_password, verify_password
+from app.utils.http_cache import company_key, purge_surrogate_keys
+from app.utils.security import (
+    hash_password,
+    password_needs_rehash,
+    schedule_password_rehash,
+    verify_password,
+)
 
 
 class Company(BaseModel):
@@ -36,7 +44,9 @@ class Company(BaseModel):
         # Add timestamps
         cls._add_timestamps(company_data)
 
-        return insert_one(cls.COLLECTION, company_data)
+        company_id = insert_one(cls.COLLECTION, company_data)
+        purge_surrogate_keys(["companies"])
+        return company_id
 
     @classmethod
     def find_by_email(cls, email):
@@ -50,7 +60,26 @@ class Company(BaseModel):
         """Find all companies (without passwords)"""
         projection = {"password": 0}
         return find_many(
-            cls.COLLECTION, {}, projection=projection, limit=limit, skip=skip
+            cls.COLLECTION,
+            {},
+            projection=projection,
+            limit=limit,
+            skip=skip,
+            read_preference="secondaryPreferred",
+        )
+
+    @classmethod
+    def find_by_ids(cls, company_ids):
+        """Find companies by ID, in one query"""
+        ids = list({company_id for company_id in company_ids if company_id})
+        if not ids:
+            return []
+
+        return find_many(
+            cls.COLLECTION,
+            {"_id": {"$in": ids}},
+            sort=[("_id", 1)],
+            read_preference="secondaryPreferred",
         )
 
     @classmethod
@@ -72,7 +101,9 @@ class Company(BaseModel):
         # Add update timestamp
         cls._add_timestamps(company_data, is_update=True)
 
-        return update_one(cls.COLLECTION, company_id, company_data)
+        updated = update_one(cls.COLLECTION, company_id, company_data)
+        purge_surrogate_keys([company_key(company_id)])
+        return updated
 
     @classmethod
     def update_password(cls, company_id, new_password):
@@ -97,6 +128,15 @@ class Company(BaseModel):
             return None
 
         if verify_password(password, company["password"]):
+            if password_needs_rehash(company["password"]):
+                schedule_password_rehash(
+                    password,
+                    functools.partial(
+                        cls._store_rehashed_password,
+                        company["_id"],
+                        company["password"],
+                    ),
+                )
             return company
 
         return None
@@ -119,6 +159,7 @@ class Company(BaseModel):
             cls._add_timestamps(update_data, is_update=True)
 
             update_one(cls.COLLECTION, company_id, update_data)
+            purge_surrogate_keys([company_key(company_id)])
             return True
 
         return False
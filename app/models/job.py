@@ -1,9 +1,22 @@
-from datetime import datetime
+import base64
+import binascii
+from datetime import datetime, timedelta
+
+from bson.objectid import ObjectId
 
 from app.models.base import BaseModel
 from app.models.enums import JobType
 from app.models.exceptions import ValidationError
-from app.utils.db import count_documents, find_many, insert_one, update_one
+from app.utils.db import (
+    count_documents,
+    create_index,
+    find_many,
+    insert_one,
+    update_one,
+)
+from app.utils.http_cache import company_jobs_key, job_key, purge_surrogate_keys
+
+EPOCH = datetime(1970, 1, 1)
 
 
 class Job(BaseModel):
@@ -11,6 +24,9 @@ class Job(BaseModel):
 
     COLLECTION = "jobs"
 
+    # Delta sync reads jobs in (updated_at, _id) order
+    CHANGES_INDEX = [("updated_at", 1), ("_id", 1)]
+
     @classmethod
     def _build_search_query(cls, filters):
         """Build MongoDB query from filters (reusable for search and count)"""
@@ -85,7 +101,9 @@ class Job(BaseModel):
         # Add timestamps
         cls._add_timestamps(job_data)
 
-        return insert_one(cls.COLLECTION, job_data)
+        job_id = insert_one(cls.COLLECTION, job_data)
+        purge_surrogate_keys(["jobs", company_jobs_key(job_data["company_id"])])
+        return job_id
 
     @classmethod
     def find_by_company(cls, company_id, limit=0, skip=0):
@@ -105,13 +123,23 @@ class Job(BaseModel):
         if not sort:
             sort = [("created_at", -1)]
 
-        return find_many(cls.COLLECTION, query, sort=sort, limit=limit, skip=skip)
+        # Search results tolerate slightly stale replicas
+        return find_many(
+            cls.COLLECTION,
+            query,
+            sort=sort,
+            limit=limit,
+            skip=skip,
+            read_preference="secondaryPreferred",
+        )
 
     @classmethod
     def count(cls, filters=None):
         """Count jobs matching filters"""
         query = cls._build_search_query(filters)
-        return count_documents(cls.COLLECTION, query)
+        return count_documents(
+            cls.COLLECTION, query, read_preference="secondaryPreferred"
+        )
 
     @classmethod
     def update(cls, job_id, job_data):
@@ -131,7 +159,10 @@ class Job(BaseModel):
         # Add update timestamp
         cls._add_timestamps(job_data, is_update=True)
 
-        return update_one(cls.COLLECTION, job_id, job_data)
+        updated = update_one(cls.COLLECTION, job_id, job_data)
+        # The job may now match (or stop matching) other searches
+        purge_surrogate_keys(["jobs", job_key(job_id)])
+        return updated
 
     @classmethod
     def add_application(cls, job_id, application_id):
@@ -151,6 +182,50 @@ class Job(BaseModel):
             cls._add_timestamps(update_data, is_update=True)
 
             update_one(cls.COLLECTION, job_id, update_data)
+            purge_surrogate_keys([job_key(job_id)])
             return True
 
         return False
+
+    @classmethod
+    def encode_change_token(cls, job):
+        """Build the opaque resume token pointing just after a job"""
+        micros = (job["updated_at"] - EPOCH) // timedelta(microseconds=1)
+        raw = f"{micros}:{job['_id']}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode_change_token(cls, token):
+        """Get the (updated_at, _id) position a resume token points to"""
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+            micros, job_id = raw.split(":")
+            return EPOCH + timedelta(microseconds=int(micros)), ObjectId(job_id)
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+            raise ValidationError("Invalid change token")
+
+    @classmethod
+    def ensure_indexes(cls):
+        """Create the indexes job queries rely on (called at startup)"""
+        create_index(cls.COLLECTION, cls.CHANGES_INDEX)
+
+    @classmethod
+    def changes_since(cls, token=None, limit=100, settle_seconds=2):
+        """Get jobs created or updated after a resume token, oldest first
+
+        Jobs updated in the last ``settle_seconds`` are held back: their
+        updated_at comes from the app server's clock, so a write that
+        commits late could otherwise land behind a token already handed
+        out. Jobs are never deleted, so no tombstones are needed.
+        """
+        settled = datetime.utcnow() - timedelta(seconds=settle_seconds)
+        query = {"updated_at": {"$lte": settled}}
+
+        if token:
+            updated_at, job_id = cls.decode_change_token(token)
+            query["$or"] = [
+                {"updated_at": {"$gt": updated_at}},
+                {"updated_at": updated_at, "_id": {"$gt": job_id}},
+            ]
+
+        return find_many(cls.COLLECTION, query, sort=cls.CHANGES_INDEX, limit=limit)
@@ -1,3 +1,4 @@
+import functools
 from datetime import datetime
 
 from bson.objectid import ObjectId
@@ -5,7 +6,12 @@ from bson.objectid import ObjectId
 from app.models.base import BaseModel
 from app.models.exceptions import ValidationError
 from app.utils.db import find_one, insert_one, update_one
-from app.utils.security import hash_password, verify_password
+from app.utils.security import (
+    hash_password,
+    password_needs_rehash,
+    schedule_password_rehash,
+    verify_password,
+)
 
 
 class User(BaseModel):
@@ -98,6 +104,13 @@ class User(BaseModel):
             return None
 
         if verify_password(password, user["password"]):
+            if password_needs_rehash(user["password"]):
+                schedule_password_rehash(
+                    password,
+                    functools.partial(
+                        cls._store_rehashed_password, user["_id"], user["password"]
+                    ),
+                )
             return user
 
         return None
@@ -5,6 +5,7 @@ from app.models.job import Job
 from app.schemas.application import ApplicationSchema, ApplicationStatusUpdateSchema
 from app.utils.db import ensure_document_exists
 from app.utils.decorators import handle_errors, require_user_type, validate_json
+from app.utils.events import publish_application_status
 from app.utils.response_helpers import error_response, success_response
 from app.utils.route_helpers import check_resource_ownership, populate_application_data
 
@@ -42,6 +43,8 @@ def update_application_status(
 
     # Get the updated application
     updated_application = ensure_document_exists("applications", application_id)
+    publish_application_status(updated_application)
+
     updated_application = populate_application_data(updated_application)
 
     return success_response(
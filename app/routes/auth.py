@@ -1,23 +1,40 @@
 from flask import Blueprint, request
+from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
 
 from app.models.company import Company
 from app.models.user import User
 from app.schemas.company import CompanyLoginSchema, CompanyRegisterSchema, CompanySchema
 from app.schemas.user import UserLoginSchema, UserRegisterSchema, UserSchema
 from app.utils.decorators import handle_errors, validate_json
+from app.utils.idempotency import idempotent, remember_for_replay
+from app.utils.rate_limit import rate_limit
 from app.utils.response_helpers import error_response, success_response
 from app.utils.security import generate_tokens, sanitize_user_data
+from app.utils.token_store import get_revocation_store
 
 auth_bp = Blueprint("auth", __name__)
 
+# Tokens are never stored with replayable responses; retries get fresh ones
+TOKEN_FIELDS = ("access_token", "refresh_token")
+
+
+def _reissue_tokens(user_type):
+    def restore(context):
+        return generate_tokens(context["user_id"], user_type)
+
+    return restore
+
 
 @auth_bp.route("/register/user", methods=["POST"])
+@rate_limit(config_key="RATE_LIMIT_AUTH")
+@idempotent(redact=TOKEN_FIELDS, restore=_reissue_tokens("user"))
 @handle_errors
 @validate_json(UserRegisterSchema)
 def register_user(validated_data):
     """Register a new user"""
     # Create new user
     user_id = User.create(validated_data)
+    remember_for_replay(user_id=str(user_id))
 
     # Get the created user
     user = User.find_by_id(user_id)
@@ -32,12 +49,15 @@ def register_user(validated_data):
 
 
 @auth_bp.route("/register/company", methods=["POST"])
+@rate_limit(config_key="RATE_LIMIT_AUTH")
+@idempotent(redact=TOKEN_FIELDS, restore=_reissue_tokens("company"))
 @handle_errors
 @validate_json(CompanyRegisterSchema)
 def register_company(validated_data):
     """Register a new company"""
     # Create new company
     company_id = Company.create(validated_data)
+    remember_for_replay(user_id=str(company_id))
 
     # Get the created company
     company = Company.find_by_id(company_id)
@@ -55,6 +75,7 @@ def register_company(validated_data):
 
 
 @auth_bp.route("/login/user", methods=["POST"])
+@rate_limit(config_key="RATE_LIMIT_AUTH")
 @handle_errors
 @validate_json(UserLoginSchema)
 def login_user(validated_data):
@@ -74,6 +95,7 @@ def login_user(validated_data):
 
 
 @auth_bp.route("/login/company", methods=["POST"])
+@rate_limit(config_key="RATE_LIMIT_AUTH")
 @handle_errors
 @validate_json(CompanyLoginSchema)
 def login_company(validated_data):
@@ -93,3 +115,23 @@ def login_company(validated_data):
     }
 
     return success_response(response_data, message="Login successful")
+
+
+@auth_bp.route("/refresh", methods=["POST"])
+@rate_limit(config_key="RATE_LIMIT_AUTH")
+@jwt_required(refresh=True)
+@handle_errors
+def refresh_tokens():
+    """Exchange a refresh token for a new token pair"""
+    claims = get_jwt()
+
+    # Rotation: each refresh token can be exchanged exactly once
+    if not get_revocation_store().revoke(claims["jti"], claims["exp"]):
+        return error_response(
+            "Refresh token has already been used", 401, "token_revoked"
+        )
+
+    # Generate authentication tokens
+    tokens = generate_tokens(get_jwt_identity(), claims.get("user_type", ""))
+
+    return success_response(tokens, message="Token refreshed successfully")
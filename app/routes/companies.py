@@ -4,13 +4,23 @@ from app.models.company import Company
 from app.models.job import Job
 from app.schemas.company import CompanySchema, CompanyUpdateSchema
 from app.schemas.job import JobSchema
+from app.utils.conditional import conditional_response
 from app.utils.db import ensure_document_exists
+from app.utils.deadlines import deadline
 from app.utils.decorators import (
     handle_errors,
     require_user_type,
     validate_json,
     validate_pagination,
 )
+from app.utils.http_cache import (
+    add_surrogate_keys,
+    cache_policy,
+    company_jobs_key,
+    company_key,
+    job_key,
+)
+from app.utils.load_shedding import priority
 from app.utils.response_helpers import (
     paginated_response,
     sanitize_response_data,
@@ -22,6 +32,9 @@ companies_bp = Blueprint("companies", __name__)
 
 
 @companies_bp.route("", methods=["GET"])
+@priority("low")
+@deadline(config_key="SEARCH_DEADLINE_MS")
+@cache_policy(config_key="CACHE_POLICY_COMPANIES")
 @handle_errors
 @validate_pagination
 def get_companies(pagination):
@@ -29,6 +42,9 @@ def get_companies(pagination):
     # Get companies
     companies = Company.find_all(limit=pagination["limit"], skip=pagination["skip"])
     total = Company.count_all()
+    add_surrogate_keys(
+        "companies", *(company_key(company["_id"]) for company in companies)
+    )
 
     # Sanitize response data
     sanitized_companies = sanitize_response_data(companies)
@@ -42,22 +58,34 @@ def get_companies(pagination):
 
 
 @companies_bp.route("/<company_id>", methods=["GET"])
+@priority("high")
+@cache_policy(config_key="CACHE_POLICY_COMPANY")
 @handle_errors
 def get_company(company_id):
     """Get company details by ID"""
-    company = ensure_document_exists("companies", company_id)
+    company = ensure_document_exists(
+        "companies", company_id, read_preference="secondaryPreferred"
+    )
+    add_surrogate_keys(company_key(company["_id"]))
 
-    return success_response(CompanySchema().dump(sanitize_response_data(company)))
+    return conditional_response(
+        lambda: success_response(CompanySchema().dump(sanitize_response_data(company))),
+        company,
+    )
 
 
 @companies_bp.route("/profile", methods=["GET"])
+@cache_policy("private, no-cache", vary=("Authorization",))
 @handle_errors
 @require_user_type("company")
 def get_profile(current_user_id, current_user_type):
     """Get the authenticated company's profile"""
     company = ensure_document_exists("companies", current_user_id)
 
-    return success_response(CompanySchema().dump(sanitize_response_data(company)))
+    return conditional_response(
+        lambda: success_response(CompanySchema().dump(sanitize_response_data(company))),
+        company,
+    )
 
 
 @companies_bp.route("/profile", methods=["PUT"])
@@ -96,6 +124,7 @@ def get_company_jobs(current_user_id, current_user_type, pagination):
 
 
 @companies_bp.route("/<company_id>/jobs", methods=["GET"])
+@cache_policy(config_key="CACHE_POLICY_COMPANY_JOBS")
 @handle_errors
 @validate_pagination
 def get_jobs_by_company(company_id, pagination):
@@ -108,6 +137,9 @@ def get_jobs_by_company(company_id, pagination):
         company_id, limit=pagination["limit"], skip=pagination["skip"]
     )
     total = Job.count({"company_id": company_id})
+    add_surrogate_keys(
+        company_jobs_key(company_id), *(job_key(job["_id"]) for job in jobs)
+    )
 
     return paginated_response(
         JobSchema(many=True).dump(jobs), total, pagination["page"], pagination["limit"]
@@ -1,17 +1,28 @@
-from flask import Blueprint, request
+from flask import Blueprint, current_app, request
 
 from app.models.application import Application
 from app.models.company import Company
 from app.models.job import Job
 from app.schemas.application import ApplicationCreateSchema, ApplicationSchema
 from app.schemas.job import JobCreateSchema, JobSchema, JobSearchSchema, JobUpdateSchema
+from app.utils.conditional import conditional_response
 from app.utils.db import ensure_document_exists
+from app.utils.deadlines import deadline
 from app.utils.decorators import (
     handle_errors,
     require_user_type,
     validate_json,
     validate_pagination,
 )
+from app.utils.helpers import safe_int
+from app.utils.http_cache import (
+    add_surrogate_keys,
+    cache_policy,
+    company_key,
+    job_key,
+)
+from app.utils.idempotency import idempotent
+from app.utils.load_shedding import priority
 from app.utils.response_helpers import (
     error_response,
     paginated_response,
@@ -20,13 +31,19 @@ from app.utils.response_helpers import (
 from app.utils.route_helpers import (
     check_resource_ownership,
     populate_application_data,
+    populate_applications_data,
     populate_job_data,
+    populate_jobs_data,
 )
+from app.utils.single_flight import coalesce
 
 jobs_bp = Blueprint("jobs", __name__)
 
 
 @jobs_bp.route("", methods=["GET"])
+@priority("low")
+@deadline(config_key="SEARCH_DEADLINE_MS")
+@cache_policy(config_key="CACHE_POLICY_JOB_SEARCH")
 @handle_errors
 @validate_pagination
 def search_jobs(pagination):
@@ -44,27 +61,83 @@ def search_jobs(pagination):
     jobs = Job.search(filters, limit=limit, skip=skip)
     total = Job.count(filters)
 
-    # Populate job data with company info
-    populated_jobs = [populate_job_data(job) for job in jobs]
+    # One query serves both the validators and the hydration of the page
+    companies = Company.find_by_ids(job.get("company_id") for job in jobs)
 
-    return paginated_response(
-        JobSchema(many=True).dump(populated_jobs), total, page, limit
+    # Any new job may enter a result page, hence the collection-wide key
+    add_surrogate_keys(
+        "jobs",
+        *(job_key(job["_id"]) for job in jobs),
+        *(company_key(company["_id"]) for company in companies),
+    )
+
+    return conditional_response(
+        lambda: paginated_response(
+            JobSchema(many=True).dump(populate_jobs_data(jobs, companies)),
+            total,
+            page,
+            limit,
+        ),
+        *jobs,
+        *companies,
+        extra=(total, page, limit),
+    )
+
+
+@jobs_bp.route("/changes", methods=["GET"])
+@handle_errors
+def get_job_changes():
+    """Get jobs created or updated since a resume token (delta sync)
+
+    Clients store ``next_token`` and pass it back as ``since``; without it,
+    the first page of a full sync is returned.
+    """
+    since = request.args.get("since")
+    max_limit = current_app.config.get("JOB_CHANGES_MAX_LIMIT", 500)
+    limit = min(max(safe_int(request.args.get("limit"), 100), 1), max_limit)
+
+    jobs = Job.changes_since(
+        since,
+        limit=limit + 1,
+        settle_seconds=current_app.config.get("JOB_CHANGES_SETTLE_SECONDS", 2),
+    )
+    has_more = len(jobs) > limit
+    jobs = jobs[:limit]
+
+    return success_response(
+        {
+            "jobs": JobSchema(many=True).dump(populate_jobs_data(jobs)),
+            "next_token": Job.encode_change_token(jobs[-1]) if jobs else since,
+            "has_more": has_more,
+        }
     )
 
 
 @jobs_bp.route("/<job_id>", methods=["GET"])
+@priority("high")
+@cache_policy(config_key="CACHE_POLICY_JOB")
 @handle_errors
 def get_job(job_id):
     """Get job details by ID"""
-    job = ensure_document_exists("jobs", job_id)
 
-    # Populate with company data
-    job = populate_job_data(job)
+    def load():
+        job = ensure_document_exists(
+            "jobs", job_id, read_preference="secondaryPreferred"
+        )
+        # Populate with company data
+        return populate_job_data(job)
 
-    return success_response(JobSchema().dump(job))
+    # Concurrent requests for a popular job share one database round trip
+    job = coalesce(("jobs", job_id), load)
+    add_surrogate_keys(job_key(job["_id"]), company_key(job.get("company_id")))
+
+    return conditional_response(
+        lambda: success_response(JobSchema().dump(job)), job, job.get("company")
+    )
 
 
 @jobs_bp.route("", methods=["POST"])
+@idempotent()
 @handle_errors
 @require_user_type("company")
 @validate_json(JobCreateSchema)
@@ -113,6 +186,7 @@ def update_job(job_id, current_user_id, current_user_type, validated_data):
 
 
 @jobs_bp.route("/<job_id>/apply", methods=["POST"])
+@idempotent()
 @handle_errors
 @require_user_type("user")
 @validate_json(ApplicationCreateSchema)
@@ -163,7 +237,7 @@ def get_job_applications(job_id, current_user_id, current_user_type, pagination)
     total = Application.count_all({"job_id": job_id})
 
     # Populate application data
-    populated_applications = [populate_application_data(app) for app in applications]
+    populated_applications = populate_applications_data(applications)
 
     return paginated_response(
         ApplicationSchema(many=True).dump(populated_applications),
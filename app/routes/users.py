@@ -9,6 +9,7 @@ from app.schemas.user import (
     UserSchema,
     UserUpdateSchema,
 )
+from app.utils.conditional import conditional_response
 from app.utils.db import ensure_document_exists
 from app.utils.decorators import (
     handle_errors,
@@ -16,24 +17,35 @@ from app.utils.decorators import (
     validate_json,
     validate_pagination,
 )
+from app.utils.events import (
+    STREAM_TOKEN_SCOPE,
+    event_stream_response,
+    issue_stream_token,
+)
+from app.utils.http_cache import cache_policy
+from app.utils.load_shedding import release_slot
 from app.utils.response_helpers import (
     paginated_response,
     sanitize_response_data,
     success_response,
 )
-from app.utils.route_helpers import populate_application_data
+from app.utils.route_helpers import populate_applications_data
 
 users_bp = Blueprint("users", __name__)
 
 
 @users_bp.route("/profile", methods=["GET"])
+@cache_policy("private, no-cache", vary=("Authorization",))
 @handle_errors
 @require_user_type("user")
 def get_profile(current_user_id, current_user_type):
     """Get the authenticated user's profile"""
     user = ensure_document_exists("users", current_user_id)
 
-    return success_response(UserSchema().dump(sanitize_response_data(user)))
+    return conditional_response(
+        lambda: success_response(UserSchema().dump(sanitize_response_data(user))),
+        user,
+    )
 
 
 @users_bp.route("/profile", methods=["PUT"])
@@ -67,7 +79,7 @@ def get_applications(current_user_id, current_user_type, pagination):
     total = Application.count_all({"user_id": current_user_id})
 
     # Populate application data
-    populated_applications = [populate_application_data(app) for app in applications]
+    populated_applications = populate_applications_data(applications)
 
     return paginated_response(
         ApplicationSchema(many=True).dump(populated_applications),
@@ -77,6 +89,28 @@ def get_applications(current_user_id, current_user_type, pagination):
     )
 
 
+@users_bp.route("/applications/events/token", methods=["POST"])
+@handle_errors
+@require_user_type("user")
+def create_application_events_token(current_user_id, current_user_type):
+    """Issue a short-lived token for the events stream URL"""
+    return success_response(issue_stream_token(current_user_id, current_user_type))
+
+
+@users_bp.route("/applications/events", methods=["GET"])
+@handle_errors
+@require_user_type("user", token_scope=STREAM_TOKEN_SCOPE)
+def stream_application_events(current_user_id, current_user_type):
+    """Stream status changes of the user's applications (server-sent events)"""
+    response = event_stream_response(f"user:{current_user_id}")
+
+    # The stream outlives the request's slot and time budget; the subscriber
+    # cap (EVENTS_MAX_SUBSCRIBERS) keeps streams from taking every thread
+    release_slot()
+
+    return response
+
+
 @users_bp.route("/experience", methods=["POST"])
 @handle_errors
 @require_user_type("user")
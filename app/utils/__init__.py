@@ -10,10 +10,18 @@ from .db import (
     find_one,
     insert_many,
     insert_one,
+    iter_many,
     update_many,
     update_one,
 )
-from .exceptions import DatabaseError, DocumentNotFoundError, InvalidObjectIdError
+from .exceptions import (
+    CircuitOpenError,
+    DatabaseError,
+    DeadlineExceededError,
+    DocumentNotFoundError,
+    InvalidObjectIdError,
+    ServiceUnavailableError,
+)
 from .helpers import (
     clean_phone_number,
     deep_merge_dicts,
@@ -27,10 +35,13 @@ from .helpers import (
 )
 from .security import (
     SecurityError,
+    calibrate_hash_rounds,
     generate_token,
     generate_tokens,
     hash_password,
+    password_needs_rehash,
     sanitize_user_data,
+    schedule_password_rehash,
     validate_password_strength,
     verify_password,
 )
@@ -40,12 +51,16 @@ __all__ = [
     "DatabaseError",
     "InvalidObjectIdError",
     "DocumentNotFoundError",
+    "DeadlineExceededError",
+    "ServiceUnavailableError",
+    "CircuitOpenError",
     # Database operations
     "insert_one",
     "insert_many",
     "find_one",
     "find_by_id",
     "find_many",
+    "iter_many",
     "update_one",
     "update_many",
     "delete_one",
@@ -57,6 +72,9 @@ __all__ = [
     # Security
     "hash_password",
     "verify_password",
+    "password_needs_rehash",
+    "schedule_password_rehash",
+    "calibrate_hash_rounds",
     "generate_tokens",
     "generate_token",
     "validate_password_strength",
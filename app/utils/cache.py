@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """Thread-safe bounded LRU cache with per-entry expiry
+
+    Entries expire after ``ttl`` seconds, or at an absolute ``expires_at``
+    epoch timestamp. The least recently used entry is evicted once
+    ``max_size`` is reached.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live entry, or default when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        """Store an entry, evicting the least recently used one when full"""
+        if expires_at is None:
+            ttl = self.ttl if ttl is None else ttl
+            expires_at = time.time() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove an entry if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove the entries whose key matches, returning how many"""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current size"""
+        return {"size": len(self), "hits": self.hits, "misses": self.misses}
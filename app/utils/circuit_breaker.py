@@ -0,0 +1,125 @@
+import math
+import threading
+import time
+from typing import Dict
+
+
+class CircuitBreaker:
+    """Stop calling a failing dependency once its error rate is too high
+
+    Outcomes are counted in one-second buckets over a rolling window. When
+    at least ``min_calls`` were made and the failure share reaches
+    ``failure_rate``, the breaker opens and calls fail fast. After
+    ``reset_timeout`` seconds a single probe call is let through: success
+    closes the breaker, failure keeps it open for another period.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_calls: int = 20,
+        window_seconds: int = 10,
+        reset_timeout: float = 30,
+    ):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.opened_at = None
+        self.times_opened = 0
+        self._probe_started = None
+        self._buckets = [[0, 0, 0] for _ in range(window_seconds)]
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Check if a call may go through now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            now = time.time()
+            if self.state == self.OPEN and now >= self.opened_at + self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_started = None
+
+            # One probe at a time; a probe that never reported is replaced
+            if self.state == self.HALF_OPEN and (
+                self._probe_started is None
+                or now >= self._probe_started + self.reset_timeout
+            ):
+                self._probe_started = now
+                return True
+
+            return False
+
+    def record_success(self) -> None:
+        """Record a call that reached the dependency"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._close()
+            elif self.state == self.CLOSED:
+                self._bucket(time.time())[1] += 1
+
+    def record_failure(self) -> None:
+        """Record a call that failed to reach the dependency"""
+        with self._lock:
+            now = time.time()
+
+            if self.state == self.HALF_OPEN:
+                self._open(now)
+            elif self.state == self.CLOSED:
+                self._bucket(now)[2] += 1
+                successes, failures = self._totals(now)
+                calls = successes + failures
+                if calls >= self.min_calls and failures / calls >= self.failure_rate:
+                    self._open(now)
+
+    def retry_after(self) -> int:
+        """Seconds until the next probe is allowed"""
+        if self.opened_at is None:
+            return 1
+        return max(1, math.ceil(self.opened_at + self.reset_timeout - time.time()))
+
+    def _bucket(self, now):
+        second = int(now)
+        bucket = self._buckets[second % self.window_seconds]
+        if bucket[0] != second:
+            bucket[:] = [second, 0, 0]
+        return bucket
+
+    def _totals(self, now):
+        oldest = int(now) - self.window_seconds
+        successes = failures = 0
+        for second, ok, failed in self._buckets:
+            if second > oldest:
+                successes += ok
+                failures += failed
+        return successes, failures
+
+    def _open(self, now):
+        self.state = self.OPEN
+        self.opened_at = now
+        self.times_opened += 1
+
+    def _close(self):
+        self.state = self.CLOSED
+        self.opened_at = None
+        self._probe_started = None
+        for bucket in self._buckets:
+            bucket[:] = [0, 0, 0]
+
+    def snapshot(self) -> Dict:
+        """Return current breaker state"""
+        with self._lock:
+            successes, failures = self._totals(time.time())
+            return {
+                "state": self.state,
+                "successes": successes,
+                "failures": failures,
+                "times_opened": self.times_opened,
+            }
@@ -0,0 +1,179 @@
+import gzip
+import logging
+import threading
+import zlib
+from typing import Iterable, Iterator, List, Optional
+
+from flask import request
+
+logger = logging.getLogger(__name__)
+
+# Optional encoders: pip install brotli zstandard
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int = 5):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        # mtime=0 keeps the output identical for identical bodies
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            if chunk:
+                yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, level: int = 4):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.level)
+
+    def stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = brotli.Compressor(quality=self.level)
+        for chunk in chunks:
+            if chunk:
+                yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+
+
+class ZstdEncoder:
+    name = "zstd"
+
+    def __init__(self, level: int = 3):
+        self.level = level
+        self._local = threading.local()
+
+    def compress(self, data: bytes) -> bytes:
+        # Compressor contexts are reusable but not thread-safe
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            compressor = zstandard.ZstdCompressor(level=self.level)
+            self._local.compressor = compressor
+        return compressor.compress(data)
+
+    def stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        for chunk in chunks:
+            if chunk:
+                yield compressor.compress(chunk) + compressor.flush(
+                    zstandard.COMPRESSOBJ_FLUSH_BLOCK
+                )
+        yield compressor.flush()
+
+
+ENCODERS = {
+    "zstd": (ZstdEncoder, lambda: zstandard is not None),
+    "br": (BrotliEncoder, lambda: brotli is not None),
+    "gzip": (GzipEncoder, lambda: True),
+}
+
+
+class ResponseCompressor:
+    """Compress responses with the best encoding the client accepts
+
+    Encodings are tried in the configured order when the client rates them
+    equally. Bodies under ``min_size`` bytes are sent as is, since the
+    saving would not pay for the CPU. Streamed responses (server-sent
+    events) are compressed chunk by chunk with a flush after each one, so
+    every event still reaches the client immediately.
+    """
+
+    def __init__(
+        self,
+        encoders: List,
+        min_size: int = 1024,
+        mimetypes: Iterable[str] = ("application/json",),
+    ):
+        self.encoders = {encoder.name: encoder for encoder in encoders}
+        self.preference = [encoder.name for encoder in encoders]
+        self.min_size = min_size
+        self.mimetypes = set(mimetypes)
+
+    @classmethod
+    def from_config(cls, config) -> "ResponseCompressor":
+        """Build the compressor, skipping encoders that are not installed"""
+        levels = {
+            "gzip": config.get("COMPRESSION_GZIP_LEVEL", 5),
+            "br": config.get("COMPRESSION_BROTLI_LEVEL", 4),
+            "zstd": config.get("COMPRESSION_ZSTD_LEVEL", 3),
+        }
+
+        encoders = []
+        for name in config.get("COMPRESSION_ALGORITHMS", ["zstd", "br", "gzip"]):
+            if name not in ENCODERS:
+                raise ValueError(f"Unknown compression algorithm: {name}")
+
+            encoder_class, available = ENCODERS[name]
+            if not available():
+                logger.info(f"{name} compression unavailable - package not installed")
+                continue
+            encoders.append(encoder_class(levels[name]))
+
+        return cls(
+            encoders,
+            min_size=config.get("COMPRESSION_MIN_SIZE", 1024),
+            mimetypes=config.get("COMPRESSION_MIMETYPES", ["application/json"]),
+        )
+
+    def negotiate(self, accept_encodings) -> Optional[str]:
+        """Pick an encoding from a parsed Accept-Encoding header, or None"""
+        return accept_encodings.best_match(self.preference)
+
+    def compress_response(self, response):
+        """after_request hook compressing eligible responses in place"""
+        if (
+            response.mimetype not in self.mimetypes
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or "Content-Encoding" in response.headers
+            or response.direct_passthrough
+            or "no-transform" in response.headers.get("Cache-Control", "")
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+
+        if request.method == "HEAD":
+            return response
+
+        encoding = self.negotiate(request.accept_encodings)
+        if encoding is None:
+            return response
+        encoder = self.encoders[encoding]
+
+        if response.is_streamed:
+            response.response = encoder.stream(response.iter_encoded())
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(encoder.compress(data))
+
+        response.headers["Content-Encoding"] = encoding
+
+        # The encoded body differs byte for byte, so only a weak ETag holds
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+        return response
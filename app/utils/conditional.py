@@ -0,0 +1,83 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Tuple
+
+from flask import current_app, request
+
+
+def document_validators(
+    *documents: Optional[Dict], extra=None
+) -> Tuple[str, Optional[datetime]]:
+    """Weak ETag and Last-Modified for a response built from documents
+
+    The ETag hashes each document's ``_id`` and ``updated_at`` in order, plus
+    ``extra`` (e.g. a page's total count), so it changes whenever any
+    document behind the response does.
+    """
+    digest = hashlib.sha1()
+    last_modified = None
+
+    for document in documents:
+        if not document:
+            digest.update(b"-;")
+            continue
+
+        updated_at = document.get("updated_at") or document.get("created_at")
+        stamp = updated_at.isoformat() if updated_at else ""
+        digest.update(f"{document.get('_id')}:{stamp};".encode())
+
+        if updated_at and (last_modified is None or updated_at > last_modified):
+            last_modified = updated_at
+
+    if extra is not None:
+        digest.update(repr(extra).encode())
+
+    return digest.hexdigest(), last_modified
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Stored timestamps are naive UTC; HTTP dates have whole seconds
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def is_not_modified(etag: str, last_modified: Optional[datetime]) -> bool:
+    """Check the request's conditional headers against the validators
+
+    If-None-Match takes precedence; If-Modified-Since is only used when the
+    client sent no ETag.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+
+    if request.if_modified_since and last_modified:
+        return _as_utc(last_modified) <= _as_utc(request.if_modified_since)
+
+    return False
+
+
+def _set_validators(response, etag: str, last_modified: Optional[datetime]):
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = _as_utc(last_modified)
+    return response
+
+
+def conditional_response(build_response: Callable, *documents, extra=None):
+    """Answer 304 when the client's copy is current, else build the response
+
+    ``build_response`` is only called when the body is actually needed, so
+    serialization (and any work done inside it) is skipped on a match.
+    """
+    etag, last_modified = document_validators(*documents, extra=extra)
+
+    if is_not_modified(etag, last_modified):
+        return _set_validators(
+            current_app.response_class(status=304), etag, last_modified
+        )
+
+    response, status_code = build_response()
+    if status_code == 200:
+        _set_validators(response, etag, last_modified)
+    return response, status_code
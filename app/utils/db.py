@@ -1,29 +1,353 @@
+import copy
 import logging
+import os
+import random
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
+from urllib.parse import urlparse
 
 from bson.errors import InvalidId
 from bson.objectid import ObjectId
-from flask import current_app
-from pymongo.errors import PyMongoError
+from flask import current_app, g, has_app_context
+from pymongo import MongoClient
+from pymongo.errors import (
+    ConfigurationError,
+    ConnectionFailure,
+    ExecutionTimeout,
+    PyMongoError,
+)
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+)
 
+from app.utils.cache import TTLCache
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.deadlines import remaining_ms
 from app.utils.exceptions import (
+    CircuitOpenError,
     DatabaseError,
+    DeadlineExceededError,
     DocumentNotFoundError,
     InvalidObjectIdError,
 )
+from app.utils.invalidation import get_invalidation_bus, notify_change
+from app.utils.memory_db import MemoryClient
+from app.utils.pool_monitor import PoolMonitor
 
 logger = logging.getLogger(__name__)
 
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+def mongo_client_options(config) -> Dict:
+    """Build MongoClient keyword arguments from app configuration"""
+    options = {
+        "minPoolSize": config.get("MONGO_MIN_POOL_SIZE", 0),
+        "maxPoolSize": config.get("MONGO_MAX_POOL_SIZE", 50),
+        "serverSelectionTimeoutMS": config.get(
+            "MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000
+        ),
+        "connectTimeoutMS": config.get("MONGO_CONNECT_TIMEOUT_MS", 10000),
+        "retryWrites": True,
+    }
+
+    if config.get("MONGO_MAX_IDLE_TIME_MS") is not None:
+        options["maxIdleTimeMS"] = config["MONGO_MAX_IDLE_TIME_MS"]
+
+    if config.get("MONGO_WAIT_QUEUE_TIMEOUT_MS") is not None:
+        options["waitQueueTimeoutMS"] = config["MONGO_WAIT_QUEUE_TIMEOUT_MS"]
+
+    if config.get("MONGO_COMPRESSORS"):
+        options["compressors"] = ",".join(config["MONGO_COMPRESSORS"])
+
+    if config.get("MONGO_READ_CONCERN"):
+        options["readConcernLevel"] = config["MONGO_READ_CONCERN"]
+
+    write_concern = config.get("MONGO_WRITE_CONCERN")
+    if write_concern:
+        options["w"] = int(write_concern) if write_concern.isdigit() else write_concern
+
+    return options
+
+
+def _mongodb_client(uri: str, options: Dict):
+    pool_monitor = PoolMonitor(options["maxPoolSize"])
+    return MongoClient(uri, event_listeners=[pool_monitor], **options), pool_monitor
+
+
+def _mongomock_client(uri: str, options: Dict):
+    import mongomock  # development dependency
+
+    return mongomock.MongoClient(), None
+
+
+def _memory_client(uri: str, options: Dict):
+    return MemoryClient(), None
+
+
+# STORAGE_BACKEND values: a real server, or in-process engines needing none
+STORAGE_BACKENDS = {
+    "mongodb": _mongodb_client,
+    "mongomock": _mongomock_client,
+    "memory": _memory_client,
+}
+
+
+def connect_db(app):
+    """Create this process's client for the configured storage backend
+
+    PyMongo clients must not be shared across fork(), so the client records
+    the PID that created it and get_db() reconnects when it changes.
+    """
+    backend = app.config.get("STORAGE_BACKEND", "mongodb")
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {backend}")
+
+    parsed_uri = urlparse(app.config["MONGODB_URI"])
+    db_name = parsed_uri.path.lstrip("/") or "interimapp"  # fallback name
+
+    mongodb_client, pool_monitor = STORAGE_BACKENDS[backend](
+        app.config["MONGODB_URI"], mongo_client_options(app.config)
+    )
+
+    app.mongodb_client = mongodb_client
+    app.db = mongodb_client[db_name]
+    app.pool_monitor = pool_monitor
+    app.mongodb_pid = os.getpid()
+
+    logger.debug(
+        f"{backend} client created for process {app.mongodb_pid} - DB: {db_name}"
+    )
+    return mongodb_client
+
 
 def get_db():
-    """Get database connection"""
+    """Get database connection, reconnecting lazily after a fork"""
+    app = current_app._get_current_object()
+
+    if getattr(app, "mongodb_pid", None) not in (None, os.getpid()):
+        connect_db(app)
+
     try:
-        return current_app.db
+        return app.db
     except AttributeError:
         raise DatabaseError("Database connection not available")
 
 
+def get_pool_stats() -> Optional[Dict]:
+    """Get connection pool statistics for this process, if monitored"""
+    pool_monitor = getattr(current_app, "pool_monitor", None)
+    if pool_monitor is None:
+        return None
+    return pool_monitor.snapshot()
+
+
+def get_circuit_breaker() -> Optional[CircuitBreaker]:
+    """Get this worker's database circuit breaker, or None when disabled"""
+    breaker = current_app.extensions.get("db_circuit_breaker")
+
+    if breaker is None:
+        config = current_app.config
+        if not config.get("DB_BREAKER_ENABLED", True):
+            return None
+
+        breaker = CircuitBreaker(
+            failure_rate=config.get("DB_BREAKER_FAILURE_RATE", 0.5),
+            min_calls=config.get("DB_BREAKER_MIN_CALLS", 20),
+            window_seconds=config.get("DB_BREAKER_WINDOW_SECONDS", 10),
+            reset_timeout=config.get("DB_BREAKER_RESET_TIMEOUT", 30),
+        )
+        current_app.extensions["db_circuit_breaker"] = breaker
+
+    return breaker
+
+
+def _get_fallback_cache() -> Optional[TTLCache]:
+    """Get the cache of documents served while the database is unreachable"""
+    cache = current_app.extensions.get("db_fallback_cache")
+
+    if cache is None:
+        max_size = current_app.config.get("DB_FALLBACK_CACHE_SIZE", 0)
+        if max_size <= 0:
+            return None
+
+        cache = TTLCache(
+            max_size=max_size, ttl=current_app.config.get("DB_FALLBACK_CACHE_TTL")
+        )
+        current_app.extensions["db_fallback_cache"] = cache
+
+        # Entries are keyed by query, so drop a collection's on any change
+        get_invalidation_bus().register(
+            lambda name, document_id: cache.delete_where(lambda key: key[0] == name)
+        )
+
+    return cache
+
+
+def _retry_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter, capped by the request deadline"""
+    base_ms = current_app.config.get("DB_RETRY_BACKOFF_MS", 50)
+    max_ms = current_app.config.get("DB_RETRY_MAX_BACKOFF_MS", 1000)
+    delay_ms = random.uniform(0, min(max_ms, base_ms * 2**attempt))
+
+    remaining = remaining_ms()
+    if remaining is not None:
+        delay_ms = min(delay_ms, remaining)
+
+    return delay_ms / 1000
+
+
+def _execute(collection: str, operation, idempotent: bool = False):
+    """Run a database call through the circuit breaker
+
+    Idempotent reads are retried on connection errors (DB_READ_RETRIES
+    times) after a jittered backoff, unless the breaker has opened meanwhile.
+    """
+    breaker = get_circuit_breaker()
+    if breaker is not None and not breaker.allow_request():
+        raise CircuitOpenError(
+            "Database circuit breaker is open", retry_after=breaker.retry_after()
+        )
+
+    retries = current_app.config.get("DB_READ_RETRIES", 2) if idempotent else 0
+
+    for attempt in range(retries + 1):
+        try:
+            result = operation()
+
+        except ConnectionFailure as e:
+            if breaker is not None:
+                breaker.record_failure()
+            if attempt >= retries or (
+                breaker is not None and not breaker.allow_request()
+            ):
+                raise
+
+            logger.warning(
+                f"Transient error on {collection}, retry {attempt + 1}/{retries}: "
+                f"{str(e)}"
+            )
+            time.sleep(_retry_delay(attempt))
+            continue
+
+        except PyMongoError:
+            # The server answered, so the database itself is reachable
+            if breaker is not None:
+                breaker.record_success()
+            raise
+
+        if breaker is not None:
+            breaker.record_success()
+        return result
+
+
+def _read_preference(name: Optional[str]):
+    """Build the read preference for a per-operation mode name"""
+    if name is None or not current_app.config.get("MONGO_SECONDARY_READS", True):
+        return None
+
+    if name not in READ_PREFERENCES:
+        raise ValueError(f"Unknown read preference: {name}")
+
+    if name == "primary":
+        return Primary()
+
+    max_staleness = current_app.config.get("MONGO_MAX_STALENESS_SECONDS")
+    return READ_PREFERENCES[name](max_staleness=max_staleness or -1)
+
+
+def _collection(db, collection: str, read_preference: Optional[str] = None):
+    """Get a collection, routed by read_preference when one is given"""
+    preference = _read_preference(read_preference)
+    if preference is None:
+        return db[collection]
+    return db[collection].with_options(read_preference=preference)
+
+
+def get_session():
+    """Get the causally consistent session for the current user's operations
+
+    Authenticated requests run their operations in one causally consistent
+    session, so reads (even from secondaries) observe the request's earlier
+    writes. The session also continues from the user's last write seen by
+    this worker, which extends read-your-writes across requests.
+    """
+    if not has_app_context() or not g.get("jwt_claims"):
+        return None
+
+    app = current_app._get_current_object()
+    if not app.config.get("MONGO_CAUSAL_CONSISTENCY", True):
+        return None
+
+    session = g.get("db_session")
+    if session is not None:
+        return session
+
+    if app.extensions.get("db_sessions_supported") is False:
+        return None
+
+    try:
+        session = get_db().client.start_session(causal_consistency=True)
+    except (NotImplementedError, ConfigurationError) as e:
+        # Standalone servers without sessions, or client stand-ins
+        logger.info(f"Causally consistent sessions unavailable: {str(e)}")
+        app.extensions["db_sessions_supported"] = False
+        return None
+
+    last_seen = _get_causal_tokens().get(_session_owner())
+    if last_seen is not None:
+        cluster_time, operation_time = last_seen
+        session.advance_cluster_time(cluster_time)
+        session.advance_operation_time(operation_time)
+
+    g.db_session = session
+    return session
+
+
+def end_session() -> None:
+    """End the context's session, remembering how far the user has read"""
+    session = g.pop("db_session", None)
+    if session is None:
+        return
+
+    if session.cluster_time is not None and session.operation_time is not None:
+        _get_causal_tokens().set(
+            _session_owner(), (session.cluster_time, session.operation_time)
+        )
+    session.end_session()
+
+
+def _session_owner() -> str:
+    claims = g.get("jwt_claims") or {}
+    return str(claims.get(current_app.config.get("JWT_IDENTITY_CLAIM", "sub")))
+
+
+def _get_causal_tokens() -> TTLCache:
+    """Last cluster and operation times observed per user in this worker"""
+    tokens = current_app.extensions.get("db_causal_tokens")
+    if tokens is None:
+        tokens = TTLCache(max_size=10000, ttl=300)
+        current_app.extensions["db_causal_tokens"] = tokens
+    return tokens
+
+
+def _session() -> Dict:
+    """Session keyword argument for the current operation, if any"""
+    session = get_session()
+    return {"session": session} if session is not None else {}
+
+
 def _validate_object_id(id_value: Union[str, ObjectId]) -> ObjectId:
     """Validate and convert string to ObjectId"""
     if isinstance(id_value, ObjectId):
@@ -38,6 +362,18 @@ def _validate_object_id(id_value: Union[str, ObjectId]) -> ObjectId:
         raise InvalidObjectIdError(f"Invalid ObjectId format: {id_value}") from e
 
 
+def _time_limit(option: str = "max_time_ms") -> Dict:
+    """Server-side time limit for the current request's remaining budget"""
+    remaining = remaining_ms()
+    return {option: remaining} if remaining is not None else {}
+
+
+def _deadline_exceeded(collection: str, e: ExecutionTimeout):
+    """Convert a server-side query timeout into a DeadlineExceededError"""
+    logger.warning(f"Query on {collection} exceeded the request deadline: {str(e)}")
+    return DeadlineExceededError(f"Query on {collection} exceeded its time limit")
+
+
 def _add_timestamps(document: Dict, is_update: bool = False) -> Dict:
     """Add timestamps to document"""
     now = datetime.utcnow()
@@ -57,11 +393,17 @@ def insert_one(collection: str, document: Dict) -> ObjectId:
         # Add timestamps
         document = _add_timestamps(document.copy())
 
-        result = db[collection].insert_one(document)
+        result = _execute(
+            collection,
+            lambda: _collection(db, collection).insert_one(document, **_session()),
+        )
 
         logger.debug(f"Inserted document in {collection}: {result.inserted_id}")
+        notify_change(collection, result.inserted_id)
         return result.inserted_id
 
+    except CircuitOpenError:
+        raise
     except PyMongoError as e:
         logger.error(f"Database error inserting into {collection}: {str(e)}")
         raise DatabaseError(f"Failed to insert document: {str(e)}") from e
@@ -80,9 +422,15 @@ def insert_many(collection: str, documents: List[Dict]) -> List[ObjectId]:
         for doc in documents:
             timestamped_docs.append(_add_timestamps(doc.copy()))
 
-        result = db[collection].insert_many(timestamped_docs)
+        result = _execute(
+            collection,
+            lambda: _collection(db, collection).insert_many(
+                timestamped_docs, **_session()
+            ),
+        )
 
         logger.debug(f"Inserted {len(result.inserted_ids)} documents in {collection}")
+        notify_change(collection)
         return result.inserted_ids
 
     except PyMongoError as e:
@@ -91,13 +439,36 @@ def insert_many(collection: str, documents: List[Dict]) -> List[ObjectId]:
 
 
 def find_one(
-    collection: str, query: Dict, projection: Optional[Dict] = None
+    collection: str,
+    query: Dict,
+    projection: Optional[Dict] = None,
+    read_preference: Optional[str] = None,
 ) -> Optional[Dict]:
     """Find a document matching query"""
     try:
         db = get_db()
 
-        result = db[collection].find_one(query, projection)
+        cache = _get_fallback_cache()
+        cache_key = (collection, repr(query), repr(projection))
+
+        try:
+            result = _execute(
+                collection,
+                lambda: _collection(db, collection, read_preference).find_one(
+                    query, projection, **_time_limit(), **_session()
+                ),
+                idempotent=True,
+            )
+        except (CircuitOpenError, ConnectionFailure) as e:
+            cached = cache.get(cache_key) if cache is not None else None
+            if cached is None:
+                raise
+
+            logger.warning(f"Serving cached document from {collection}: {str(e)}")
+            return copy.deepcopy(cached)
+
+        if result and cache is not None:
+            cache.set(cache_key, copy.deepcopy(result))
 
         if result:
             logger.debug(f"Found document in {collection} with query: {query}")
@@ -106,21 +477,26 @@ def find_one(
 
         return result
 
+    except ExecutionTimeout as e:
+        raise _deadline_exceeded(collection, e) from e
     except PyMongoError as e:
         logger.error(f"Database error finding in {collection}: {str(e)}")
         raise DatabaseError(f"Failed to find document: {str(e)}") from e
 
 
 def find_by_id(
-    collection: str, id_value: Union[str, ObjectId], projection: Optional[Dict] = None
+    collection: str,
+    id_value: Union[str, ObjectId],
+    projection: Optional[Dict] = None,
+    read_preference: Optional[str] = None,
 ) -> Optional[Dict]:
     """Find a document by its ID"""
     try:
         object_id = _validate_object_id(id_value)
-        return find_one(collection, {"_id": object_id}, projection)
+        return find_one(collection, {"_id": object_id}, projection, read_preference)
 
-    except InvalidObjectIdError:
-        # Re-raise ObjectId validation errors
+    except (InvalidObjectIdError, DeadlineExceededError, CircuitOpenError):
+        # Re-raise ObjectId validation, deadline and circuit breaker errors
         raise
     except Exception as e:
         logger.error(f"Error finding by ID in {collection}: {str(e)}")
@@ -134,46 +510,143 @@ def find_many(
     limit: int = 0,
     skip: int = 0,
     projection: Optional[Dict] = None,
+    read_preference: Optional[str] = None,
 ) -> List[Dict]:
     """Find documents matching query with optional sorting and pagination"""
     try:
         db = get_db()
 
-        cursor = db[collection].find(query or {}, projection)
+        def run_query():
+            cursor = _collection(db, collection, read_preference).find(
+                query or {}, projection, **_time_limit(), **_session()
+            )
 
-        if sort:
-            cursor = cursor.sort(sort)
+            if sort:
+                cursor = cursor.sort(sort)
+
+            if skip > 0:
+                cursor = cursor.skip(skip)
 
-        if skip > 0:
-            cursor = cursor.skip(skip)
+            if limit > 0:
+                cursor = cursor.limit(limit)
 
-        if limit > 0:
-            cursor = cursor.limit(limit)
+            return list(cursor)
 
-        results = list(cursor)
+        results = _execute(collection, run_query, idempotent=True)
 
         logger.debug(f"Found {len(results)} documents in {collection}")
         return results
 
+    except ExecutionTimeout as e:
+        raise _deadline_exceeded(collection, e) from e
     except PyMongoError as e:
         logger.error(f"Database error finding many in {collection}: {str(e)}")
         raise DatabaseError(f"Failed to find documents: {str(e)}") from e
 
 
-def update_one(collection: str, id_value: Union[str, ObjectId], updates: Dict) -> int:
-    """Update a document by ID and return modified count"""
+def iter_many(
+    collection: str,
+    query: Optional[Dict] = None,
+    sort: Optional[List] = None,
+    projection: Optional[Dict] = None,
+    batch_size: int = 500,
+    chunk_size: int = 0,
+    no_cursor_timeout: bool = False,
+) -> Iterator[Union[Dict, List[Dict]]]:
+    """Stream documents matching query without loading the whole result set
+
+    Yields one document at a time, or lists of up to ``chunk_size`` documents
+    when ``chunk_size`` is set. The cursor is always closed when iteration
+    stops, which matters for ``no_cursor_timeout`` cursors that the server
+    would otherwise keep open.
+    """
+    try:
+        db = get_db()
+
+        cursor = db[collection].find(
+            query or {},
+            projection,
+            no_cursor_timeout=no_cursor_timeout,
+            **_time_limit(),
+        )
+
+        if sort:
+            cursor = cursor.sort(sort)
+
+        if batch_size > 0:
+            cursor = cursor.batch_size(batch_size)
+
+    except PyMongoError as e:
+        logger.error(f"Database error opening cursor on {collection}: {str(e)}")
+        raise DatabaseError(f"Failed to find documents: {str(e)}") from e
+
+    streamed = 0
+    try:
+        if chunk_size > 0:
+            chunk = []
+            for document in cursor:
+                chunk.append(document)
+                if len(chunk) >= chunk_size:
+                    streamed += len(chunk)
+                    yield chunk
+                    chunk = []
+
+            if chunk:
+                streamed += len(chunk)
+                yield chunk
+        else:
+            for document in cursor:
+                streamed += 1
+                yield document
+
+        logger.debug(f"Streamed {streamed} documents from {collection}")
+
+    except ExecutionTimeout as e:
+        raise _deadline_exceeded(collection, e) from e
+    except PyMongoError as e:
+        logger.error(
+            f"Database error streaming from {collection} after {streamed} "
+            f"documents: {str(e)}"
+        )
+        raise DatabaseError(f"Failed to stream documents: {str(e)}") from e
+    finally:
+        cursor.close()
+
+
+def update_one(
+    collection: str,
+    id_value: Union[str, ObjectId],
+    updates: Dict,
+    condition: Optional[Dict] = None,
+    touch: bool = True,
+) -> int:
+    """Update a document by ID and return modified count
+
+    ``condition`` adds fields the document must still match (compare and
+    set); ``touch=False`` leaves ``updated_at`` alone for writes that change
+    nothing clients can see.
+    """
     try:
         object_id = _validate_object_id(id_value)
         db = get_db()
 
         # Add update timestamp
-        updates = _add_timestamps(updates.copy(), is_update=True)
-
-        result = db[collection].update_one({"_id": object_id}, {"$set": updates})
+        if touch:
+            updates = _add_timestamps(updates.copy(), is_update=True)
+
+        result = _execute(
+            collection,
+            lambda: _collection(db, collection).update_one(
+                {**(condition or {}), "_id": object_id},
+                {"$set": updates},
+                **_session(),
+            ),
+        )
 
         logger.debug(
             f"Updated document in {collection}: {object_id}, modified: {result.modified_count}"
         )
+        notify_change(collection, object_id)
         return result.modified_count
 
     except InvalidObjectIdError:
@@ -192,9 +665,15 @@ def update_many(collection: str, query: Dict, updates: Dict) -> int:
         # Add update timestamp
         updates = _add_timestamps(updates.copy(), is_update=True)
 
-        result = db[collection].update_many(query, {"$set": updates})
+        result = _execute(
+            collection,
+            lambda: _collection(db, collection).update_many(
+                query, {"$set": updates}, **_session()
+            ),
+        )
 
         logger.debug(f"Updated {result.modified_count} documents in {collection}")
+        notify_change(collection)
         return result.modified_count
 
     except PyMongoError as e:
@@ -208,11 +687,17 @@ def delete_one(collection: str, id_value: Union[str, ObjectId]) -> int:
         object_id = _validate_object_id(id_value)
         db = get_db()
 
-        result = db[collection].delete_one({"_id": object_id})
+        result = _execute(
+            collection,
+            lambda: _collection(db, collection).delete_one(
+                {"_id": object_id}, **_session()
+            ),
+        )
 
         logger.debug(
             f"Deleted document in {collection}: {object_id}, deleted: {result.deleted_count}"
         )
+        notify_change(collection, object_id)
         return result.deleted_count
 
     except InvalidObjectIdError:
@@ -228,9 +713,13 @@ def delete_many(collection: str, query: Dict) -> int:
     try:
         db = get_db()
 
-        result = db[collection].delete_many(query)
+        result = _execute(
+            collection,
+            lambda: _collection(db, collection).delete_many(query, **_session()),
+        )
 
         logger.debug(f"Deleted {result.deleted_count} documents in {collection}")
+        notify_change(collection)
         return result.deleted_count
 
     except PyMongoError as e:
@@ -238,39 +727,68 @@ def delete_many(collection: str, query: Dict) -> int:
         raise DatabaseError(f"Failed to delete documents: {str(e)}") from e
 
 
-def count_documents(collection: str, query: Optional[Dict] = None) -> int:
+def count_documents(
+    collection: str,
+    query: Optional[Dict] = None,
+    read_preference: Optional[str] = None,
+) -> int:
     """Count documents matching query"""
     try:
         db = get_db()
 
-        count = db[collection].count_documents(query or {})
+        count = _execute(
+            collection,
+            lambda: _collection(db, collection, read_preference).count_documents(
+                query or {}, **_time_limit("maxTimeMS"), **_session()
+            ),
+            idempotent=True,
+        )
 
         logger.debug(f"Counted {count} documents in {collection}")
         return count
 
+    except ExecutionTimeout as e:
+        raise _deadline_exceeded(collection, e) from e
     except PyMongoError as e:
         logger.error(f"Database error counting in {collection}: {str(e)}")
         raise DatabaseError(f"Failed to count documents: {str(e)}") from e
 
 
-def aggregate(collection: str, pipeline: List[Dict]) -> List[Dict]:
+def aggregate(
+    collection: str, pipeline: List[Dict], read_preference: Optional[str] = None
+) -> List[Dict]:
     """Run aggregation pipeline on collection"""
     try:
         db = get_db()
 
-        results = list(db[collection].aggregate(pipeline))
+        # Read-only pipelines: stages such as $out must not go through here
+        results = _execute(
+            collection,
+            lambda: list(
+                _collection(db, collection, read_preference).aggregate(
+                    pipeline, **_time_limit("maxTimeMS"), **_session()
+                )
+            ),
+            idempotent=True,
+        )
 
         logger.debug(f"Aggregation on {collection} returned {len(results)} results")
         return results
 
+    except ExecutionTimeout as e:
+        raise _deadline_exceeded(collection, e) from e
     except PyMongoError as e:
         logger.error(f"Database error in aggregation for {collection}: {str(e)}")
         raise DatabaseError(f"Failed to run aggregation: {str(e)}") from e
 
 
-def ensure_document_exists(collection: str, id_value: Union[str, ObjectId]) -> Dict:
+def ensure_document_exists(
+    collection: str,
+    id_value: Union[str, ObjectId],
+    read_preference: Optional[str] = None,
+) -> Dict:
     """Find document by ID or raise DocumentNotFoundError"""
-    document = find_by_id(collection, id_value)
+    document = find_by_id(collection, id_value, read_preference=read_preference)
 
     if not document:
         raise DocumentNotFoundError(
@@ -0,0 +1,54 @@
+import time
+from typing import Optional
+
+from flask import current_app, g, has_app_context
+
+from app.utils.exceptions import DeadlineExceededError
+
+
+def deadline(ms=None, config_key=None):
+    """Decorator to set a route's time budget, in ms or as a config key"""
+
+    def decorator(f):
+        f.deadline_ms = ms
+        f.deadline_config_key = config_key
+        return f
+
+    return decorator
+
+
+def start_request_deadline(view) -> Optional[float]:
+    """Store the deadline for the current request on flask.g"""
+    config_key = getattr(view, "deadline_config_key", None)
+    budget_ms = getattr(view, "deadline_ms", None)
+    if config_key:
+        budget_ms = current_app.config.get(config_key)
+    if budget_ms is None:
+        budget_ms = current_app.config.get("REQUEST_DEADLINE_MS")
+
+    if not budget_ms:
+        g.deadline = None
+    else:
+        g.deadline = time.monotonic() + budget_ms / 1000
+
+    return g.deadline
+
+
+def remaining_ms() -> Optional[int]:
+    """Milliseconds left before the current request's deadline
+
+    Returns None outside a request or when no deadline applies, and raises
+    DeadlineExceededError once it has passed so no new query is started.
+    """
+    if not has_app_context():
+        return None
+
+    expires_at = g.get("deadline")
+    if expires_at is None:
+        return None
+
+    remaining = int((expires_at - time.monotonic()) * 1000)
+    if remaining <= 0:
+        raise DeadlineExceededError("Request deadline exceeded")
+
+    return remaining
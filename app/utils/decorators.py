@@ -1,15 +1,19 @@
 import functools
+import hashlib
 import logging
 
-from flask import g, jsonify, request
-from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
+from flask import current_app, g, jsonify, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
 from marshmallow import ValidationError as MarshmallowValidationError
 
 from app.models.exceptions import ValidationError
+from app.utils.cache import TTLCache
 from app.utils.exceptions import (
     DatabaseError,
+    DeadlineExceededError,
     DocumentNotFoundError,
     InvalidObjectIdError,
+    ServiceUnavailableError,
 )
 
 logger = logging.getLogger(__name__)
@@ -70,6 +74,31 @@ def handle_errors(f):
                 ),
                 404,
             )
+        except ServiceUnavailableError as e:
+            logger.warning(f"[{g.get('request_id')}] Service unavailable: {str(e)}")
+            return (
+                jsonify(
+                    {
+                        "error": "Service unavailable",
+                        "message": "Server is busy, please retry shortly",
+                        "request_id": g.get("request_id"),
+                    }
+                ),
+                503,
+                {"Retry-After": str(e.retry_after)},
+            )
+        except DeadlineExceededError as e:
+            logger.warning(f"[{g.get('request_id')}] Deadline exceeded: {str(e)}")
+            return (
+                jsonify(
+                    {
+                        "error": "Request timeout",
+                        "message": "The request took too long, please retry",
+                        "request_id": g.get("request_id"),
+                    }
+                ),
+                504,
+            )
         except DatabaseError as e:
             logger.error(f"[{g.get('request_id')}] Database error: {str(e)}")
             return (
@@ -139,16 +168,83 @@ def validate_json(schema_class):
     return decorator
 
 
-def require_user_type(user_type):
-    """Decorator to require specific user type (user/company)"""
+def get_claims_cache():
+    """Get this worker's verified-claims cache, or None when disabled"""
+    cache = current_app.extensions.get("jwt_claims_cache")
+
+    if cache is None:
+        max_size = current_app.config.get("JWT_CLAIMS_CACHE_SIZE", 0)
+        if max_size <= 0:
+            return None
+
+        cache = TTLCache(max_size=max_size)
+        current_app.extensions["jwt_claims_cache"] = cache
+
+    return cache
+
+
+def get_verified_claims(query_string=False):
+    """Get the request's verified access-token claims
+
+    Signature checks are cached per token digest until the token's exp, so
+    clients re-sending the same token skip the decode and HMAC verification.
+    With ``query_string``, a token may also come from the
+    JWT_QUERY_STRING_NAME parameter when no Authorization header is sent.
+    """
+    cache = get_claims_cache()
+    header = request.headers.get("Authorization", "")
+    token = header[7:] if header.startswith("Bearer ") else None
+
+    g.jwt_location = "headers"
+    if token is None and query_string:
+        token = request.args.get(current_app.config["JWT_QUERY_STRING_NAME"])
+        if token:
+            g.jwt_location = "query_string"
+
+    if cache is not None and token:
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        claims = cache.get(cache_key)
+        if claims is not None:
+            g.jwt_claims = claims
+            return claims
+
+    verify_jwt_in_request(locations=[g.jwt_location])
+    claims = get_jwt()
+
+    if cache is not None and token and "exp" in claims:
+        cache.set(cache_key, claims, expires_at=claims["exp"])
+
+    g.jwt_claims = claims
+    return claims
+
+
+def require_user_type(user_type, token_scope=None):
+    """Decorator to require specific user type (user/company)
+
+    Routes naming a ``token_scope`` also accept a token in the query string
+    (for clients that cannot set headers, like EventSource), but only one
+    issued for that scope; scoped tokens open no other route.
+    """
 
     def decorator(f):
         @functools.wraps(f)
-        @jwt_required()
         def decorated_function(*args, **kwargs):
-            claims = get_jwt()
+            claims = get_verified_claims(query_string=token_scope is not None)
             current_user_type = claims.get("user_type", "")
 
+            scope = claims.get("scope")
+            if scope != token_scope and (scope or g.jwt_location == "query_string"):
+                return (
+                    jsonify(
+                        {
+                            "error": "Access denied",
+                            "message": "This token cannot be used for this endpoint",
+                            "request_id": g.get("request_id"),
+                        }
+                    ),
+                    403,
+                )
+
             if current_user_type != user_type:
                 return (
                     jsonify(
@@ -162,7 +258,9 @@ def require_user_type(user_type):
                 )
 
             # Add user info to kwargs
-            kwargs["current_user_id"] = get_jwt_identity()
+            kwargs["current_user_id"] = claims[
+                current_app.config.get("JWT_IDENTITY_CLAIM", "sub")
+            ]
             kwargs["current_user_type"] = current_user_type
 
             return f(*args, **kwargs)
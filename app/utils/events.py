@@ -0,0 +1,321 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Iterator, Optional
+
+from flask import Response, current_app, stream_with_context
+from flask_jwt_extended import create_access_token
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.utils.exceptions import ServiceUnavailableError
+from app.utils.invalidation import CHANGE_STREAMS_UNSUPPORTED
+
+logger = logging.getLogger(__name__)
+
+# Claim value of tokens issued for event streams
+STREAM_TOKEN_SCOPE = "events"
+
+APPLICATION_STATUS_EVENT = "application_status"
+
+
+class Subscription:
+    """Queue of events for one listener on one topic"""
+
+    def __init__(self, broker, topic: str, queue_size: int):
+        self.broker = broker
+        self.topic = topic
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+
+    def put(self, event: Dict) -> None:
+        """Queue an event, dropping the oldest one when the listener lags"""
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Wait for the next event, or return None after the timeout"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class EventBroker:
+    """In-process publish/subscribe for server-sent events
+
+    Publishing never blocks: each subscriber has a bounded queue and slow
+    listeners lose their oldest events instead of holding up the request
+    that made the change.
+    """
+
+    def __init__(self, max_subscribers: int = 100, queue_size: int = 100):
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self.pid = os.getpid()
+        self.source = None
+        self.published = 0
+        self._topics: Dict[str, set] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        return self._count
+
+    def subscribe(self, topic: str) -> Subscription:
+        """Listen to a topic, or raise ServiceUnavailableError when full"""
+        subscription = Subscription(self, topic, self.queue_size)
+
+        with self._lock:
+            if self._count >= self.max_subscribers:
+                raise ServiceUnavailableError("Too many event streams", retry_after=5)
+            self._topics.setdefault(topic, set()).add(subscription)
+            self._count += 1
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._topics.get(subscription.topic)
+            if subscribers is None or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            self._count -= 1
+            if not subscribers:
+                del self._topics[subscription.topic]
+
+    def publish(self, topic: str, event_type: str, data: Dict) -> int:
+        """Send an event to a topic's subscribers, returning how many got it"""
+        with self._lock:
+            self.published += 1
+            event = {"event": event_type, "data": data}
+            subscribers = list(self._topics.get(topic, ()))
+
+        for subscription in subscribers:
+            subscription.put(event)
+
+        return len(subscribers)
+
+    def snapshot(self) -> Dict:
+        """Return current broker state"""
+        with self._lock:
+            return {
+                "subscribers": self._count,
+                "topics": len(self._topics),
+                "published": self.published,
+            }
+
+
+class ChangeStreamSource:
+    """Publish application status changes read from a MongoDB change stream
+
+    Runs in a daemon thread and resumes after the last seen change when the
+    stream breaks. Change streams need a replica set or sharded cluster; on
+    a standalone server the source marks itself unavailable and workers
+    publish their own changes instead.
+    """
+
+    PIPELINE = [
+        {
+            "$match": {
+                "operationType": "update",
+                "updateDescription.updatedFields.status": {"$exists": True},
+            }
+        }
+    ]
+
+    def __init__(self, app, broker: EventBroker, retry_delay: float = 1):
+        self.app = app
+        self.broker = broker
+        self.retry_delay = retry_delay
+        self.resume_token = None
+        self.available = True
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="application-change-stream", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self):
+        from app.utils.db import get_db
+
+        while not self._stopped.is_set():
+            try:
+                with self.app.app_context():
+                    collection = get_db()["applications"]
+                with collection.watch(
+                    self.PIPELINE,
+                    full_document="updateLookup",
+                    resume_after=self.resume_token,
+                    max_await_time_ms=1000,
+                ) as stream:
+                    while not self._stopped.is_set() and stream.alive:
+                        change = stream.try_next()
+                        if change is not None:
+                            self.resume_token = stream.resume_token
+                            self.handle(change)
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAMS_UNSUPPORTED:
+                    logger.warning(
+                        "Change streams unavailable, application events are "
+                        "only delivered by the worker that made the change"
+                    )
+                    self.available = False
+                    return
+                logger.warning(f"Application change stream interrupted: {str(e)}")
+                self._stopped.wait(self.retry_delay)
+            except PyMongoError as e:
+                logger.warning(f"Application change stream interrupted: {str(e)}")
+                self._stopped.wait(self.retry_delay)
+
+    def handle(self, change: Dict) -> None:
+        """Publish the status event for one change document"""
+        application = change.get("fullDocument")
+        if application is not None:
+            _publish_status(self.broker, application)
+
+
+def get_event_broker() -> EventBroker:
+    """Get this worker's event broker, created on first use"""
+    broker = current_app.extensions.get("event_broker")
+
+    # Subscribers and the change stream thread belong to one process
+    if broker is None or broker.pid != os.getpid():
+        config = current_app.config
+        broker = EventBroker(
+            max_subscribers=config.get("EVENTS_MAX_SUBSCRIBERS", 100),
+            queue_size=config.get("EVENTS_QUEUE_SIZE", 100),
+        )
+        current_app.extensions["event_broker"] = broker
+
+        if config.get("EVENTS_SOURCE", "local") == "change_stream":
+            broker.source = ChangeStreamSource(
+                current_app._get_current_object(), broker
+            )
+            broker.source.start()
+
+    return broker
+
+
+def _publish_status(broker: EventBroker, application: Dict) -> int:
+    updated_at = application.get("updated_at")
+    return broker.publish(
+        f"user:{application['user_id']}",
+        APPLICATION_STATUS_EVENT,
+        {
+            "application_id": str(application["_id"]),
+            "job_id": str(application.get("job_id")),
+            "status": application.get("status"),
+            "updated_at": updated_at.isoformat() if updated_at else None,
+        },
+    )
+
+
+def publish_application_status(application: Dict) -> int:
+    """Notify the applicant that an application's status changed
+
+    With the change stream source the event comes from MongoDB instead, so
+    publishing here would deliver it twice.
+    """
+    broker = get_event_broker()
+    if current_app.config.get("EVENTS_SOURCE", "local") == "change_stream":
+        if getattr(broker.source, "available", True):
+            return 0
+    return _publish_status(broker, application)
+
+
+def format_event(event: Dict) -> str:
+    """Serialize an event in the text/event-stream format
+
+    Events carry no ``id:``: nothing is kept to replay from a Last-Event-ID,
+    so reconnecting clients reload the applications list instead.
+    """
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+def stream_events(
+    subscription: Subscription,
+    heartbeat: float = 15,
+    duration: float = 300,
+    retry_ms: int = 3000,
+) -> Iterator[str]:
+    """Yield a subscription's events as SSE, with keep-alive comments
+
+    The stream ends after ``duration`` seconds so worker threads are not
+    held forever; browsers reconnect after ``retry_ms``.
+    """
+    try:
+        yield f"retry: {retry_ms}\n\n"
+        ends_at = time.monotonic() + duration
+        while True:
+            remaining = ends_at - time.monotonic()
+            if remaining <= 0:
+                return
+
+            event = subscription.get(timeout=min(heartbeat, remaining))
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield format_event(event)
+    finally:
+        subscription.close()
+
+
+def issue_stream_token(user_id: str, user_type: str) -> Dict:
+    """Create a short-lived token that only opens event streams
+
+    EventSource cannot send an Authorization header, so the token travels
+    in the stream URL; keeping it scoped and short-lived limits what a
+    logged URL exposes.
+    """
+    expires_in = current_app.config.get("EVENTS_TOKEN_SECONDS", 60)
+    token = create_access_token(
+        identity=str(user_id),
+        additional_claims={"user_type": user_type, "scope": STREAM_TOKEN_SCOPE},
+        expires_delta=timedelta(seconds=expires_in),
+    )
+    return {"token": token, "expires_in": expires_in}
+
+
+def event_stream_response(topic: str) -> Response:
+    """Subscribe to a topic and stream it as a text/event-stream response
+
+    The subscription is released when the response is closed, including
+    when the body is never iterated (HEAD requests, early disconnects).
+    """
+    config = current_app.config
+    subscription = get_event_broker().subscribe(topic)
+
+    events = stream_events(
+        subscription,
+        heartbeat=config.get("EVENTS_HEARTBEAT_SECONDS", 15),
+        duration=config.get("EVENTS_STREAM_SECONDS", 300),
+    )
+    response = Response(
+        stream_with_context(events),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    response.call_on_close(subscription.close)
+    return response
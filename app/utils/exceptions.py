@@ -14,3 +14,23 @@ class DocumentNotFoundError(Exception):
     """Custom exception for when document is not found"""
 
     pass
+
+
+class DeadlineExceededError(Exception):
+    """Custom exception for operations that ran past the request deadline"""
+
+    pass
+
+
+class ServiceUnavailableError(Exception):
+    """Custom exception for shedding load when a resource is saturated"""
+
+    def __init__(self, message, retry_after=1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(ServiceUnavailableError):
+    """Custom exception for calls refused while a circuit breaker is open"""
+
+    pass
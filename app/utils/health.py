@@ -0,0 +1,122 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, List
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Ping the database in the background and keep the last result
+
+    Probes read the cached status instead of hitting MongoDB themselves, so
+    frequent load balancer checks add no database load and never pile up
+    behind a slow server. With an interval of 0 every status read pings.
+    """
+
+    def __init__(self, app, interval: float = 5):
+        self.app = app
+        self.interval = interval
+        self.pid = os.getpid()
+        self._status = {"database": "unknown", "checked_at": None}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Run a first check now, then keep checking in a daemon thread"""
+        self.check()
+
+        if self.interval > 0:
+            self._thread = threading.Thread(
+                target=self._run, name="health-monitor", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread"""
+        self._stopped.set()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.check()
+
+    def check(self) -> Dict:
+        """Ping the database and store the outcome"""
+        from app.utils.db import get_db
+
+        started = time.perf_counter()
+        try:
+            with self.app.app_context():
+                get_db().command("ping")
+            status = {
+                "database": "connected",
+                "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+            }
+        except Exception as e:
+            logger.warning(f"Background health check failed: {str(e)}")
+            status = {"database": "disconnected", "error": str(e)}
+
+        status["checked_at"] = time.time()
+        with self._lock:
+            self._status = status
+        return status
+
+    def status(self) -> Dict:
+        """Get the latest database status"""
+        if self.interval <= 0:
+            return self.check()
+
+        with self._lock:
+            status = dict(self._status)
+
+        # A monitor that stopped reporting cannot vouch for the database
+        checked_at = status.get("checked_at")
+        if checked_at is None or time.time() - checked_at > self.interval * 3:
+            status["database"] = "stale"
+
+        return status
+
+
+def get_health_monitor() -> HealthMonitor:
+    """Get this process's health monitor, started on first use"""
+    monitor = current_app.extensions.get("health_monitor")
+
+    # Threads do not survive fork(), so each worker starts its own
+    if monitor is None or monitor.pid != os.getpid():
+        monitor = HealthMonitor(
+            current_app._get_current_object(),
+            interval=current_app.config.get("HEALTH_CHECK_INTERVAL", 5),
+        )
+        current_app.extensions["health_monitor"] = monitor
+        monitor.start()
+
+    return monitor
+
+
+def readiness_problems(database: Dict) -> List[str]:
+    """List the reasons this worker should not receive traffic"""
+    from app.utils.db import get_circuit_breaker
+
+    problems = []
+
+    if database.get("database") != "connected":
+        problems.append(f"database {database.get('database')}")
+
+    breaker = get_circuit_breaker()
+    if breaker is not None and breaker.state == breaker.OPEN:
+        problems.append("database circuit open")
+
+    pool_monitor = getattr(current_app, "pool_monitor", None)
+    saturation = current_app.config.get("HEALTH_POOL_SATURATION", 0.9)
+    if pool_monitor is not None and pool_monitor.utilization() >= saturation:
+        problems.append("connection pool saturated")
+
+    limiter = current_app.extensions.get("concurrency_limiter")
+    if limiter is not None and limiter.in_flight >= limiter.limit:
+        problems.append("concurrency limit reached")
+
+    return problems
@@ -0,0 +1,135 @@
+import logging
+import os
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List
+
+from flask import current_app, g, has_app_context
+
+logger = logging.getLogger(__name__)
+
+# Background thread sending purge requests, recreated after a fork
+_purge_executor = None
+_purge_executor_pid = None
+_purge_lock = threading.Lock()
+
+
+def cache_policy(directives=None, config_key=None, vary=()):
+    """Decorator to set a route's Cache-Control, literally or as a config key"""
+
+    def decorator(f):
+        f.cache_directives = directives
+        f.cache_config_key = config_key
+        f.cache_vary = tuple(vary)
+        return f
+
+    return decorator
+
+
+def job_key(job_id) -> str:
+    return f"job-{job_id}"
+
+
+def company_key(company_id) -> str:
+    return f"company-{company_id}"
+
+
+def company_jobs_key(company_id) -> str:
+    return f"company-{company_id}-jobs"
+
+
+def add_surrogate_keys(*keys) -> None:
+    """Tag the current response so a CDN can purge it by key"""
+    g.setdefault("surrogate_keys", [])
+    for key in keys:
+        if key not in g.surrogate_keys:
+            g.surrogate_keys.append(key)
+
+
+def apply_cache_policy(view, response):
+    """Set Cache-Control, Vary and surrogate keys for a successful response
+
+    Errors keep the default headers so shared caches never store them.
+    """
+    if view is None or not current_app.config.get("HTTP_CACHE_ENABLED", True):
+        return response
+
+    directives = getattr(view, "cache_directives", None)
+    config_key = getattr(view, "cache_config_key", None)
+    if config_key:
+        directives = current_app.config.get(config_key)
+
+    if not directives or response.status_code not in (200, 304):
+        return response
+
+    response.headers["Cache-Control"] = directives
+    for header in getattr(view, "cache_vary", ()):
+        response.vary.add(header)
+
+    keys = g.get("surrogate_keys")
+    if keys:
+        header = current_app.config.get("HTTP_CACHE_SURROGATE_HEADER", "Surrogate-Key")
+        response.headers[header] = " ".join(keys)
+
+    return response
+
+
+def register_purge_hook(app, hook: Callable[[List[str]], None]) -> None:
+    """Call hook(keys) whenever the app purges surrogate keys"""
+    app.extensions.setdefault("cache_purge_hooks", []).append(hook)
+
+
+def _send_purge(url: str, method: str, header: str, token: str, keys: List[str]):
+    request = urllib.request.Request(url, method=method)
+    request.add_header(header, " ".join(keys))
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+
+    try:
+        with urllib.request.urlopen(request, timeout=5):
+            pass
+        logger.debug(f"Purged surrogate keys: {keys}")
+    except Exception as e:
+        logger.warning(f"Surrogate key purge failed for {keys}: {str(e)}")
+
+
+def purge_surrogate_keys(keys: Iterable[str]) -> None:
+    """Ask the CDN to drop responses tagged with keys, in the background
+
+    Sends HTTP_CACHE_PURGE_METHOD to HTTP_CACHE_PURGE_URL with the keys in
+    the surrogate key header (the Fastly and Varnish xkey convention), then
+    runs registered purge hooks. Never blocks or fails the caller's write.
+    """
+    global _purge_executor, _purge_executor_pid
+
+    keys = list(keys)
+    if not keys or not has_app_context():
+        return
+
+    for hook in current_app.extensions.get("cache_purge_hooks", ()):
+        try:
+            hook(keys)
+        except Exception as e:
+            logger.warning(f"Purge hook failed for {keys}: {str(e)}")
+
+    config = current_app.config
+    url = config.get("HTTP_CACHE_PURGE_URL")
+    if not url:
+        return
+
+    with _purge_lock:
+        if _purge_executor is None or _purge_executor_pid != os.getpid():
+            _purge_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="cache-purge"
+            )
+            _purge_executor_pid = os.getpid()
+
+    _purge_executor.submit(
+        _send_purge,
+        url,
+        config.get("HTTP_CACHE_PURGE_METHOD", "POST"),
+        config.get("HTTP_CACHE_SURROGATE_HEADER", "Surrogate-Key"),
+        config.get("HTTP_CACHE_PURGE_TOKEN"),
+        keys,
+    )
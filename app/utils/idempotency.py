@@ -0,0 +1,304 @@
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from flask import current_app, g, make_response, request
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from app.utils.cache import TTLCache
+from app.utils.db import create_index, get_db
+from app.utils.exceptions import DatabaseError, ServiceUnavailableError
+from app.utils.rate_limit import get_client_key
+from app.utils.response_helpers import error_response
+
+logger = logging.getLogger(__name__)
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+# Responses a retry may legitimately change (besides 5xx), never replayed
+RETRYABLE_STATUSES = {401, 403, 408, 409, 429}
+
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+
+class MemoryIdempotencyStore:
+    """Idempotency records in this worker's memory (single worker deployments)"""
+
+    def __init__(self, max_size: int = 10000):
+        self._records = TTLCache(max_size=max_size)
+        self._lock = threading.Lock()
+
+    def claim(self, key: str, fingerprint: str, lock_seconds: float) -> Optional[Dict]:
+        """Reserve key for this request; return the existing record if taken"""
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None:
+                return record
+
+            self._records.set(
+                key, {"fingerprint": fingerprint, "state": IN_PROGRESS}, lock_seconds
+            )
+            return None
+
+    def complete(self, key: str, response: Dict, ttl: float) -> None:
+        """Store the response to replay for key"""
+        with self._lock:
+            record = self._records.get(key) or {}
+            self._records.set(key, {**record, "state": COMPLETED, **response}, ttl)
+
+    def release(self, key: str) -> None:
+        """Forget key so the request can be retried"""
+        self._records.delete(key)
+
+
+class MongoIdempotencyStore:
+    """Idempotency records in a TTL-indexed collection shared by all workers"""
+
+    COLLECTION = "idempotency_keys"
+
+    def __init__(self):
+        self._indexed = False
+
+    def _ensure_indexes(self):
+        if not self._indexed:
+            # Records are removed by MongoDB once they expire
+            create_index(self.COLLECTION, "expires_at", expireAfterSeconds=0)
+            self._indexed = True
+
+    def claim(self, key: str, fingerprint: str, lock_seconds: float) -> Optional[Dict]:
+        """Reserve key for this request; return the existing record if taken"""
+        self._ensure_indexes()
+
+        now = datetime.utcnow()
+        record = {
+            "fingerprint": fingerprint,
+            "state": IN_PROGRESS,
+            "expires_at": now + timedelta(seconds=lock_seconds),
+        }
+        collection = get_db()[self.COLLECTION]
+
+        try:
+            existing = None
+            while existing is None:
+                try:
+                    collection.insert_one({"_id": key, **record})
+                    return None
+                except DuplicateKeyError:
+                    # None when it expired between the insert and the read
+                    existing = collection.find_one({"_id": key})
+
+            # A request that died mid-flight leaves a stale lock; take it over
+            # (MongoDB's TTL monitor only runs once a minute)
+            if existing["expires_at"] <= now:
+                result = collection.update_one(
+                    {"_id": key, "expires_at": existing["expires_at"]},
+                    {"$set": record},
+                )
+                if result.modified_count:
+                    return None
+
+            return existing
+
+        except PyMongoError as e:
+            logger.error(f"Database error claiming idempotency key: {str(e)}")
+            raise DatabaseError(f"Failed to claim idempotency key: {str(e)}") from e
+
+    def complete(self, key: str, response: Dict, ttl: float) -> None:
+        """Store the response to replay for key"""
+        expires_at = datetime.utcnow() + timedelta(seconds=ttl)
+        try:
+            get_db()[self.COLLECTION].update_one(
+                {"_id": key},
+                {"$set": {"state": COMPLETED, "expires_at": expires_at, **response}},
+            )
+
+        except PyMongoError as e:
+            # The request itself succeeded; a retry will simply run again
+            logger.error(f"Database error storing idempotent response: {str(e)}")
+
+    def release(self, key: str) -> None:
+        """Forget key so the request can be retried"""
+        try:
+            get_db()[self.COLLECTION].delete_one({"_id": key})
+
+        except PyMongoError as e:
+            logger.error(f"Database error releasing idempotency key: {str(e)}")
+
+
+IDEMPOTENCY_STORES = {
+    "memory": MemoryIdempotencyStore,
+    "mongo": MongoIdempotencyStore,
+}
+
+
+def get_idempotency_store():
+    """Get the app's idempotency store, created on first use"""
+    store = current_app.extensions.get("idempotency_store")
+
+    if store is None:
+        backend = current_app.config.get("IDEMPOTENCY_STORE", "mongo")
+        if backend not in IDEMPOTENCY_STORES:
+            raise ValueError(f"Unknown idempotency store: {backend}")
+
+        store = IDEMPOTENCY_STORES[backend]()
+        current_app.extensions["idempotency_store"] = store
+
+    return store
+
+
+def _request_fingerprint() -> str:
+    digest = hashlib.sha256(f"{request.method} {request.path}\n".encode())
+    digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+def _scoped_key(key: str) -> str:
+    """Namespace a client's key by caller, so clients cannot collide"""
+    return hashlib.sha256(f"{get_client_key()}\n{key}".encode()).hexdigest()
+
+
+def _replay(record: Dict, restore=None):
+    body = record["body"]
+    if restore is not None and record.get("context"):
+        payload = json.loads(body)
+        payload["data"].update(restore(record["context"]))
+        body = json.dumps(payload)
+
+    response = current_app.response_class(
+        body, status=record["status"], mimetype=record["mimetype"]
+    )
+    if record.get("location"):
+        response.headers["Location"] = record["location"]
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _claim(store, key: str, fingerprint: str, config) -> Optional[Dict]:
+    """Claim key, waiting while another request holds it
+
+    Returns None once this request holds the key, or the record to replay
+    (or reject, when it belongs to a different request). Raises
+    ServiceUnavailableError if the holder does not finish within
+    IDEMPOTENCY_WAIT_SECONDS.
+    """
+    lock_seconds = config.get("IDEMPOTENCY_LOCK_SECONDS", 60)
+    give_up_at = time.monotonic() + config.get("IDEMPOTENCY_WAIT_SECONDS", 10)
+    delay = 0.05
+
+    while True:
+        record = store.claim(key, fingerprint, lock_seconds)
+        if (
+            record is None
+            or record["state"] == COMPLETED
+            or record["fingerprint"] != fingerprint
+        ):
+            return record
+
+        if time.monotonic() + delay > give_up_at:
+            raise ServiceUnavailableError(
+                "A request with this idempotency key is still in progress"
+            )
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+
+
+def remember_for_replay(**values) -> None:
+    """Keep values (e.g. a created ID) with the stored response for restore"""
+    g.idempotency_context = {**g.get("idempotency_context", {}), **values}
+
+
+def _redacted_body(response, redact) -> str:
+    body = response.get_data(as_text=True)
+    if not redact or not response.is_json:
+        return body
+
+    payload = response.get_json()
+    data = payload.get("data") if isinstance(payload, dict) else None
+    if isinstance(data, dict):
+        for field in redact:
+            data.pop(field, None)
+    return json.dumps(payload)
+
+
+def idempotent(redact=(), restore=None):
+    """Decorator making a POST route safe to retry with an Idempotency-Key
+
+    The first request with a given key runs normally and its response is
+    stored for IDEMPOTENCY_TTL seconds, unless it is a server error or
+    otherwise worth retrying. Retries with the same key and body get that
+    response back, marked Idempotent-Replayed, without running the route
+    again. A retry arriving while the first request is still running waits
+    for it (503 with Retry-After after IDEMPOTENCY_WAIT_SECONDS). Requests
+    without the header are not affected.
+
+    Fields of the response ``data`` listed in ``redact`` (credentials) are
+    never stored; ``restore(context)`` rebuilds them on replay from what the
+    route passed to remember_for_replay().
+    """
+
+    def decorator(f):
+        @functools.wraps(f)
+        def decorated_function(*args, **kwargs):
+            key = request.headers.get(HEADER)
+            if key is None or not current_app.config.get("IDEMPOTENCY_ENABLED", True):
+                return f(*args, **kwargs)
+
+            if not key or len(key) > MAX_KEY_LENGTH:
+                return error_response(
+                    f"{HEADER} must be 1 to {MAX_KEY_LENGTH} characters",
+                    400,
+                    "invalid_idempotency_key",
+                )
+
+            config = current_app.config
+            store = get_idempotency_store()
+            scoped_key = _scoped_key(key)
+            fingerprint = _request_fingerprint()
+
+            record = _claim(store, scoped_key, fingerprint, config)
+            if record is not None:
+                if record["fingerprint"] != fingerprint:
+                    return error_response(
+                        f"{HEADER} was already used with a different request",
+                        422,
+                        "idempotency_key_reused",
+                    )
+                return _replay(record, restore)
+
+            try:
+                response = make_response(f(*args, **kwargs))
+            except BaseException:
+                store.release(scoped_key)
+                raise
+
+            if (
+                response.status_code >= 500
+                or response.status_code in RETRYABLE_STATUSES
+                or response.is_streamed
+            ):
+                store.release(scoped_key)
+            else:
+                store.complete(
+                    scoped_key,
+                    {
+                        "status": response.status_code,
+                        "body": _redacted_body(response, redact),
+                        "mimetype": response.mimetype,
+                        "location": response.headers.get("Location"),
+                        "context": g.get("idempotency_context"),
+                    },
+                    config.get("IDEMPOTENCY_TTL", 86400),
+                )
+
+            return response
+
+        return decorated_function
+
+    return decorator
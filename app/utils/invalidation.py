@@ -0,0 +1,233 @@
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Optional
+
+from flask import current_app, has_app_context
+from pymongo.errors import OperationFailure, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+WATCHED_COLLECTIONS = ("jobs", "companies", "users")
+
+# Server error codes meaning change streams are unavailable (standalone)
+CHANGE_STREAMS_UNSUPPORTED = {40573, 40324}
+
+
+class InvalidationBus:
+    """Tell this worker's caches which documents changed anywhere
+
+    Writes made through app.utils.db are announced immediately. Writes from
+    other workers and nodes arrive from a MongoDB change stream or, on a
+    standalone server, by polling ``updated_at``. Listeners get the
+    collection and the changed document ID, or None when any document of
+    the collection may have changed (dropped collection, lost stream
+    position).
+
+    Sources: "auto" (change stream, polling when unsupported), "change_stream",
+    "poll", and "local" (only this worker's own writes, no thread).
+    """
+
+    def __init__(
+        self,
+        app,
+        collections: Iterable[str] = WATCHED_COLLECTIONS,
+        source: str = "auto",
+        poll_interval: float = 2,
+        poll_overlap: float = 5,
+    ):
+        self.app = app
+        self.collections = tuple(collections)
+        self.source = source
+        self.poll_interval = poll_interval
+        self.poll_overlap = timedelta(seconds=poll_overlap)
+        self.pid = os.getpid()
+        self.mode = None
+        self.events = 0
+        self.resume_token = None
+        self._listeners: Dict[str, list] = {name: [] for name in self.collections}
+        self._last_seen: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def register(
+        self,
+        callback: Callable[[str, Optional[object]], None],
+        collections: Optional[Iterable[str]] = None,
+    ) -> None:
+        """Call ``callback(collection, document_id)`` on every change"""
+        with self._lock:
+            for name in collections or self.collections:
+                self._listeners.setdefault(name, []).append(callback)
+
+    def publish(self, collection: str, document_id=None) -> None:
+        """Fan a change out to the collection's listeners"""
+        with self._lock:
+            listeners = list(self._listeners.get(collection, ()))
+            self.events += 1
+
+        for callback in listeners:
+            try:
+                callback(collection, document_id)
+            except Exception as e:
+                logger.error(f"Cache invalidation for {collection} failed: {str(e)}")
+
+    def publish_all(self) -> None:
+        """Invalidate everything, after changes may have been missed"""
+        for collection in self.collections:
+            self.publish(collection)
+
+    def start(self) -> None:
+        """Start following changes made outside this worker"""
+        if self.source == "local":
+            self.mode = "local"
+            return
+
+        self._thread = threading.Thread(
+            target=self._run, name="cache-invalidation", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self):
+        if self.source in ("auto", "change_stream"):
+            self.mode = "change_stream"
+            if self._watch() or self.source == "change_stream":
+                return
+
+        self.mode = "poll"
+        self._ensure_poll_indexes()
+        while not self._stopped.wait(self.poll_interval):
+            try:
+                self.poll()
+            except PyMongoError as e:
+                logger.warning(f"Cache invalidation poll failed: {str(e)}")
+
+    def _watch(self) -> bool:
+        """Follow the change stream; return False if the server has none"""
+        from app.utils.db import get_db
+
+        pipeline = [{"$match": {"ns.coll": {"$in": list(self.collections)}}}]
+
+        while not self._stopped.is_set():
+            try:
+                with self.app.app_context():
+                    db = get_db()
+                with db.watch(
+                    pipeline, resume_after=self.resume_token, max_await_time_ms=1000
+                ) as stream:
+                    while not self._stopped.is_set() and stream.alive:
+                        change = stream.try_next()
+                        if change is not None:
+                            self.resume_token = stream.resume_token
+                            self.handle_change(change)
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAMS_UNSUPPORTED:
+                    logger.info("Change streams unavailable, polling updated_at")
+                    return False
+                self._stream_lost(e)
+            except PyMongoError as e:
+                self._stream_lost(e)
+
+        return True
+
+    def _stream_lost(self, error):
+        logger.warning(f"Cache invalidation stream interrupted: {str(error)}")
+        if self.resume_token is None:
+            # Without a position to resume from, changes may be missed
+            self.publish_all()
+        self._stopped.wait(1)
+
+    def handle_change(self, change: Dict) -> None:
+        """Publish one change stream event"""
+        collection = change.get("ns", {}).get("coll")
+        if change.get("operationType") in ("drop", "rename", "invalidate"):
+            self.resume_token = None
+            if collection is None:
+                self.publish_all()
+            else:
+                self.publish(collection)
+        elif collection is not None:
+            self.publish(collection, change.get("documentKey", {}).get("_id"))
+
+    def _ensure_poll_indexes(self):
+        from app.utils.db import create_index
+
+        with self.app.app_context():
+            for collection in self.collections:
+                try:
+                    create_index(collection, "updated_at")
+                except Exception as e:
+                    logger.warning(f"Could not index {collection}.updated_at: {e}")
+
+    def poll(self) -> None:
+        """Publish documents whose updated_at moved since the last poll
+
+        Each poll looks back ``poll_overlap`` further than the newest
+        timestamp seen, so writes from nodes with slightly lagging clocks are
+        not missed; repeated invalidations are harmless. Deletes are only
+        seen by the worker that made them.
+        """
+        from app.utils.db import get_db
+
+        # BSON dates have millisecond precision
+        now = datetime.utcnow()
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        with self.app.app_context():
+            db = get_db()
+            for collection in self.collections:
+                last_seen = self._last_seen.setdefault(collection, now)
+                cursor = (
+                    db[collection]
+                    .find(
+                        {"updated_at": {"$gt": last_seen - self.poll_overlap}},
+                        {"_id": 1, "updated_at": 1},
+                    )
+                    .sort("updated_at", 1)
+                )
+                for document in cursor:
+                    if document["updated_at"] > last_seen:
+                        self._last_seen[collection] = document["updated_at"]
+                    self.publish(collection, document["_id"])
+
+    def snapshot(self) -> Dict:
+        """Return current bus state"""
+        return {"mode": self.mode, "events": self.events}
+
+
+def get_invalidation_bus() -> InvalidationBus:
+    """Get this worker's invalidation bus, started on first use"""
+    bus = current_app.extensions.get("invalidation_bus")
+
+    # The watcher thread does not survive fork(), so each worker starts one
+    if bus is None or bus.pid != os.getpid():
+        config = current_app.config
+        source = config.get("INVALIDATION_SOURCE", "auto")
+
+        # Data of in-process backends is never shared with other workers
+        if config.get("STORAGE_BACKEND", "mongodb") != "mongodb":
+            source = "local"
+
+        bus = InvalidationBus(
+            current_app._get_current_object(),
+            source=source,
+            poll_interval=config.get("INVALIDATION_POLL_INTERVAL", 2),
+        )
+        current_app.extensions["invalidation_bus"] = bus
+        bus.start()
+
+    return bus
+
+
+def notify_change(collection: str, document_id=None) -> None:
+    """Announce a write made by this worker to its caches"""
+    if not has_app_context():
+        return
+
+    bus = current_app.extensions.get("invalidation_bus")
+    if bus is not None and bus.pid == os.getpid():
+        bus.publish(collection, document_id)
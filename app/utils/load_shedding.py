@@ -0,0 +1,126 @@
+import math
+import threading
+import time
+
+from flask import current_app, g
+
+from app.utils.exceptions import ServiceUnavailableError
+
+# Share of the concurrency limit each priority may use. Cheap, critical
+# routes keep headroom while expensive ones are shed first.
+PRIORITY_SHARES = {
+    "critical": None,  # always admitted (health checks)
+    "high": 1.0,
+    "normal": 0.8,
+    "low": 0.5,
+}
+
+
+class AdaptiveConcurrencyLimiter:
+    """Per-worker concurrency limit adjusted from observed latency
+
+    Implements a gradient limit: the long-term average latency is compared
+    with each new sample. When requests get slower than usual the limit
+    shrinks proportionally; when latency holds steady and the limit is
+    actually used, it grows by a queue allowance of sqrt(limit).
+    """
+
+    TOLERANCE = 1.5  # latency may grow by this factor before the limit drops
+    SMOOTHING = 0.2  # weight of each new estimate
+    BASELINE_DECAY = 0.02  # weight of each sample in the long-term average
+
+    def __init__(self, initial_limit=20, min_limit=4, max_limit=200):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self.shed = 0
+        self._baseline_ms = None
+        self._lock = threading.Lock()
+
+    def try_acquire(self, priority: str = "normal") -> bool:
+        """Admit a request if its priority still has room under the limit"""
+        share = PRIORITY_SHARES[priority]
+
+        with self._lock:
+            if share is not None and self.in_flight >= max(1, self.limit * share):
+                self.shed += 1
+                return False
+
+            self.in_flight += 1
+            return True
+
+    def release(self, latency_ms: float) -> None:
+        """Finish a request and update the limit from its latency"""
+        with self._lock:
+            in_flight = self.in_flight
+            self.in_flight = max(0, in_flight - 1)
+
+            if self._baseline_ms is None:
+                self._baseline_ms = latency_ms
+                return
+
+            self._baseline_ms += (latency_ms - self._baseline_ms) * self.BASELINE_DECAY
+
+            gradient = self.TOLERANCE * self._baseline_ms / max(latency_ms, 0.001)
+            gradient = max(0.5, min(1.0, gradient))
+
+            # Only grow when the current limit is actually being used
+            if gradient >= 1.0 and in_flight < self.limit / 2:
+                return
+
+            estimate = self.limit * gradient + math.sqrt(self.limit)
+            limit = self.limit * (1 - self.SMOOTHING) + estimate * self.SMOOTHING
+            self.limit = max(self.min_limit, min(self.max_limit, limit))
+
+    def snapshot(self):
+        """Return current limiter state"""
+        with self._lock:
+            return {
+                "limit": round(self.limit, 1),
+                "in_flight": self.in_flight,
+                "shed": self.shed,
+                "baseline_ms": round(self._baseline_ms or 0.0, 3),
+            }
+
+
+def priority(level):
+    """Decorator to set a route's load-shedding priority"""
+    if level not in PRIORITY_SHARES:
+        raise ValueError(f"Unknown priority: {level}")
+
+    def decorator(f):
+        f.priority = level
+        return f
+
+    return decorator
+
+
+def admit_request(view):
+    """Take a concurrency slot for the view or raise ServiceUnavailableError
+
+    Returns True when a slot was taken and must be released.
+    """
+    limiter = current_app.extensions.get("concurrency_limiter")
+    if limiter is None or view is None:
+        return False
+
+    if not limiter.try_acquire(getattr(view, "priority", "normal")):
+        raise ServiceUnavailableError(
+            "Concurrency limit reached",
+            retry_after=current_app.config.get("LOAD_SHEDDING_RETRY_AFTER", 1),
+        )
+
+    return True
+
+
+def release_slot() -> None:
+    """Give back the current request's concurrency slot, if it holds one
+
+    Streaming views call this once the stream is set up, so a long-lived
+    connection neither holds a slot nor feeds its duration into the limit.
+    """
+    admitted_at = g.pop("admitted_at", None)
+    if admitted_at is not None:
+        latency_ms = (time.perf_counter() - admitted_at) * 1000
+        current_app.extensions["concurrency_limiter"].release(latency_ms)
@@ -0,0 +1,961 @@
+"""
+Dict-backed in-memory storage engine
+
+Implements the subset of the PyMongo client, database, collection and cursor
+API used by app/utils/db.py and the test suite, with hash-based secondary
+indexes for equality and $in lookups. Selected with STORAGE_BACKEND=memory;
+it needs no server, so tests and benchmarks start instantly.
+"""
+import datetime
+import functools
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from bson.objectid import ObjectId
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from pymongo.results import (
+    DeleteResult,
+    InsertManyResult,
+    InsertOneResult,
+    UpdateResult,
+)
+
+_MISSING = object()
+
+# BSON comparison order between types
+_TYPE_RANKS = (
+    (type(None), 1),
+    ((int, float), 2),
+    (str, 3),
+    (dict, 4),
+    (list, 5),
+    (bytes, 6),
+    (ObjectId, 7),
+    (bool, 8),
+    (datetime.datetime, 9),
+)
+
+
+def _clone(value):
+    """Copy mutable containers; scalars are immutable and shared"""
+    if isinstance(value, dict):
+        return {key: _clone(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_clone(item) for item in value]
+    return value
+
+
+def _hashable(value):
+    """Index key for a value (lists and sub-documents compare by content)"""
+    if isinstance(value, list):
+        return ("__list__", tuple(_hashable(item) for item in value))
+    if isinstance(value, dict):
+        return ("__doc__", tuple((k, _hashable(v)) for k, v in value.items()))
+    if isinstance(value, bool):
+        return ("__bool__", value)
+    return value
+
+
+def _type_rank(value) -> int:
+    if isinstance(value, bool):
+        return 8
+    for types, rank in _TYPE_RANKS:
+        if isinstance(value, types):
+            return rank
+    return 10
+
+
+def _sort_key(value):
+    if value is _MISSING:
+        return (0, 0)
+    rank = _type_rank(value)
+    if rank in (4, 5):
+        return (rank, repr(value))
+    return (rank, value)
+
+
+def _lookup(value, parts: List[str]) -> List[Any]:
+    """Values at a dotted path, descending into arrays like MongoDB"""
+    if not parts:
+        return [value]
+
+    if isinstance(value, dict):
+        if parts[0] in value:
+            return _lookup(value[parts[0]], parts[1:])
+        return []
+
+    if isinstance(value, list):
+        if parts[0].isdigit():
+            index = int(parts[0])
+            return _lookup(value[index], parts[1:]) if index < len(value) else []
+
+        found = []
+        for item in value:
+            if isinstance(item, dict):
+                found.extend(_lookup(item, parts))
+        return found
+
+    return []
+
+
+def _field_values(document: Dict, path: str) -> List[Any]:
+    return _lookup(document, path.split("."))
+
+
+def _expand(values: List[Any]) -> List[Any]:
+    """Field values plus the elements of array values"""
+    expanded = []
+    for value in values:
+        expanded.append(value)
+        if isinstance(value, list):
+            expanded.extend(value)
+    return expanded
+
+
+def _equals(value, expected) -> bool:
+    if isinstance(expected, re.Pattern):
+        return isinstance(value, str) and expected.search(value) is not None
+    if isinstance(value, bool) != isinstance(expected, bool):
+        return False
+    return value == expected
+
+
+def _compare(value, expected, op) -> bool:
+    if _type_rank(value) != _type_rank(expected) or isinstance(value, (dict, list)):
+        return False
+    try:
+        return op(value, expected)
+    except TypeError:
+        return False
+
+
+def _regex(pattern, options: str = "") -> re.Pattern:
+    if isinstance(pattern, re.Pattern):
+        return pattern
+    return _compile_regex(pattern, options)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_regex(pattern: str, options: str) -> re.Pattern:
+    flags = 0
+    for option, flag in (("i", re.I), ("m", re.M), ("s", re.S), ("x", re.X)):
+        if option in options:
+            flags |= flag
+    return re.compile(pattern, flags)
+
+
+_COMPARISONS = {
+    "$gt": lambda a, b: a > b,
+    "$gte": lambda a, b: a >= b,
+    "$lt": lambda a, b: a < b,
+    "$lte": lambda a, b: a <= b,
+}
+
+
+def _equality_test(expected):
+    """Compile an equality condition into a test on a field's values"""
+    if isinstance(expected, re.Pattern):
+        return lambda values: any(_equals(v, expected) for v in _expand(values))
+    if expected is None:
+        return lambda values: not values or any(v is None for v in _expand(values))
+    return lambda values: any(_equals(v, expected) for v in _expand(values))
+
+
+def _compile_operators(conditions: Dict):
+    """Compile an operator document into a test on a field's values"""
+    tests = []
+
+    for op, expected in conditions.items():
+        if op == "$eq":
+            tests.append(_equality_test(expected))
+        elif op == "$ne":
+            equal = _equality_test(expected)
+            tests.append(lambda values, equal=equal: not equal(values))
+        elif op in _COMPARISONS:
+            compare = _COMPARISONS[op]
+            tests.append(
+                lambda values, expected=expected, compare=compare: any(
+                    _compare(v, expected, compare) for v in _expand(values)
+                )
+            )
+        elif op in ("$in", "$nin"):
+            equals = [_equality_test(item) for item in expected]
+            test = lambda values, equals=equals: any(eq(values) for eq in equals)
+            tests.append(test if op == "$in" else lambda values, t=test: not t(values))
+        elif op == "$exists":
+            tests.append(
+                lambda values, expected=expected: bool(values) == bool(expected)
+            )
+        elif op == "$regex":
+            tests.append(
+                _equality_test(_regex(expected, conditions.get("$options", "")))
+            )
+        elif op == "$options":
+            continue
+        elif op == "$not":
+            if isinstance(expected, dict):
+                inner = _compile_operators(expected)
+            else:
+                inner = _equality_test(_regex(expected))
+            tests.append(lambda values, inner=inner: not inner(values))
+        elif op == "$size":
+            tests.append(
+                lambda values, expected=expected: any(
+                    isinstance(v, list) and len(v) == expected for v in values
+                )
+            )
+        elif op == "$all":
+            equals = [_equality_test(item) for item in expected]
+            tests.append(lambda values, equals=equals: all(eq(values) for eq in equals))
+        elif op == "$elemMatch":
+            if any(key.startswith("$") for key in expected):
+                element = _compile_operators(expected)
+                element_test = lambda item, element=element: element([item])
+            else:
+                element_test = _compile_query(expected)
+            tests.append(
+                lambda values, element_test=element_test: any(
+                    isinstance(v, list) and any(element_test(item) for item in v)
+                    for v in values
+                )
+            )
+        else:
+            raise OperationFailure(f"Unsupported query operator: {op}")
+
+    if len(tests) == 1:
+        return tests[0]
+    return lambda values: all(test(values) for test in tests)
+
+
+def _is_operator_document(condition) -> bool:
+    return (
+        isinstance(condition, dict)
+        and bool(condition)
+        and all(key.startswith("$") for key in condition)
+    )
+
+
+def _compile_query(query: Optional[Dict]):
+    """Compile a MongoDB query into a predicate on documents
+
+    Paths are split and regexes compiled once per query rather than once per
+    scanned document.
+    """
+    if not query:
+        return lambda document: True
+
+    predicates = []
+    for key, condition in query.items():
+        if key in ("$and", "$or", "$nor"):
+            subqueries = [_compile_query(sub) for sub in condition]
+            if key == "$and":
+                predicate = lambda d, subs=subqueries: all(p(d) for p in subs)
+            elif key == "$or":
+                predicate = lambda d, subs=subqueries: any(p(d) for p in subs)
+            else:
+                predicate = lambda d, subs=subqueries: not any(p(d) for p in subs)
+        elif key.startswith("$"):
+            raise OperationFailure(f"Unsupported query operator: {key}")
+        else:
+            if _is_operator_document(condition):
+                test = _compile_operators(condition)
+            else:
+                test = _equality_test(condition)
+            predicate = lambda d, parts=key.split("."), test=test: test(
+                _lookup(d, parts)
+            )
+        predicates.append(predicate)
+
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda document: all(p(document) for p in predicates)
+
+
+def _matches(document: Dict, query: Optional[Dict]) -> bool:
+    """Check if a document matches a MongoDB query"""
+    return _compile_query(query)(document)
+
+
+def _set_path(document: Dict, path: str, value) -> None:
+    parts = path.split(".")
+    target = document
+    for part in parts[:-1]:
+        if isinstance(target, list):
+            target = target[int(part)]
+        else:
+            target = target.setdefault(part, {})
+
+    if isinstance(target, list):
+        target[int(parts[-1])] = value
+    else:
+        target[parts[-1]] = value
+
+
+def _get_path(document: Dict, path: str, default=_MISSING):
+    target = document
+    for part in path.split("."):
+        if isinstance(target, dict) and part in target:
+            target = target[part]
+        elif isinstance(target, list) and part.isdigit() and int(part) < len(target):
+            target = target[int(part)]
+        else:
+            return default
+    return target
+
+
+def _unset_path(document: Dict, path: str) -> None:
+    parts = path.split(".")
+    parent = _get_path(document, ".".join(parts[:-1])) if len(parts) > 1 else document
+    if isinstance(parent, dict):
+        parent.pop(parts[-1], None)
+
+
+def _each(value) -> List[Any]:
+    if isinstance(value, dict) and "$each" in value:
+        return list(value["$each"])
+    return [value]
+
+
+def _apply_update(document: Dict, update: Dict, is_insert: bool = False) -> None:
+    """Apply update operators to a document in place"""
+    for op, fields in update.items():
+        if op == "$setOnInsert" and not is_insert:
+            continue
+
+        for path, value in fields.items():
+            current = _get_path(document, path)
+
+            if op in ("$set", "$setOnInsert"):
+                _set_path(document, path, _clone(value))
+            elif op == "$unset":
+                _unset_path(document, path)
+            elif op == "$inc":
+                _set_path(
+                    document, path, (0 if current is _MISSING else current) + value
+                )
+            elif op in ("$push", "$addToSet"):
+                items = [] if current is _MISSING else current
+                if not isinstance(items, list):
+                    raise OperationFailure(f"Cannot apply {op} to non-array {path}")
+                for item in _each(value):
+                    if op == "$push" or item not in items:
+                        items.append(_clone(item))
+                _set_path(document, path, items)
+            elif op == "$pull":
+                if isinstance(current, list):
+                    _set_path(
+                        document,
+                        path,
+                        [
+                            item
+                            for item in current
+                            if not (
+                                _compile_operators(value)([item])
+                                if _is_operator_document(value)
+                                else _matches(item, value)
+                                if isinstance(value, dict) and isinstance(item, dict)
+                                else _equals(item, value)
+                            )
+                        ],
+                    )
+            else:
+                raise OperationFailure(f"Unsupported update operator: {op}")
+
+
+def _project(document: Dict, projection: Optional[Dict]) -> Dict:
+    """Apply an inclusion or exclusion projection to a copy of a document"""
+    if not projection:
+        return _clone(document)
+
+    if isinstance(projection, (list, tuple)):
+        projection = {field: 1 for field in projection}
+
+    include_id = bool(projection.get("_id", 1))
+    fields = {key: value for key, value in projection.items() if key != "_id"}
+
+    if fields and all(fields.values()):
+        result = {}
+        for path in fields:
+            value = _get_path(document, path)
+            if value is not _MISSING:
+                _set_path(result, path, _clone(value))
+        if include_id and "_id" in document:
+            result["_id"] = document["_id"]
+        return result
+
+    result = _clone(document)
+    for path in fields:
+        _unset_path(result, path)
+    if not include_id:
+        result.pop("_id", None)
+    return result
+
+
+def _normalize_sort(key_or_list, direction=None) -> List[Tuple[str, int]]:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction or 1)]
+    if isinstance(key_or_list, dict):
+        return list(key_or_list.items())
+    return [(key, value) for key, value in key_or_list]
+
+
+def _sort_documents(documents: List[Dict], sort: List[Tuple[str, int]]) -> List[Dict]:
+    # Stable sorts applied from the last key to the first
+    for field, direction in reversed(sort):
+        documents.sort(
+            key=lambda doc: _sort_key(_get_path(doc, field)), reverse=direction < 0
+        )
+    return documents
+
+
+class _Index:
+    """Hash index from field values to document IDs"""
+
+    def __init__(self, name, keys, unique=False, expire_after=None):
+        self.name = name
+        self.keys = keys
+        self.fields = [field for field, _ in keys]
+        self.unique = unique
+        self.expire_after = expire_after
+        self.entries: Dict[Any, set] = {}
+
+    def keys_for(self, document: Dict) -> List[Any]:
+        """Index keys of a document (one per array element for one field)"""
+        if len(self.fields) == 1:
+            values = _field_values(document, self.fields[0])
+            if not values:
+                return [None]
+            return list({_hashable(v) for v in _expand(values)})
+
+        return [
+            tuple(_hashable(_get_path(document, field, None)) for field in self.fields)
+        ]
+
+    def add(self, document: Dict) -> None:
+        for key in self.keys_for(document):
+            self.entries.setdefault(key, set()).add(document["_id"])
+
+    def remove(self, document: Dict) -> None:
+        for key in self.keys_for(document):
+            ids = self.entries.get(key)
+            if ids is not None:
+                ids.discard(document["_id"])
+                if not ids:
+                    del self.entries[key]
+
+    def check_unique(self, document: Dict) -> None:
+        if not self.unique:
+            return
+        for key in self.keys_for(document):
+            others = self.entries.get(key, set()) - {document["_id"]}
+            if others:
+                raise DuplicateKeyError(
+                    f"E11000 duplicate key error index: {self.name} dup key: {key!r}"
+                )
+
+
+class MemoryCursor:
+    """Lazy cursor over a query result"""
+
+    def __init__(self, collection, query, projection, sort=None, skip=0, limit=0):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort = _normalize_sort(sort) if sort else None
+        self._skip = skip
+        self._limit = limit
+        self._results: Optional[Iterator[Dict]] = None
+
+    def sort(self, key_or_list, direction=None):
+        self._sort = _normalize_sort(key_or_list, direction)
+        return self
+
+    def skip(self, skip: int):
+        self._skip = skip
+        return self
+
+    def limit(self, limit: int):
+        self._limit = limit
+        return self
+
+    def batch_size(self, batch_size: int):
+        return self
+
+    def max_time_ms(self, max_time_ms):
+        return self
+
+    def close(self) -> None:
+        self._results = iter(())
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Dict:
+        if self._results is None:
+            documents = self._collection._select(
+                self._query, self._sort, self._skip, self._limit
+            )
+            self._results = (_project(doc, self._projection) for doc in documents)
+        return next(self._results)
+
+
+class MemoryCollection:
+    """Documents of one collection, keyed by _id, with secondary indexes"""
+
+    TTL_SWEEP_INTERVAL = 1.0
+
+    def __init__(self, database, name: str):
+        self.database = database
+        self.name = name
+        self._documents: Dict[Any, Dict] = {}
+        self._indexes: Dict[str, _Index] = {}
+        self._order: Dict[Any, int] = {}
+        self._inserted = 0
+        self._lock = threading.RLock()
+        self._last_sweep = 0.0
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.database.name}.{self.name}"
+
+    def with_options(self, **kwargs):
+        # Read preferences and concerns are meaningless for a single node
+        return self
+
+    # Query planning
+
+    def _candidates(self, query: Optional[Dict]) -> List[Dict]:
+        """Narrow the documents to scan using the _id or a secondary index"""
+        if not query:
+            return list(self._documents.values())
+
+        for field, condition in query.items():
+            if field.startswith("$"):
+                continue
+
+            if _is_operator_document(condition):
+                if set(condition) == {"$eq"}:
+                    keys = [condition["$eq"]]
+                elif set(condition) == {"$in"}:
+                    keys = list(condition["$in"])
+                else:
+                    continue
+            elif isinstance(condition, (dict, re.Pattern)):
+                continue
+            else:
+                keys = [condition]
+
+            if any(isinstance(key, (re.Pattern, list)) for key in keys):
+                continue
+
+            if field == "_id":
+                return [
+                    self._documents[key]
+                    for key in dict.fromkeys(keys)
+                    if key in self._documents
+                ]
+
+            index = self._single_field_index(field)
+            if index is not None:
+                ids = set()
+                for key in keys:
+                    ids |= index.entries.get(_hashable(key), set())
+                # Keep natural (insertion) order, as a collection scan would
+                return [
+                    self._documents[doc_id]
+                    for doc_id in sorted(ids, key=self._order.__getitem__)
+                ]
+
+        return list(self._documents.values())
+
+    def _single_field_index(self, field: str) -> Optional[_Index]:
+        for index in self._indexes.values():
+            if index.fields == [field]:
+                return index
+        return None
+
+    def _select(self, query, sort=None, skip=0, limit=0) -> List[Dict]:
+        with self._lock:
+            self._sweep_expired()
+            matches = _compile_query(query)
+            documents = [doc for doc in self._candidates(query) if matches(doc)]
+
+        if sort:
+            documents = _sort_documents(documents, sort)
+
+        if skip:
+            documents = documents[skip:]
+        if limit:
+            documents = documents[: abs(limit)]
+        return documents
+
+    def _sweep_expired(self) -> None:
+        """Remove documents past a TTL index expiry, at most once a second"""
+        ttl_indexes = [i for i in self._indexes.values() if i.expire_after is not None]
+        now = time.monotonic()
+        if not ttl_indexes or now - self._last_sweep < self.TTL_SWEEP_INTERVAL:
+            return
+
+        self._last_sweep = now
+        utcnow = datetime.datetime.utcnow()
+        for index in ttl_indexes:
+            cutoff = utcnow - datetime.timedelta(seconds=index.expire_after)
+            for document in list(self._documents.values()):
+                value = document.get(index.fields[0])
+                if isinstance(value, datetime.datetime) and value <= cutoff:
+                    self._remove(document)
+
+    # Writes
+
+    def _add(self, document: Dict) -> None:
+        if document["_id"] in self._documents:
+            raise DuplicateKeyError(
+                f"E11000 duplicate key error collection: {self.full_name} "
+                f"index: _id_ dup key: {document['_id']!r}"
+            )
+        for index in self._indexes.values():
+            index.check_unique(document)
+
+        self._documents[document["_id"]] = document
+        self._order[document["_id"]] = self._inserted
+        self._inserted += 1
+        for index in self._indexes.values():
+            index.add(document)
+
+    def _remove(self, document: Dict) -> None:
+        del self._documents[document["_id"]]
+        del self._order[document["_id"]]
+        for index in self._indexes.values():
+            index.remove(document)
+
+    def _replace(self, old: Dict, new: Dict) -> None:
+        for index in self._indexes.values():
+            index.remove(old)
+        try:
+            for index in self._indexes.values():
+                index.check_unique(new)
+        except DuplicateKeyError:
+            for index in self._indexes.values():
+                index.add(old)
+            raise
+
+        self._documents[new["_id"]] = new
+        for index in self._indexes.values():
+            index.add(new)
+
+    def insert_one(self, document: Dict, **kwargs) -> InsertOneResult:
+        document.setdefault("_id", ObjectId())
+        with self._lock:
+            self._add(_clone(document))
+        return InsertOneResult(document["_id"], True)
+
+    def insert_many(self, documents: List[Dict], **kwargs) -> InsertManyResult:
+        inserted_ids = []
+        with self._lock:
+            for document in documents:
+                document.setdefault("_id", ObjectId())
+                self._add(_clone(document))
+                inserted_ids.append(document["_id"])
+        return InsertManyResult(inserted_ids, True)
+
+    def _update(self, query, update, many, upsert) -> UpdateResult:
+        if not update or not all(key.startswith("$") for key in update):
+            raise ValueError("update only works with $ operators")
+
+        with self._lock:
+            matched = self._select(query, limit=0 if many else 1)
+            modified = 0
+
+            for document in matched:
+                updated = _clone(document)
+                _apply_update(updated, update)
+                if updated.get("_id") != document["_id"]:
+                    raise OperationFailure("Performing an update on _id is not allowed")
+                if updated != document:
+                    self._replace(document, updated)
+                    modified += 1
+
+            if matched or not upsert:
+                return UpdateResult({"n": len(matched), "nModified": modified}, True)
+
+            document = {
+                key: _clone(value)
+                for key, value in (query or {}).items()
+                if not key.startswith("$") and not _is_operator_document(value)
+            }
+            _apply_update(document, update, is_insert=True)
+            document.setdefault("_id", ObjectId())
+            self._add(document)
+            return UpdateResult(
+                {"n": 1, "nModified": 0, "upserted": document["_id"]}, True
+            )
+
+    def update_one(self, filter, update, upsert=False, **kwargs) -> UpdateResult:
+        return self._update(filter, update, many=False, upsert=upsert)
+
+    def update_many(self, filter, update, upsert=False, **kwargs) -> UpdateResult:
+        return self._update(filter, update, many=True, upsert=upsert)
+
+    def replace_one(self, filter, replacement, upsert=False, **kwargs) -> UpdateResult:
+        with self._lock:
+            matched = self._select(filter, limit=1)
+            if matched:
+                document = _clone(replacement)
+                document["_id"] = matched[0]["_id"]
+                self._replace(matched[0], document)
+                return UpdateResult({"n": 1, "nModified": 1}, True)
+
+            if not upsert:
+                return UpdateResult({"n": 0, "nModified": 0}, True)
+
+            document = _clone(replacement)
+            document.setdefault("_id", ObjectId())
+            self._add(document)
+            return UpdateResult(
+                {"n": 1, "nModified": 0, "upserted": document["_id"]}, True
+            )
+
+    def delete_one(self, filter, **kwargs) -> DeleteResult:
+        with self._lock:
+            matched = self._select(filter, limit=1)
+            for document in matched:
+                self._remove(document)
+        return DeleteResult({"n": len(matched)}, True)
+
+    def delete_many(self, filter, **kwargs) -> DeleteResult:
+        with self._lock:
+            matched = self._select(filter)
+            for document in matched:
+                self._remove(document)
+        return DeleteResult({"n": len(matched)}, True)
+
+    # Reads
+
+    def find(self, filter=None, projection=None, skip=0, limit=0, sort=None, **kwargs):
+        if filter is not None and not isinstance(filter, dict):
+            filter = {"_id": filter}
+        return MemoryCursor(self, filter, projection, sort, skip, limit)
+
+    def find_one(self, filter=None, projection=None, *args, **kwargs):
+        for document in self.find(filter, projection, *args, **kwargs).limit(1):
+            return document
+        return None
+
+    def count_documents(self, filter, skip=0, limit=0, **kwargs) -> int:
+        return len(self._select(filter, skip=skip, limit=limit))
+
+    def estimated_document_count(self, **kwargs) -> int:
+        return len(self._documents)
+
+    def distinct(self, key, filter=None, **kwargs) -> List[Any]:
+        seen = {}
+        for document in self._select(filter):
+            for value in _expand(_field_values(document, key)):
+                if not isinstance(value, list):
+                    seen.setdefault(_hashable(value), value)
+        return list(seen.values())
+
+    def aggregate(self, pipeline: List[Dict], **kwargs) -> Iterator[Dict]:
+        documents = [_clone(doc) for doc in self._select(None)]
+        for stage in pipeline:
+            documents = _run_stage(documents, stage)
+        return iter(documents)
+
+    # Indexes
+
+    def create_index(self, keys, unique=False, expireAfterSeconds=None, **kwargs):
+        keys = _normalize_sort(keys, 1)
+        name = kwargs.get("name") or "_".join(f"{f}_{d}" for f, d in keys)
+
+        with self._lock:
+            if name in self._indexes:
+                return name
+
+            index = _Index(name, keys, unique=unique, expire_after=expireAfterSeconds)
+            for document in self._documents.values():
+                index.check_unique(document)
+                index.add(document)
+            self._indexes[name] = index
+
+        return name
+
+    def index_information(self) -> Dict[str, Dict]:
+        information = {"_id_": {"key": [("_id", 1)]}}
+        for name, index in self._indexes.items():
+            information[name] = {"key": index.keys, "unique": index.unique}
+            if index.expire_after is not None:
+                information[name]["expireAfterSeconds"] = index.expire_after
+        return information
+
+    def drop_index(self, name: str) -> None:
+        with self._lock:
+            self._indexes.pop(name, None)
+
+    def drop(self, **kwargs) -> None:
+        with self._lock:
+            self._documents.clear()
+            self._order.clear()
+            self._indexes.clear()
+
+
+def _group_key(document: Dict, expression):
+    if isinstance(expression, str) and expression.startswith("$"):
+        return _get_path(document, expression[1:], None)
+    if isinstance(expression, dict):
+        return {key: _group_key(document, value) for key, value in expression.items()}
+    return expression
+
+
+def _run_group(documents: List[Dict], spec: Dict) -> List[Dict]:
+    groups: Dict[Any, Dict] = {}
+
+    for document in documents:
+        key = _group_key(document, spec["_id"])
+        group = groups.setdefault(_hashable(key), {"_id": key})
+
+        for field, accumulator in spec.items():
+            if field == "_id":
+                continue
+            ((op, expression),) = accumulator.items()
+            value = _group_key(document, expression)
+
+            if op == "$sum":
+                group[field] = group.get(field, 0) + (value or 0)
+            elif op == "$avg":
+                total, count = group.get(f"__{field}", (0, 0))
+                group[f"__{field}"] = (total + (value or 0), count + 1)
+            elif op == "$min":
+                group[field] = value if field not in group else min(group[field], value)
+            elif op == "$max":
+                group[field] = value if field not in group else max(group[field], value)
+            elif op == "$push":
+                group.setdefault(field, []).append(value)
+            elif op == "$addToSet":
+                items = group.setdefault(field, [])
+                if value not in items:
+                    items.append(value)
+            elif op == "$first":
+                group.setdefault(field, value)
+            elif op == "$last":
+                group[field] = value
+            else:
+                raise OperationFailure(f"Unsupported accumulator: {op}")
+
+    results = []
+    for group in groups.values():
+        for field in [f for f in group if f.startswith("__")]:
+            total, count = group.pop(field)
+            group[field[2:]] = total / count if count else None
+        results.append(group)
+    return results
+
+
+def _run_stage(documents: List[Dict], stage: Dict) -> List[Dict]:
+    """Run one aggregation pipeline stage"""
+    ((name, spec),) = stage.items()
+
+    if name == "$match":
+        matches = _compile_query(spec)
+        return [doc for doc in documents if matches(doc)]
+    if name == "$sort":
+        return _sort_documents(documents, _normalize_sort(spec))
+    if name == "$skip":
+        return documents[spec:]
+    if name == "$limit":
+        return documents[:spec]
+    if name == "$project":
+        return [_project(doc, spec) for doc in documents]
+    if name == "$count":
+        return [{spec: len(documents)}] if documents else []
+    if name == "$group":
+        return _run_group(documents, spec)
+    if name == "$unwind":
+        path = spec if isinstance(spec, str) else spec["path"]
+        field = path.lstrip("$")
+        unwound = []
+        for document in documents:
+            for item in _get_path(document, field, []) or []:
+                copy = _clone(document)
+                _set_path(copy, field, item)
+                unwound.append(copy)
+        return unwound
+
+    raise OperationFailure(f"Unsupported aggregation stage: {name}")
+
+
+class MemoryDatabase:
+    """Named set of collections"""
+
+    def __init__(self, client, name: str):
+        self.client = client
+        self.name = name
+        self._collections: Dict[str, MemoryCollection] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        collection = self._collections.get(name)
+        if collection is None:
+            with self._lock:
+                collection = self._collections.setdefault(
+                    name, MemoryCollection(self, name)
+                )
+        return collection
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def get_collection(self, name: str, **kwargs) -> MemoryCollection:
+        return self[name]
+
+    def list_collection_names(self, **kwargs) -> List[str]:
+        return list(self._collections)
+
+    def drop_collection(self, name: str, **kwargs) -> None:
+        with self._lock:
+            self._collections.pop(getattr(name, "name", name), None)
+
+    def command(self, command, *args, **kwargs) -> Dict:
+        name = command if isinstance(command, str) else next(iter(command))
+        if name == "ping":
+            return {"ok": 1.0}
+        raise OperationFailure(f"Unsupported command: {name}")
+
+
+class MemoryClient:
+    """In-process stand-in for MongoClient"""
+
+    def __init__(self, *args, **kwargs):
+        self._databases: Dict[str, MemoryDatabase] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        database = self._databases.get(name)
+        if database is None:
+            with self._lock:
+                database = self._databases.setdefault(name, MemoryDatabase(self, name))
+        return database
+
+    def __getattr__(self, name: str) -> MemoryDatabase:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def get_database(self, name: str, **kwargs) -> MemoryDatabase:
+        return self[name]
+
+    def list_database_names(self) -> List[str]:
+        return list(self._databases)
+
+    def drop_database(self, name: str) -> None:
+        with self._lock:
+            self._databases.pop(getattr(name, "name", name), None)
+
+    def start_session(self, **kwargs):
+        raise NotImplementedError("The memory engine does not support sessions")
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from pymongo import monitoring
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Track MongoDB connection pool checkout wait times and usage
+
+    Registered as an event listener on the MongoClient. Wait times are
+    measured per thread between checkout start and checkout completion.
+    """
+
+    def __init__(self, max_pool_size: int, window: int = 1000):
+        self.max_pool_size = max_pool_size
+        self._waits = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checkout_timeouts = 0
+        self.in_use = 0
+        self.max_wait_ms = 0.0
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        wait_ms = self._elapsed_ms()
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            if wait_ms is not None:
+                self._waits.append(wait_ms)
+                self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def connection_check_out_failed(self, event):
+        self._elapsed_ms()
+        with self._lock:
+            self.checkout_failures += 1
+            if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+                self.checkout_timeouts += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def _elapsed_ms(self) -> Optional[float]:
+        """Pop this thread's checkout start time and return the wait in ms"""
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        if started is None:
+            return None
+        return (time.perf_counter() - started) * 1000
+
+    def utilization(self) -> float:
+        """Fraction of the pool currently checked out"""
+        if not self.max_pool_size:
+            return 0.0
+        return min(1.0, self.in_use / self.max_pool_size)
+
+    def snapshot(self) -> Dict:
+        """Return current pool statistics"""
+        with self._lock:
+            waits = sorted(self._waits)
+            checkouts = self.checkouts
+            failures = self.checkout_failures
+            timeouts = self.checkout_timeouts
+            in_use = self.in_use
+            max_wait = self.max_wait_ms
+
+        def percentile(fraction):
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(len(waits) * fraction))], 3)
+
+        return {
+            "max_pool_size": self.max_pool_size,
+            "in_use": in_use,
+            "utilization": round(self.utilization(), 3),
+            "checkouts": checkouts,
+            "checkout_failures": failures,
+            "checkout_timeouts": timeouts,
+            "wait_ms": {
+                "avg": round(sum(waits) / len(waits), 3) if waits else 0.0,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": round(max_wait, 3),
+            },
+        }
@@ -0,0 +1,274 @@
+import hashlib
+import logging
+import math
+import multiprocessing
+import re
+import time
+from typing import NamedTuple, Tuple
+
+from flask import current_app, request
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+_LIMIT_PATTERN = re.compile(r"^\s*(\d+)\s*(?:/|per)\s*(second|minute|hour|day)s?\s*$")
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of taking one token from a bucket"""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int
+
+
+def parse_limit(limit: str) -> Tuple[int, float]:
+    """Parse "100/minute" into (bucket capacity, refill rate per second)"""
+    match = _LIMIT_PATTERN.match(limit or "")
+    if not match:
+        raise ValueError(f"Invalid rate limit: {limit!r}")
+
+    capacity = int(match.group(1))
+    if capacity <= 0:
+        raise ValueError(f"Rate limit must be positive: {limit!r}")
+
+    return capacity, capacity / PERIODS[match.group(2)]
+
+
+def _take(tokens, updated_at, capacity, rate, now):
+    """Refill a bucket and take one token; returns (allowed, tokens left)"""
+    tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+    if tokens >= 1:
+        return True, tokens - 1
+    return False, tokens
+
+
+def _result(allowed, tokens, capacity, rate):
+    retry_after = 0 if allowed else max(1, math.ceil((1 - tokens) / rate))
+    return RateLimitResult(allowed, capacity, int(tokens), retry_after)
+
+
+class SharedMemoryBackend:
+    """Token buckets in anonymous shared memory
+
+    The slot table is allocated when the app is created, so gunicorn workers
+    forked from a preloaded master all share it. Keys are placed by linear
+    probing from a blake2b hash, so colliding keys get separate buckets. A
+    bucket is only reused once it has refilled completely; when no slot is
+    free near the key, the request is refused rather than given a full
+    bucket.
+    """
+
+    FIELDS = 4  # key fingerprint, tokens, last refill time, time it is full
+    PROBES = 32
+
+    def __init__(self, slots: int = 65536):
+        self.slots = slots
+        self._table = multiprocessing.RawArray("d", slots * self.FIELDS)
+        self._lock = multiprocessing.Lock()
+
+    def _locate(self, key: str) -> Tuple[int, float]:
+        """Return the key's first slot and its non-zero fingerprint"""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        start = int.from_bytes(digest[:8], "big") % self.slots
+        # 52 bits, so the fingerprint is exact as a double; 0 marks a free slot
+        fingerprint = float((int.from_bytes(digest[8:], "big") >> 12) + 1)
+        return start, fingerprint
+
+    def _find_slot(self, start: int, fingerprint: float, now: float):
+        """Return (offset, existing) for the key's bucket, or (None, False)"""
+        table = self._table
+        reusable = None
+
+        for probe in range(min(self.PROBES, self.slots)):
+            offset = ((start + probe) % self.slots) * self.FIELDS
+            if table[offset] == fingerprint:
+                return offset, True
+            if table[offset] == 0:
+                # Slots are never freed, so the key cannot be further along
+                return (offset if reusable is None else reusable), False
+            if reusable is None and table[offset + 3] <= now:
+                reusable = offset
+
+        return reusable, False
+
+    def hit(self, key: str, capacity: int, rate: float) -> RateLimitResult:
+        """Take one token from the key's bucket"""
+        start, fingerprint = self._locate(key)
+        now = time.time()
+
+        with self._lock:
+            table = self._table
+            offset, existing = self._find_slot(start, fingerprint, now)
+            if offset is None:
+                logger.warning("Rate limit table is full - refusing request")
+                return RateLimitResult(False, capacity, 0, 1)
+
+            if existing:
+                tokens, updated_at = table[offset + 1], table[offset + 2]
+            else:
+                table[offset] = fingerprint
+                tokens, updated_at = float(capacity), now
+
+            allowed, tokens = _take(tokens, updated_at, capacity, rate, now)
+            table[offset + 1] = tokens
+            table[offset + 2] = now
+            table[offset + 3] = now + (capacity - tokens) / rate
+
+        return _result(allowed, tokens, capacity, rate)
+
+
+class RedisBackend:
+    """Token buckets in Redis, shared by every worker on every host
+
+    Falls back to a local shared-memory backend when the redis package is
+    missing or the server cannot be reached, so a Redis outage degrades to
+    per-host limits instead of failing requests.
+    """
+
+    # Uses the server clock so hosts with skewed clocks share buckets safely
+    SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "ts", tostring(now))
+redis.call("EXPIRE", KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+    def __init__(self, url: str, fallback: SharedMemoryBackend, prefix="ratelimit:"):
+        self.fallback = fallback
+        self.prefix = prefix
+        self._script = None
+
+        try:
+            import redis
+        except ImportError:
+            logger.warning("redis is not installed - using local rate limit buckets")
+            return
+
+        self._errors = redis.RedisError
+        client = redis.Redis.from_url(url, socket_timeout=0.1)
+        self._script = client.register_script(self.SCRIPT)
+
+    def hit(self, key: str, capacity: int, rate: float) -> RateLimitResult:
+        """Take one token from the key's bucket"""
+        if self._script is None:
+            return self.fallback.hit(key, capacity, rate)
+
+        try:
+            allowed, tokens = self._script(
+                keys=[self.prefix + key], args=[capacity, rate]
+            )
+        except self._errors as e:
+            logger.warning(f"Redis rate limit unavailable, using local buckets: {e}")
+            return self.fallback.hit(key, capacity, rate)
+
+        return _result(bool(allowed), float(tokens), capacity, rate)
+
+
+class RateLimiter:
+    """Apply token-bucket limits per route and per client"""
+
+    def __init__(self, backend, default_limit: str):
+        self.backend = backend
+        self.default_limit = default_limit
+        self._parsed = {}
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the limiter and its storage backend from app config"""
+        local = SharedMemoryBackend(config.get("RATE_LIMIT_SLOTS", 65536))
+        storage = config.get("RATE_LIMIT_STORAGE", "memory")
+
+        if storage == "redis":
+            backend = RedisBackend(config.get("RATE_LIMIT_REDIS_URL"), local)
+        elif storage == "memory":
+            backend = local
+        else:
+            raise ValueError(f"Unknown rate limit storage: {storage}")
+
+        return cls(backend, config.get("RATE_LIMIT_DEFAULT", "100/minute"))
+
+    def _parse(self, limit):
+        parsed = self._parsed.get(limit)
+        if parsed is None:
+            parsed = self._parsed[limit] = parse_limit(limit)
+        return parsed
+
+    def hit(self, route: str, client: str, limit: str = None) -> RateLimitResult:
+        """Count one request from client on route against its limit"""
+        capacity, rate = self._parse(limit or self.default_limit)
+        return self.backend.hit(f"{route}:{client}", capacity, rate)
+
+
+def rate_limit(limit=None, config_key=None):
+    """Decorator to set a route's rate limit, as "N/period" or a config key"""
+
+    def decorator(f):
+        f.rate_limit = limit
+        f.rate_limit_config_key = config_key
+        return f
+
+    return decorator
+
+
+def rate_limit_exempt(f):
+    """Decorator to exclude a route from rate limiting"""
+    f.rate_limit_exempt = True
+    return f
+
+
+def get_rate_limiter():
+    """Get the app's rate limiter, created on first use"""
+    limiter = current_app.extensions.get("rate_limiter")
+
+    if limiter is None:
+        limiter = RateLimiter.from_config(current_app.config)
+        current_app.extensions["rate_limiter"] = limiter
+
+    return limiter
+
+
+def get_client_key():
+    """Identify the caller: user ID for valid access tokens, else remote IP"""
+    from app.utils.decorators import get_verified_claims
+
+    if request.headers.get("Authorization", "").startswith("Bearer "):
+        try:
+            claims = get_verified_claims()
+            identity_claim = current_app.config.get("JWT_IDENTITY_CLAIM", "sub")
+            return f"user:{claims[identity_claim]}"
+        except Exception:
+            # Invalid tokens are rejected by the route itself
+            pass
+
+    return f"ip:{request.remote_addr}"
+
+
+def check_rate_limit(view):
+    """Count the current request against its route limit
+
+    Returns None for exempt routes, otherwise the RateLimitResult.
+    """
+    if view is None or getattr(view, "rate_limit_exempt", False):
+        return None
+
+    config_key = getattr(view, "rate_limit_config_key", None)
+    limit = getattr(view, "rate_limit", None)
+    if config_key:
+        limit = current_app.config.get(config_key)
+
+    return get_rate_limiter().hit(request.endpoint, get_client_key(), limit)
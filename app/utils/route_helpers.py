@@ -1,8 +1,77 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, g
+
 from app.models.company import Company
 from app.models.job import Job
 from app.models.user import User
 from app.utils.security import sanitize_user_data
 
+# Worker-wide pool for hydration lookups, recreated after a fork
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """Get the hydration thread pool, or None when it is disabled"""
+    global _executor, _executor_pid
+
+    max_workers = current_app.config.get("HYDRATION_MAX_WORKERS", 0)
+    if max_workers <= 0:
+        return None
+
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="hydration"
+            )
+            _executor_pid = os.getpid()
+
+    return _executor
+
+
+def _with_app_context(fn):
+    """Bind fn to the caller's app and request globals for use in a pool thread"""
+    app = current_app._get_current_object()
+    # Sessions are not thread-safe; pool threads start their own
+    g_values = {key: g.get(key) for key in g if key != "db_session"}
+
+    def wrapper(*args, **kwargs):
+        with app.app_context():
+            for key, value in g_values.items():
+                setattr(g, key, value)
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def _fetch_documents(lookups):
+    """Fetch (model, id) pairs by ID, concurrently when the pool is enabled
+
+    Returns a dict keyed by (collection, str(id)). Duplicate IDs are fetched
+    once. Lookup errors are re-raised in request order, as a sequential loop
+    would.
+    """
+    unique_lookups = {}
+    for model, item_id in lookups:
+        unique_lookups.setdefault((model.COLLECTION, str(item_id)), (model, item_id))
+
+    executor = _get_executor()
+    if executor is None or len(unique_lookups) <= 1:
+        return {
+            key: model.find_by_id(item_id)
+            for key, (model, item_id) in unique_lookups.items()
+        }
+
+    futures = {
+        key: executor.submit(_with_app_context(model.find_by_id), item_id)
+        for key, (model, item_id) in unique_lookups.items()
+    }
+    return {key: future.result() for key, future in futures.items()}
+
 
 def populate_job_data(job):
     """Add company data to job object"""
@@ -16,25 +85,79 @@ def populate_job_data(job):
     return job
 
 
+def populate_jobs_data(jobs, companies=None):
+    """Add company data to a page of jobs, fetching companies concurrently
+
+    Pass ``companies`` when the caller already loaded them to skip the fetch.
+    """
+    if companies is None:
+        companies = _fetch_documents(
+            (Company, job["company_id"]) for job in jobs if job and "company_id" in job
+        )
+    else:
+        companies = {
+            (Company.COLLECTION, str(company["_id"])): company for company in companies
+        }
+
+    for job in jobs:
+        if not job or "company_id" not in job:
+            continue
+
+        company = companies.get((Company.COLLECTION, str(job["company_id"])))
+        if company:
+            job["company"] = sanitize_user_data(company)
+
+    return jobs
+
+
 def populate_application_data(application):
     """Add job and user data to application object"""
     if not application:
         return application
 
-    # Add job data
-    if "job_id" in application:
-        job = Job.find_by_id(application["job_id"])
-        if job:
-            job = populate_job_data(job)  # Also add company to job
-            application["job"] = job
+    return populate_applications_data([application])[0]
+
+
+def populate_applications_data(applications):
+    """Add job and user data to a page of applications
+
+    Jobs and users for the whole page are fetched concurrently, then the
+    companies of those jobs.
+    """
+    lookups = []
+    for application in applications:
+        if not application:
+            continue
+        if "job_id" in application:
+            lookups.append((Job, application["job_id"]))
+        if "user_id" in application:
+            lookups.append((User, application["user_id"]))
+
+    documents = _fetch_documents(lookups)
+
+    # Each application gets its own copy of a job shared across the page
+    jobs = {
+        key: dict(document)
+        for key, document in documents.items()
+        if key[0] == Job.COLLECTION and document
+    }
+    populate_jobs_data(list(jobs.values()))
+
+    for application in applications:
+        if not application:
+            continue
+
+        if "job_id" in application:
+            job = jobs.get((Job.COLLECTION, str(application["job_id"])))
+            if job:
+                application["job"] = dict(job)
 
-    # Add user data
-    if "user_id" in application:
-        user = User.find_by_id(application["user_id"])
-        if user:
-            application["user"] = sanitize_user_data(user)
+        if "user_id" in application:
+            user = documents.get((User.COLLECTION, str(application["user_id"])))
+            if user:
+                application["user"] = sanitize_user_data(user)
 
-    return application
+    return applications
 
 
 def check_resource_ownership(resource, user_id, owner_field="user_id"):
@@ -1,13 +1,37 @@
+import functools
 import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from datetime import timedelta
 from typing import Dict, Optional, Union
 
-from flask import current_app
+from flask import current_app, has_app_context
 from flask_jwt_extended import create_access_token, create_refresh_token
-from passlib.hash import pbkdf2_sha256
+from passlib.context import CryptContext
+from passlib.registry import get_crypt_handler
+
+from app.utils.exceptions import ServiceUnavailableError
 
 logger = logging.getLogger(__name__)
 
+# Worker-wide process pool for password hashing, recreated after a fork
+_hash_pool = None
+_hash_pool_pid = None
+_hash_slots = None
+_hash_pool_lock = threading.Lock()
+
+# Background thread for upgrading outdated hashes after login
+_rehash_executor = None
+_rehash_executor_pid = None
+
+DEFAULT_HASH_SCHEME = "pbkdf2_sha256"
+
 
 class SecurityError(Exception):
     """Custom exception for security operations"""
@@ -15,16 +39,142 @@ class SecurityError(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=8)
+def _get_crypt_context(scheme: str, rounds: Optional[int]) -> CryptContext:
+    """Build the passlib context for a scheme and cost
+
+    pbkdf2_sha256 stays verifiable (and deprecated) when another scheme is
+    configured, so existing hashes keep working and get upgraded on login.
+    """
+    schemes = [scheme]
+    if scheme != DEFAULT_HASH_SCHEME:
+        schemes.append(DEFAULT_HASH_SCHEME)
+
+    settings = {}
+    if rounds:
+        for option in ("default_rounds", "min_rounds", "max_rounds"):
+            settings[f"{scheme}__{option}"] = rounds
+
+    return CryptContext(schemes=schemes, deprecated=schemes[1:], **settings)
+
+
+def _hash_settings():
+    """Get the configured (scheme, rounds) pair"""
+    if not has_app_context():
+        return DEFAULT_HASH_SCHEME, None
+
+    return (
+        current_app.config.get("PASSWORD_HASH_SCHEME", DEFAULT_HASH_SCHEME),
+        current_app.config.get("PASSWORD_HASH_ROUNDS"),
+    )
+
+
+def _hash_in_worker(password: str, scheme: str, rounds: Optional[int]) -> str:
+    """Hash a password (runs in a hashing pool process)"""
+    return _get_crypt_context(scheme, rounds).hash(password)
+
+
+def _verify_in_worker(
+    password: str, hashed_password: str, scheme: str, rounds: Optional[int]
+) -> bool:
+    """Verify a password (runs in a hashing pool process)"""
+    return _get_crypt_context(scheme, rounds).verify(password, hashed_password)
+
+
+def _get_hash_pool():
+    """Get the hashing process pool and its slot semaphore, or (None, None)"""
+    global _hash_pool, _hash_pool_pid, _hash_slots
+
+    if not has_app_context():
+        return None, None
+
+    pool_size = current_app.config.get("PASSWORD_HASH_POOL_SIZE", 0)
+    if pool_size <= 0:
+        return None, None
+
+    with _hash_pool_lock:
+        if _hash_pool is None or _hash_pool_pid != os.getpid():
+            # Spawned workers are safe to start from a multi-threaded process
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=pool_size,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _hash_pool_pid = os.getpid()
+            _hash_slots = threading.BoundedSemaphore(
+                pool_size + current_app.config.get("PASSWORD_HASH_QUEUE_LIMIT", 0)
+            )
+
+    return _hash_pool, _hash_slots
+
+
+def _reset_hash_pool():
+    """Drop a broken hashing pool so the next call starts a fresh one"""
+    global _hash_pool
+
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=False)
+        _hash_pool = None
+
+
+def _broken_hash_pool(error: BrokenProcessPool) -> ServiceUnavailableError:
+    """Drop a pool whose worker died and report it as a retryable failure"""
+    _reset_hash_pool()
+    logger.error(f"Password hashing pool broke: {str(error)}")
+    return ServiceUnavailableError("Password hashing pool restarting")
+
+
+def _run_hash_job(fn, *args):
+    """Run a hashing function in the process pool, or inline when disabled
+
+    Fails fast with ServiceUnavailableError when every pool slot is taken,
+    so a burst of logins cannot queue up behind the CPU-bound hash. A crashed
+    pool worker also raises ServiceUnavailableError: the client should retry,
+    not be told its password is wrong.
+    """
+    pool, slots = _get_hash_pool()
+    if pool is None:
+        return fn(*args)
+
+    if not slots.acquire(blocking=False):
+        logger.warning("Password hashing pool saturated, rejecting request")
+        raise ServiceUnavailableError("Password hashing capacity exhausted")
+
+    try:
+        future = pool.submit(fn, *args)
+    except BrokenProcessPool as e:
+        slots.release()
+        raise _broken_hash_pool(e) from e
+    except BaseException:
+        slots.release()
+        raise
+
+    # The slot is held until the job leaves the pool, not until we stop
+    # waiting, so timed out jobs still count against the bound
+    future.add_done_callback(lambda _: slots.release())
+
+    try:
+        return future.result(timeout=current_app.config["PASSWORD_HASH_TIMEOUT"])
+    except FutureTimeoutError as e:
+        future.cancel()
+        logger.warning("Password hashing timed out in pool")
+        raise ServiceUnavailableError("Password hashing timed out") from e
+    except BrokenProcessPool as e:
+        raise _broken_hash_pool(e) from e
+
+
 def hash_password(password: str) -> str:
-    """Hash a password using pbkdf2_sha256"""
+    """Hash a password using the configured scheme and cost"""
     if not password:
         raise SecurityError("Password cannot be empty")
 
     try:
-        hashed = pbkdf2_sha256.hash(password)
+        hashed = _run_hash_job(_hash_in_worker, password, *_hash_settings())
         logger.debug("Password hashed successfully")
         return hashed
 
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         logger.error(f"Error hashing password: {str(e)}")
         raise SecurityError(f"Failed to hash password: {str(e)}") from e
@@ -36,10 +186,14 @@ def verify_password(password: str, hashed_password: str) -> bool:
         return False
 
     try:
-        is_valid = pbkdf2_sha256.verify(password, hashed_password)
+        is_valid = _run_hash_job(
+            _verify_in_worker, password, hashed_password, *_hash_settings()
+        )
         logger.debug(f"Password verification result: {is_valid}")
         return is_valid
 
+    except ServiceUnavailableError:
+        raise
     except (ValueError, Exception) as e:
         logger.warning(f"Password verification failed: {str(e)}")
         return False
@@ -48,6 +202,78 @@ def verify_password(password: str, hashed_password: str) -> bool:
         return False
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check if a hash uses an outdated scheme or cost"""
+    try:
+        return _get_crypt_context(*_hash_settings()).needs_update(hashed_password)
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Could not inspect password hash: {str(e)}")
+        return False
+
+
+def schedule_password_rehash(password: str, on_rehashed) -> None:
+    """Re-hash a password in the background and hand the result to on_rehashed
+
+    Used after a successful login, so the upgrade never adds latency to the
+    login request itself.
+    """
+    global _rehash_executor, _rehash_executor_pid
+
+    app = current_app._get_current_object()
+
+    def rehash():
+        with app.app_context():
+            try:
+                on_rehashed(hash_password(password))
+                logger.debug("Upgraded outdated password hash")
+            except Exception as e:
+                logger.warning(f"Background password rehash failed: {str(e)}")
+
+    with _hash_pool_lock:
+        if _rehash_executor is None or _rehash_executor_pid != os.getpid():
+            _rehash_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="password-rehash"
+            )
+            _rehash_executor_pid = os.getpid()
+
+    _rehash_executor.submit(rehash)
+
+
+def calibrate_hash_rounds(
+    scheme: str = DEFAULT_HASH_SCHEME, target_ms: float = 50.0, samples: int = 3
+) -> Dict[str, Union[int, float, str]]:
+    """Measure hashing time on this host and pick rounds that hit target_ms
+
+    bcrypt rounds are a log2 cost; other schemes scale linearly with rounds.
+    """
+    handler = get_crypt_handler(scheme)
+    rounds = handler.default_rounds
+
+    def measure(candidate):
+        timings = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            handler.using(rounds=candidate).hash("calibration-password")
+            timings.append((time.perf_counter() - started) * 1000)
+        return sorted(timings)[len(timings) // 2]
+
+    elapsed_ms = measure(rounds)
+
+    if scheme == "bcrypt":
+        rounds = round(rounds + math.log2(target_ms / elapsed_ms))
+    else:
+        rounds = round(rounds * target_ms / elapsed_ms)
+
+    rounds = max(handler.min_rounds, min(handler.max_rounds, rounds))
+
+    return {
+        "scheme": scheme,
+        "rounds": rounds,
+        "measured_ms": round(measure(rounds), 2),
+        "target_ms": target_ms,
+    }
+
+
 def generate_tokens(
     user_id: Union[str, int], user_type: str, additional_claims: Optional[Dict] = None
 ) -> Dict[str, str]:
@@ -0,0 +1,105 @@
+import copy
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+from flask import current_app
+
+from app.utils.deadlines import remaining_ms
+from app.utils.exceptions import DeadlineExceededError
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Share one in-flight load between concurrent callers of the same key
+
+    The first caller for a key (the leader) runs the load; callers arriving
+    before it finishes wait and get its result, or its exception, for as long
+    as their own request deadline allows. Nothing is kept once the load
+    completes, so the next caller loads fresh data. Every caller gets its own
+    copy of a shared result and may modify it.
+    """
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_waiters = 0
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Return load(), sharing the call with concurrent callers of key"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                self.max_waiters = max(self.max_waiters, call.waiters)
+
+        if not leader:
+            timeout_ms = remaining_ms()
+            timeout = None if timeout_ms is None else timeout_ms / 1000
+            if not call.done.wait(timeout):
+                raise DeadlineExceededError("Request deadline exceeded")
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = load()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is not None:
+                    self.errors += 1
+                shared = call.waiters > 0
+            call.done.set()
+
+        # Followers copy the stored result, so the leader keeps its own
+        return copy.deepcopy(call.result) if shared else call.result
+
+    def snapshot(self) -> Dict:
+        """Return current coalescing counters"""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "max_waiters": self.max_waiters,
+            }
+
+
+def get_single_flight() -> SingleFlight:
+    """Get this worker's single-flight group"""
+    group = current_app.extensions.get("single_flight")
+
+    # Calls in flight in the parent at fork() would never complete here
+    if group is None or group.pid != os.getpid():
+        group = SingleFlight()
+        current_app.extensions["single_flight"] = group
+
+    return group
+
+
+def coalesce(key: Hashable, load: Callable[[], Any]) -> Any:
+    """Run load() once for all concurrent requests of key in this worker"""
+    if not current_app.config.get("SINGLE_FLIGHT_ENABLED", True):
+        return load()
+    return get_single_flight().do(key, load)
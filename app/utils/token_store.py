@@ -0,0 +1,113 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Union
+
+from flask import current_app
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from app.utils.db import create_index, get_db
+from app.utils.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryRevocationStore:
+    """In-process store of revoked token IDs (single worker deployments)"""
+
+    PRUNE_EVERY = 256
+
+    def __init__(self):
+        self._revoked = {}
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def revoke(self, jti: str, expires_at: Union[int, float]) -> bool:
+        """Revoke a token ID until it expires; False if it was already revoked"""
+        with self._lock:
+            if self._is_revoked(jti):
+                return False
+
+            self._revoked[jti] = expires_at
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._prune()
+
+            return True
+
+    def is_revoked(self, jti: str) -> bool:
+        """Check if a token ID has been revoked"""
+        with self._lock:
+            return self._is_revoked(jti)
+
+    def _is_revoked(self, jti):
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def _prune(self):
+        """Forget tokens that have expired anyway"""
+        now = time.time()
+        for jti in [j for j, exp in self._revoked.items() if exp <= now]:
+            del self._revoked[jti]
+
+
+class MongoRevocationStore:
+    """Revoked token IDs in a TTL-indexed collection shared by all workers"""
+
+    COLLECTION = "revoked_tokens"
+
+    def __init__(self):
+        self._indexed = False
+
+    def _ensure_indexes(self):
+        if not self._indexed:
+            # Documents are removed by MongoDB once the token has expired
+            create_index(self.COLLECTION, "expires_at", expireAfterSeconds=0)
+            self._indexed = True
+
+    def revoke(self, jti: str, expires_at: Union[int, float]) -> bool:
+        """Revoke a token ID until it expires; False if it was already revoked"""
+        self._ensure_indexes()
+
+        try:
+            get_db()[self.COLLECTION].insert_one(
+                {"_id": jti, "expires_at": datetime.utcfromtimestamp(expires_at)}
+            )
+            return True
+
+        except DuplicateKeyError:
+            return False
+        except PyMongoError as e:
+            logger.error(f"Database error revoking token {jti}: {str(e)}")
+            raise DatabaseError(f"Failed to revoke token: {str(e)}") from e
+
+    def is_revoked(self, jti: str) -> bool:
+        """Check if a token ID has been revoked"""
+        try:
+            return get_db()[self.COLLECTION].find_one({"_id": jti}) is not None
+
+        except PyMongoError as e:
+            logger.error(f"Database error checking token {jti}: {str(e)}")
+            raise DatabaseError(f"Failed to check token: {str(e)}") from e
+
+
+REVOCATION_STORES = {
+    "memory": MemoryRevocationStore,
+    "mongo": MongoRevocationStore,
+}
+
+
+def get_revocation_store():
+    """Get the app's revocation store, created on first use"""
+    store = current_app.extensions.get("token_revocation_store")
+
+    if store is None:
+        backend = current_app.config.get("TOKEN_REVOCATION_STORE", "mongo")
+        if backend not in REVOCATION_STORES:
+            raise ValueError(f"Unknown token revocation store: {backend}")
+
+        store = REVOCATION_STORES[backend]()
+        current_app.extensions["token_revocation_store"] = store
+
+    return store
@@ -0,0 +1,89 @@
+"""
+Benchmark per-request authentication overhead of require_user_type
+
+Compares a hot authenticated route with the verified-claims cache disabled
+and enabled. Runs without a database.
+
+Usage: python benchmarks/bench_auth.py [--requests 5000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+from flask_jwt_extended import JWTManager, create_access_token
+
+from app.utils.decorators import require_user_type
+
+
+def create_bench_app(cache_size):
+    """Create a minimal app exposing one route guarded like /api/users/profile"""
+    app = Flask(__name__)
+    app.config.update(
+        {
+            "JWT_SECRET_KEY": "bench-secret-key-with-at-least-32-bytes",
+            "JWT_CLAIMS_CACHE_SIZE": cache_size,
+        }
+    )
+    JWTManager(app)
+
+    @app.route("/profile")
+    @require_user_type("user")
+    def profile(current_user_id, current_user_type):
+        return jsonify({"id": current_user_id})
+
+    return app
+
+
+def run(cache_size, requests):
+    """Return per-request latencies in microseconds"""
+    app = create_bench_app(cache_size)
+    client = app.test_client()
+
+    with app.app_context():
+        token = create_access_token(
+            identity="507f1f77bcf86cd799439011",
+            additional_claims={"user_type": "user"},
+            expires_delta=timedelta(hours=1),
+        )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # Warm up (also fills the cache)
+    for _ in range(100):
+        client.get("/profile", headers=headers)
+
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = client.get("/profile", headers=headers)
+        latencies.append((time.perf_counter() - started) * 1e6)
+        assert response.status_code == 200
+
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'claims cache':<14} {'median µs':>10} {'p95 µs':>10}")
+    results = {}
+    for label, cache_size in (("disabled", 0), ("enabled", 10000)):
+        latencies = sorted(run(cache_size, args.requests))
+        results[label] = statistics.median(latencies)
+        p95 = latencies[int(len(latencies) * 0.95)]
+        print(f"{label:<14} {results[label]:>10.1f} {p95:>10.1f}")
+
+    saved = results["disabled"] - results["enabled"]
+    print(f"\nSaved per request: {saved:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark response compression on typical /api/jobs pages
+
+Builds search result pages (jobs with full descriptions and an embedded
+company, serialized as the API does) and reports, for each installed
+encoder and level, the compressed size and the CPU time per response.
+Runs without a database.
+
+Usage: python benchmarks/bench_compression.py [--jobs 20] [--rounds 200]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+
+from app.utils.compression import ENCODERS
+
+LEVELS = {"gzip": [1, 4, 5, 6, 9], "br": [1, 4, 6, 11], "zstd": [1, 3, 9, 19]}
+
+WORDS = (
+    "mission intérim équipe client production logistique entrepôt horaires "
+    "expérience formation sécurité qualité poste contrat semaine salaire "
+    "compétences travail autonomie rigueur service commande préparation "
+    "caces manutention accueil vente caisse rayon stock inventaire "
+    "développement python données analyse projet agile api déploiement"
+).split()
+
+
+def paragraph(words):
+    return " ".join(random.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_page(jobs):
+    """Serialize a search page shaped like the API's paginated response"""
+    now = datetime(2024, 6, 1)
+    companies = [
+        {
+            "_id": str(ObjectId()),
+            "name": f"Entreprise {i}",
+            "industry": random.choice(["Logistique", "Commerce", "Technologie"]),
+            "description": paragraph(60),
+            "email": f"contact{i}@example.com",
+            "created_at": (now - timedelta(days=i * 30)).isoformat(),
+            "updated_at": now.isoformat(),
+        }
+        for i in range(5)
+    ]
+    data = [
+        {
+            "_id": str(ObjectId()),
+            "title": f"{random.choice(['Préparateur', 'Cariste', 'Développeur'])} {i}",
+            "description": " ".join(paragraph(40) for _ in range(8)),
+            "requirements": [random.choice(WORDS) for _ in range(6)],
+            "location": random.choice(["Paris", "Lyon", "Lille"]),
+            "type": "full_time",
+            "salary": {"min": 1800 + i * 10, "max": 2600 + i * 10, "currency": "EUR"},
+            "applications": [str(ObjectId()) for _ in range(random.randint(0, 10))],
+            "company": random.choice(companies),
+            "created_at": (now - timedelta(hours=i)).isoformat(),
+            "updated_at": now.isoformat(),
+        }
+        for i in range(jobs)
+    ]
+    page = {
+        "success": True,
+        "data": {"data": data, "total": 1000, "page": 1, "limit": jobs, "pages": 50},
+        "request_id": "bench",
+    }
+    return json.dumps(page).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(42)
+    body = make_page(args.jobs)
+    print(f"Page of {args.jobs} jobs: {len(body) / 1024:.1f} KiB uncompressed\n")
+    print(
+        f"{'encoder':<8} {'level':>5} {'KiB':>8} {'ratio':>7} {'µs/resp':>9} {'MB/s':>8}"
+    )
+
+    for name, (encoder_class, available) in ENCODERS.items():
+        if not available():
+            print(f"{name:<8} (not installed)")
+            continue
+
+        for level in LEVELS[name]:
+            encoder = encoder_class(level)
+            compressed = encoder.compress(body)
+
+            started = time.perf_counter()
+            for _ in range(args.rounds):
+                encoder.compress(body)
+            elapsed = (time.perf_counter() - started) / args.rounds
+
+            print(
+                f"{name:<8} {level:>5} {len(compressed) / 1024:>8.1f} "
+                f"{len(body) / len(compressed):>7.1f} {elapsed * 1e6:>9.0f} "
+                f"{len(body) / elapsed / 1e6:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
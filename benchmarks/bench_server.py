@@ -0,0 +1,140 @@
+"""
+Benchmark gunicorn worker settings end to end
+
+Starts gunicorn with gunicorn.conf.py for each worker profile, on the
+in-memory storage backend, and drives it with concurrent keep-alive clients.
+The clients share the machine with the server, so compare profiles with each
+other rather than reading the figures as capacity.
+Needs gunicorn (and gevent for the gevent profile) but no MongoDB server.
+
+Usage: python benchmarks/bench_server.py [--path /api/health] [--clients 32]
+       [--seconds 10] [--profiles sync:3:1 gthread:2:4 gevent:1:1]
+
+A profile is worker_class:workers:threads.
+"""
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PORT = 5099
+
+
+def start_server(worker_class, workers, threads):
+    """Start gunicorn with the given layout and wait until it answers"""
+    env = {
+        # In-process storage and quiet logs; export FLASK_ENV=production (with
+        # its required secrets) to measure the production configuration
+        "FLASK_ENV": "testing",
+        "TEST_STORAGE_BACKEND": "memory",
+        "RATE_LIMIT_ENABLED": "false",
+        "LOAD_SHEDDING_ENABLED": "false",
+        **os.environ,
+        "GUNICORN_BIND": f"127.0.0.1:{PORT}",
+        "GUNICORN_WORKER_CLASS": worker_class,
+        "GUNICORN_WORKERS": str(workers),
+        "GUNICORN_THREADS": str(threads),
+        "GUNICORN_ACCESS_LOG": "/dev/null",
+        "GUNICORN_LOG_LEVEL": "warning",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py", "wsgi:app"],
+        cwd=ROOT,
+        env=env,
+    )
+
+    for _ in range(100):
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", PORT, timeout=1)
+            connection.request("GET", "/api/health/live")
+            connection.getresponse().read()
+            return server
+        except OSError:
+            time.sleep(0.1)
+
+    server.terminate()
+    raise RuntimeError("gunicorn did not start")
+
+
+def client_loop(path, stop_at, latencies, errors):
+    """Send requests on one keep-alive connection until stop_at"""
+    connection = None
+    while time.monotonic() < stop_at:
+        if connection is None:
+            connection = http.client.HTTPConnection("127.0.0.1", PORT, timeout=10)
+        started = time.perf_counter()
+        try:
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response.read()
+        except http.client.RemoteDisconnected:
+            # A recycled worker (max_requests) closed the idle connection;
+            # clients retry such GETs on a new one
+            connection.close()
+            connection = None
+            continue
+        except (OSError, http.client.HTTPException):
+            errors.append(1)
+            connection.close()
+            connection = None
+            continue
+
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response.status != 200:
+            errors.append(1)
+        # Sync workers close the connection after each response
+        if response.will_close:
+            connection.close()
+            connection = None
+
+
+def run(path, clients, seconds):
+    """Return (requests per second, latencies in ms, error count)"""
+    latencies, errors = [], []
+    stop_at = time.monotonic() + seconds
+    threads = [
+        threading.Thread(target=client_loop, args=(path, stop_at, latencies, errors))
+        for _ in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return len(latencies) / seconds, sorted(latencies), len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--path", default="/api/health")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument(
+        "--profiles", nargs="+", default=["sync:3:1", "gthread:2:4", "gevent:1:1"]
+    )
+    args = parser.parse_args()
+
+    print(f"GET {args.path}, {args.clients} clients, {os.cpu_count()} CPU(s)\n")
+    print(f"{'profile':<14} {'req/s':>8} {'median ms':>10} {'p99 ms':>8} {'errors':>7}")
+    for profile in args.profiles:
+        worker_class, workers, threads = profile.split(":")
+        server = start_server(worker_class, int(workers), int(threads))
+        try:
+            run(args.path, args.clients, 1)  # warm up
+            rate, latencies, errors = run(args.path, args.clients, args.seconds)
+        finally:
+            server.terminate()
+            server.wait()
+
+        p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0
+        median = statistics.median(latencies) if latencies else 0
+        print(f"{profile:<14} {rate:>8.0f} {median:>10.1f} {p99:>8.1f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
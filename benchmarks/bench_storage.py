@@ -0,0 +1,113 @@
+"""
+Benchmark the in-process storage backends
+
+Starts the full app on each backend, seeds jobs, then times the job search
+(regex and equality filters) and lookups by ID. Needs no MongoDB server.
+
+Usage: python benchmarks/bench_storage.py [--jobs 5000] [--queries 200]
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("FLASK_ENV", "testing")
+
+from bson import ObjectId
+
+from app import create_app
+from app.models.job import Job
+from app.utils.db import create_index, find_by_id
+
+LOCATIONS = ["Paris", "Lyon", "Marseille", "Lille", "Nantes"]
+TITLES = ["Python Developer", "Data Engineer", "Warehouse Operator", "Cashier"]
+
+
+def seed(db, count):
+    """Insert count jobs spread over a few companies"""
+    companies = [ObjectId() for _ in range(20)]
+    db.jobs.insert_many(
+        [
+            {
+                "title": f"{random.choice(TITLES)} {i}",
+                "description": "Temporary mission",
+                "requirements": "",
+                "location": random.choice(LOCATIONS),
+                "company_id": random.choice(companies),
+                "salary": random.randint(1500, 4000),
+                "type": "full_time",
+            }
+            for i in range(count)
+        ]
+    )
+    create_index("jobs", "company_id")
+    return companies
+
+
+def timed(fn, repeat):
+    """Median duration of fn in microseconds"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(samples)
+
+
+def run(backend, jobs, queries):
+    os.environ["TEST_STORAGE_BACKEND"] = backend
+
+    import config
+
+    config.TestingConfig.STORAGE_BACKEND = backend
+
+    started = time.perf_counter()
+    app = create_app()
+    startup_ms = (time.perf_counter() - started) * 1000
+
+    with app.app_context():
+        companies = seed(app.db, jobs)
+        ids = [doc["_id"] for doc in app.db.jobs.find({}, {"_id": 1})]
+
+        results = {
+            "startup_ms": startup_ms,
+            "search_us": timed(
+                lambda: Job.search({"keyword": "python", "location": "lyon"}, 20),
+                queries,
+            ),
+            "by_company_us": timed(
+                lambda: Job.find_by_company(random.choice(companies), 20), queries
+            ),
+            "by_id_us": timed(
+                lambda: find_by_id("jobs", random.choice(ids)), queries * 10
+            ),
+        }
+
+    return results
+
+
+def main():
+    logging.disable(logging.ERROR)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    print(
+        f"{'backend':<10} {'startup':>10} {'search':>12} {'by company':>12} {'by id':>10}"
+    )
+    for backend in ("mongomock", "memory"):
+        r = run(backend, args.jobs, args.queries)
+        print(
+            f"{backend:<10} {r['startup_ms']:>8.1f}ms {r['search_us']:>10.0f}us "
+            f"{r['by_company_us']:>10.0f}us {r['by_id_us']:>8.0f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Measure password hashing cost on this host and suggest PASSWORD_HASH_ROUNDS
+"""
+import argparse
+import os
+import sys
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.security import calibrate_hash_rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=50.0,
+        help="Target time for a single hash in milliseconds (default: 50)",
+    )
+    parser.add_argument(
+        "--scheme",
+        default="pbkdf2_sha256",
+        help="passlib scheme: pbkdf2_sha256, argon2 or bcrypt (default: pbkdf2_sha256)",
+    )
+    args = parser.parse_args()
+
+    print(f"⏱️  Calibrating {args.scheme} for ~{args.target_ms:g} ms per hash...")
+
+    try:
+        result = calibrate_hash_rounds(args.scheme, args.target_ms)
+    except Exception as e:
+        print(f"❌ Calibration failed: {str(e)}")
+        sys.exit(1)
+
+    print(f"✅ {result['rounds']} rounds took {result['measured_ms']} ms")
+    print("\nAdd to your environment:")
+    print(f"PASSWORD_HASH_SCHEME={result['scheme']}")
+    print(f"PASSWORD_HASH_ROUNDS={result['rounds']}")
+
+
+if __name__ == "__main__":
+    main()
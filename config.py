@@ -27,6 +27,46 @@ def _parse_cors_origins(origins_string):
     return origins if origins else ["http://localhost:3000"]
 
 
+def _parse_optional_int(value):
+    """Parse an optional integer setting; empty values mean unset."""
+    if value in (None, ""):
+        return None
+    return int(value)
+
+
+def _server_layout():
+    """Worker class, worker count and threads per worker of the app server.
+
+    gunicorn.conf.py exports the values it settled on; without it (flask run)
+    this is a single process.
+    """
+    worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+    workers = int(os.environ.get("GUNICORN_WORKERS", 1))
+    threads = int(os.environ.get("GUNICORN_THREADS", 4))
+    return worker_class, workers, threads
+
+
+def _default_event_source():
+    """Tail MongoDB when events must reach other workers."""
+    _, workers, _ = _server_layout()
+    return "change_stream" if workers > 1 else "local"
+
+
+def _default_event_subscribers():
+    """Leave at least half of a threaded worker's threads to requests."""
+    worker_class, _, threads = _server_layout()
+    if worker_class == "gevent":
+        return 100
+    return max(1, threads // 2)
+
+
+def _parse_list(value):
+    """Parse a comma-separated setting into a list of non-empty items."""
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
 class Config:
     """Base configuration."""
 
@@ -36,6 +76,37 @@ class Config:
     # MongoDB
     MONGODB_URI = os.environ.get("MONGODB_URI", "mongodb://localhost:27017/interimapp")
 
+    # Storage backend: "mongodb", or the in-process "mongomock" and "memory"
+    # engines for tests and benchmarks (no server needed)
+    STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "mongodb")
+
+    # MongoDB connection pool (one pool per worker process)
+    MONGO_MIN_POOL_SIZE = int(os.environ.get("MONGO_MIN_POOL_SIZE", 0))
+    MONGO_MAX_POOL_SIZE = int(os.environ.get("MONGO_MAX_POOL_SIZE", 50))
+    MONGO_MAX_IDLE_TIME_MS = _parse_optional_int(
+        os.environ.get("MONGO_MAX_IDLE_TIME_MS")
+    )
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = _parse_optional_int(
+        os.environ.get("MONGO_WAIT_QUEUE_TIMEOUT_MS")
+    )
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(
+        os.environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000)
+    )
+    MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get("MONGO_CONNECT_TIMEOUT_MS", 10000))
+    MONGO_COMPRESSORS = _parse_list(os.environ.get("MONGO_COMPRESSORS", ""))
+    MONGO_READ_CONCERN = os.environ.get("MONGO_READ_CONCERN")  # e.g. "majority"
+    # Search, listings and public detail may read from secondaries lagging by
+    # at most MONGO_MAX_STALENESS_SECONDS (>= 90); everything else reads the
+    # primary. Authenticated requests use causally consistent sessions.
+    MONGO_SECONDARY_READS = (
+        os.environ.get("MONGO_SECONDARY_READS", "true").lower() == "true"
+    )
+    MONGO_MAX_STALENESS_SECONDS = int(os.environ.get("MONGO_MAX_STALENESS_SECONDS", 90))
+    MONGO_CAUSAL_CONSISTENCY = (
+        os.environ.get("MONGO_CAUSAL_CONSISTENCY", "true").lower() == "true"
+    )
+    MONGO_WRITE_CONCERN = os.environ.get("MONGO_WRITE_CONCERN")  # e.g. "majority"
+
     # JWT Configuration
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY") or _generate_secret_key()
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(
@@ -46,6 +117,24 @@ class Config:
     )
     JWT_ALGORITHM = "HS256"
 
+    # Verified access-token claims kept per worker (0 disables the cache)
+    JWT_CLAIMS_CACHE_SIZE = int(os.environ.get("JWT_CLAIMS_CACHE_SIZE", 10000))
+
+    # Revoked refresh tokens: "mongo" (shared by all workers) or "memory"
+    TOKEN_REVOCATION_STORE = os.environ.get("TOKEN_REVOCATION_STORE", "mongo")
+
+    # Idempotency-Key support on POST routes: responses are replayed for
+    # IDEMPOTENCY_TTL seconds from "mongo" (shared) or "memory" (per worker)
+    IDEMPOTENCY_ENABLED = (
+        os.environ.get("IDEMPOTENCY_ENABLED", "true").lower() == "true"
+    )
+    IDEMPOTENCY_STORE = os.environ.get("IDEMPOTENCY_STORE", "mongo")
+    IDEMPOTENCY_TTL = int(os.environ.get("IDEMPOTENCY_TTL", 86400))
+    # A request holding a key longer than this is presumed dead
+    IDEMPOTENCY_LOCK_SECONDS = int(os.environ.get("IDEMPOTENCY_LOCK_SECONDS", 60))
+    # How long a duplicate waits for the original before a 503
+    IDEMPOTENCY_WAIT_SECONDS = float(os.environ.get("IDEMPOTENCY_WAIT_SECONDS", 10))
+
     # CORS Configuration
     CORS_ORIGINS = _parse_cors_origins(
         os.environ.get("CORS_ORIGINS", "http://localhost:3000")
@@ -60,9 +149,149 @@ class Config:
     DEFAULT_PAGE_SIZE = int(os.environ.get("DEFAULT_PAGE_SIZE", 20))
     MAX_PAGE_SIZE = int(os.environ.get("MAX_PAGE_SIZE", 100))
 
-    # Rate Limiting (requests per minute)
+    # Password hashing cost (run calibrate_hash.py to pick rounds for this host).
+    # Hashes made with another scheme or cost are upgraded on the next login.
+    PASSWORD_HASH_SCHEME = os.environ.get("PASSWORD_HASH_SCHEME", "pbkdf2_sha256")
+    PASSWORD_HASH_ROUNDS = _parse_optional_int(os.environ.get("PASSWORD_HASH_ROUNDS"))
+
+    # Password hashing offload: pool processes per worker (0 hashes inline) and
+    # how many jobs may wait for them before requests fail fast with a 503
+    PASSWORD_HASH_POOL_SIZE = int(os.environ.get("PASSWORD_HASH_POOL_SIZE", 0))
+    PASSWORD_HASH_QUEUE_LIMIT = int(os.environ.get("PASSWORD_HASH_QUEUE_LIMIT", 16))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get("PASSWORD_HASH_TIMEOUT", 5))
+
+    # Concurrent hydration of list pages (0 disables the thread pool)
+    HYDRATION_MAX_WORKERS = int(os.environ.get("HYDRATION_MAX_WORKERS", 8))
+
+    # Rate Limiting (token buckets per route and per user or client IP)
+    RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() == "true"
     RATE_LIMIT_DEFAULT = os.environ.get("RATE_LIMIT_DEFAULT", "100/minute")
     RATE_LIMIT_AUTH = os.environ.get("RATE_LIMIT_AUTH", "5/minute")
+    # "memory" shares buckets between the workers of one host, "redis" between
+    # hosts (falls back to memory when Redis is unavailable)
+    RATE_LIMIT_STORAGE = os.environ.get("RATE_LIMIT_STORAGE", "memory")
+    RATE_LIMIT_REDIS_URL = os.environ.get(
+        "RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0"
+    )
+    RATE_LIMIT_SLOTS = int(os.environ.get("RATE_LIMIT_SLOTS", 65536))
+    # Reverse proxies in front of the app; their X-Forwarded-For gives the
+    # client IP used for anonymous limits (0 when clients connect directly)
+    TRUSTED_PROXY_HOPS = int(os.environ.get("TRUSTED_PROXY_HOPS", 0))
+
+    # Database resilience: retries for idempotent reads (exponential backoff
+    # with full jitter) and a per-worker circuit breaker that opens when the
+    # failure share over the window reaches the rate. While it is open,
+    # documents recently read by find_one are served from a local cache.
+    DB_READ_RETRIES = int(os.environ.get("DB_READ_RETRIES", 2))
+    DB_RETRY_BACKOFF_MS = int(os.environ.get("DB_RETRY_BACKOFF_MS", 50))
+    DB_RETRY_MAX_BACKOFF_MS = int(os.environ.get("DB_RETRY_MAX_BACKOFF_MS", 1000))
+    DB_BREAKER_ENABLED = os.environ.get("DB_BREAKER_ENABLED", "true").lower() == "true"
+    DB_BREAKER_FAILURE_RATE = float(os.environ.get("DB_BREAKER_FAILURE_RATE", 0.5))
+    DB_BREAKER_MIN_CALLS = int(os.environ.get("DB_BREAKER_MIN_CALLS", 20))
+    DB_BREAKER_WINDOW_SECONDS = int(os.environ.get("DB_BREAKER_WINDOW_SECONDS", 10))
+    DB_BREAKER_RESET_TIMEOUT = float(os.environ.get("DB_BREAKER_RESET_TIMEOUT", 30))
+    DB_FALLBACK_CACHE_SIZE = int(os.environ.get("DB_FALLBACK_CACHE_SIZE", 1000))
+    DB_FALLBACK_CACHE_TTL = int(os.environ.get("DB_FALLBACK_CACHE_TTL", 300))
+
+    # Health probes: seconds between background database pings (0 pings on
+    # every probe) and pool utilization at which readiness fails
+    HEALTH_CHECK_INTERVAL = float(os.environ.get("HEALTH_CHECK_INTERVAL", 5))
+    HEALTH_POOL_SATURATION = float(os.environ.get("HEALTH_POOL_SATURATION", 0.9))
+
+    # Request deadlines in ms (0 disables): database queries get the time left
+    # as max_time_ms and fail with a 504 once it runs out
+    REQUEST_DEADLINE_MS = int(os.environ.get("REQUEST_DEADLINE_MS", 10000))
+    SEARCH_DEADLINE_MS = int(os.environ.get("SEARCH_DEADLINE_MS", 3000))
+
+    # Load shedding: adaptive per-worker concurrency limit (requests beyond it
+    # get an immediate 503 with Retry-After)
+    LOAD_SHEDDING_ENABLED = (
+        os.environ.get("LOAD_SHEDDING_ENABLED", "true").lower() == "true"
+    )
+    CONCURRENCY_LIMIT_INITIAL = int(os.environ.get("CONCURRENCY_LIMIT_INITIAL", 20))
+    CONCURRENCY_LIMIT_MIN = int(os.environ.get("CONCURRENCY_LIMIT_MIN", 4))
+    CONCURRENCY_LIMIT_MAX = int(os.environ.get("CONCURRENCY_LIMIT_MAX", 200))
+    LOAD_SHEDDING_RETRY_AFTER = int(os.environ.get("LOAD_SHEDDING_RETRY_AFTER", 1))
+
+    # Response compression, negotiated from Accept-Encoding in this order
+    # (brotli and zstd need the brotli and zstandard packages); bodies under
+    # COMPRESSION_MIN_SIZE bytes are sent uncompressed
+    COMPRESSION_ENABLED = (
+        os.environ.get("COMPRESSION_ENABLED", "true").lower() == "true"
+    )
+    COMPRESSION_ALGORITHMS = _parse_list(
+        os.environ.get("COMPRESSION_ALGORITHMS", "zstd,br,gzip")
+    )
+    COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", 5))
+    COMPRESSION_BROTLI_LEVEL = int(os.environ.get("COMPRESSION_BROTLI_LEVEL", 4))
+    COMPRESSION_ZSTD_LEVEL = int(os.environ.get("COMPRESSION_ZSTD_LEVEL", 3))
+    COMPRESSION_MIMETYPES = _parse_list(
+        os.environ.get("COMPRESSION_MIMETYPES", "application/json,text/event-stream")
+    )
+
+    # Concurrent reads of the same job share one in-flight database load
+    SINGLE_FLIGHT_ENABLED = (
+        os.environ.get("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+    )
+
+    # HTTP caching of public endpoints: browsers keep responses for max-age,
+    # shared caches (CDN, reverse proxy) for s-maxage. Responses carry
+    # surrogate keys, purged by sending HTTP_CACHE_PURGE_METHOD to
+    # HTTP_CACHE_PURGE_URL when a job or company changes.
+    HTTP_CACHE_ENABLED = os.environ.get("HTTP_CACHE_ENABLED", "true").lower() == "true"
+    CACHE_POLICY_JOB_SEARCH = os.environ.get(
+        "CACHE_POLICY_JOB_SEARCH",
+        "public, max-age=30, s-maxage=60, stale-while-revalidate=60",
+    )
+    CACHE_POLICY_JOB = os.environ.get(
+        "CACHE_POLICY_JOB",
+        "public, max-age=60, s-maxage=600, stale-while-revalidate=60",
+    )
+    CACHE_POLICY_COMPANIES = os.environ.get(
+        "CACHE_POLICY_COMPANIES",
+        "public, max-age=60, s-maxage=300, stale-while-revalidate=60",
+    )
+    CACHE_POLICY_COMPANY = os.environ.get(
+        "CACHE_POLICY_COMPANY",
+        "public, max-age=60, s-maxage=600, stale-while-revalidate=60",
+    )
+    CACHE_POLICY_COMPANY_JOBS = os.environ.get(
+        "CACHE_POLICY_COMPANY_JOBS",
+        "public, max-age=30, s-maxage=60, stale-while-revalidate=60",
+    )
+    HTTP_CACHE_SURROGATE_HEADER = os.environ.get(
+        "HTTP_CACHE_SURROGATE_HEADER", "Surrogate-Key"
+    )
+    HTTP_CACHE_PURGE_URL = os.environ.get("HTTP_CACHE_PURGE_URL", "")
+    HTTP_CACHE_PURGE_METHOD = os.environ.get("HTTP_CACHE_PURGE_METHOD", "POST")
+    HTTP_CACHE_PURGE_TOKEN = os.environ.get("HTTP_CACHE_PURGE_TOKEN", "")
+
+    # Delta sync (/api/jobs/changes): page size cap, and how long recent
+    # writes are held back so late commits cannot fall behind a token
+    JOB_CHANGES_MAX_LIMIT = int(os.environ.get("JOB_CHANGES_MAX_LIMIT", 500))
+    JOB_CHANGES_SETTLE_SECONDS = float(os.environ.get("JOB_CHANGES_SETTLE_SECONDS", 2))
+
+    # Cache invalidation across workers: "auto" follows a MongoDB change
+    # stream and polls updated_at on standalone servers; "change_stream",
+    # "poll" or "local" (only this worker's own writes) force a source
+    INVALIDATION_SOURCE = os.environ.get("INVALIDATION_SOURCE", "auto")
+    INVALIDATION_POLL_INTERVAL = float(os.environ.get("INVALIDATION_POLL_INTERVAL", 2))
+
+    # Server-sent events: "local" publishes from the worker that made the
+    # change (single worker), "change_stream" tails MongoDB (replica set) so
+    # every worker sees every change; the default follows the worker count.
+    # Each open stream holds a thread, so the cap follows the thread count.
+    EVENTS_SOURCE = os.environ.get("EVENTS_SOURCE", _default_event_source())
+    EVENTS_MAX_SUBSCRIBERS = int(
+        os.environ.get("EVENTS_MAX_SUBSCRIBERS", _default_event_subscribers())
+    )
+    EVENTS_QUEUE_SIZE = int(os.environ.get("EVENTS_QUEUE_SIZE", 100))
+    EVENTS_HEARTBEAT_SECONDS = float(os.environ.get("EVENTS_HEARTBEAT_SECONDS", 15))
+    EVENTS_STREAM_SECONDS = float(os.environ.get("EVENTS_STREAM_SECONDS", 300))
+    # Lifetime of the stream tokens passed in the URL (?jwt=...), since
+    # EventSource cannot send an Authorization header
+    EVENTS_TOKEN_SECONDS = int(os.environ.get("EVENTS_TOKEN_SECONDS", 60))
 
     # Email Configuration (for future use)
     MAIL_SERVER = os.environ.get("MAIL_SERVER")
@@ -159,15 +388,23 @@ class TestingConfig(Config):
     TESTING = True
     DEBUG = True
 
-    # Use separate test database
+    # Use separate test database, in process unless a server is requested
     MONGODB_URI = os.environ.get(
         "TEST_MONGODB_URI", "mongodb://localhost:27017/interimapp_test"
     )
+    STORAGE_BACKEND = os.environ.get("TEST_STORAGE_BACKEND", "mongomock")
 
     # Shorter token expiry for testing
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=5)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(hours=1)
 
+    # Check health synchronously instead of from a background thread
+    HEALTH_CHECK_INTERVAL = 0
+
+    # Cheap password hashing; production cost comes from calibrate_hash.py
+    PASSWORD_HASH_SCHEME = "pbkdf2_sha256"
+    PASSWORD_HASH_ROUNDS = 1000
+
     # Disable rate limiting in tests
     RATE_LIMIT_DEFAULT = "10000/minute"
     RATE_LIMIT_AUTH = "1000/minute"
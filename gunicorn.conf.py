@@ -0,0 +1,90 @@
+"""
+Gunicorn runtime profile for the InterimApp backend
+
+Every setting can be overridden through GUNICORN_* environment variables.
+"""
+import multiprocessing
+import os
+
+
+def _env_bool(name, default):
+    """Read a boolean flag from the environment"""
+    return os.environ.get(name, str(default)).lower() in ("1", "true", "yes")
+
+
+def _default_workers(worker_class):
+    """Size the worker count from the CPU count and worker class"""
+    cores = multiprocessing.cpu_count()
+
+    # Threaded and green workers get their concurrency inside each process
+    if worker_class == "gthread":
+        return cores + 1
+    if worker_class == "gevent":
+        return cores
+
+    return cores * 2 + 1
+
+
+# Server socket
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+backlog = int(os.environ.get("GUNICORN_BACKLOG", 2048))
+
+# Worker processes (sync, gthread or gevent - gevent must be installed)
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+if worker_class == "gevent":
+    # Patch before preload_app imports the app, so PyMongo and the hashing
+    # pool get cooperative sockets, locks and ssl
+    from gevent import monkey
+
+    monkey.patch_all()
+workers = int(os.environ.get("GUNICORN_WORKERS", _default_workers(worker_class)))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 1000))
+
+# Export the resolved layout, including computed defaults: config.py reads
+# these variables (_server_layout) when the app is loaded, to default
+# EVENTS_SOURCE to change streams when there are several workers and to size
+# EVENTS_MAX_SUBSCRIBERS from the threads or greenlets of each worker
+os.environ["GUNICORN_WORKER_CLASS"] = worker_class
+os.environ["GUNICORN_WORKERS"] = str(workers)
+os.environ["GUNICORN_THREADS"] = str(threads)
+
+# Recycle workers periodically, staggered so they do not restart together
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+# Timeouts
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+# Load the app once in the master so workers share its memory pages
+preload_app = _env_bool("GUNICORN_PRELOAD", True)
+
+# Logging
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-")
+errorlog = os.environ.get("GUNICORN_ERROR_LOG", "-")
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+def when_ready(server):
+    """Close the master's MongoClient before any worker is forked"""
+    if not server.cfg.preload_app:
+        return
+
+    flask_app = server.app.wsgi()
+    client = getattr(flask_app, "mongodb_client", None)
+    if client is not None:
+        client.close()
+        server.log.info("Closed preloaded MongoClient in master process")
+
+
+def post_fork(server, worker):
+    """Give each worker its own MongoClient when the app was preloaded"""
+    if not server.cfg.preload_app:
+        return
+
+    from app.utils.db import connect_db
+
+    connect_db(server.app.wsgi())
+    server.log.info(f"Worker {worker.pid} created its MongoClient")
@@ -1,11 +1,24 @@
 import os
 import sys
+from urllib.parse import urlsplit, urlunsplit
 
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# TestingConfig uses an in-process storage backend, so no server is needed
+os.environ.setdefault("FLASK_ENV", "testing")
+
+# Each pytest-xdist worker gets its own database on a shared server
+_worker = os.environ.get("PYTEST_XDIST_WORKER")
+if _worker:
+    _uri = urlsplit(
+        os.environ.get("TEST_MONGODB_URI", "mongodb://localhost:27017/interimapp_test")
+    )
+    _database = f"{_uri.path.lstrip('/') or 'interimapp_test'}_{_worker}"
+    os.environ["TEST_MONGODB_URI"] = urlunsplit(_uri._replace(path=f"/{_database}"))
+
 from datetime import datetime, timedelta
 
-import mongomock
 import pytest
 from bson import ObjectId
 from flask_jwt_extended import create_access_token
@@ -18,29 +31,72 @@ from app.models.user import User
 from app.utils.security import hash_password
 
 
-@pytest.fixture
-def app():
-    """Create and configure the Flask app for testing."""
-    app = create_app()
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "fresh_app: build a new app for a test that registers routes"
+    )
+
 
-    # Configure the app for testing
+def _create_test_app():
+    app = create_app()
     app.config.update(
         {
             "TESTING": True,
             "JWT_SECRET_KEY": "test-secret-key",
         }
     )
+    return app
+
 
-    # Use mongomock instead of a real MongoDB connection
-    mongo_client = mongomock.MongoClient()
-    app.mongodb_client = mongo_client
-    app.db = mongo_client["test_db"]
+def _truncate(db):
+    """Empty every collection, keeping their indexes"""
+    for name in db.list_collection_names():
+        db[name].delete_many({})
+
+
+@pytest.fixture(scope="session")
+def session_app():
+    """Build the Flask app once for the whole test session."""
+    app = _create_test_app()
+    _truncate(app.db)
+    return app
+
+
+@pytest.fixture
+def app(request, session_app):
+    """Flask app for a test, reset to its initial state afterwards.
+
+    Tests marked ``fresh_app`` get their own app, since routes cannot be
+    added to an app that already served requests.
+    """
+    if request.node.get_closest_marker("fresh_app"):
+        app = _create_test_app()
+    else:
+        app = session_app
+
+    config = dict(app.config)
+    extensions = dict(app.extensions)
+    connection = (app.mongodb_client, app.db, app.pool_monitor, app.mongodb_pid)
 
     # Make the db instance available to the application context
     with app.app_context():
-        # Proceed with app setup
         yield app
 
+    # Undo config changes, drop lazily created components, restore the client
+    app.config.clear()
+    app.config.update(config)
+    app.extensions.clear()
+    app.extensions.update(extensions)
+    app.mongodb_client, app.db, app.pool_monitor, app.mongodb_pid = connection
+    _truncate(app.db)
+
+
+@pytest.fixture(scope="session")
+def password_hash(session_app):
+    """Hash of "password123", computed once with the test hashing cost."""
+    with session_app.app_context():
+        return hash_password("password123")
+
 
 @pytest.fixture
 def client(app):
@@ -55,13 +111,13 @@ def db(app):
 
 
 @pytest.fixture
-def test_user(db):
+def test_user(db, password_hash):
     """Create a test user."""
     user_data = {
         "first_name": "Test",
         "last_name": "User",
         "email": "test@example.com",
-        "password": hash_password("password123"),
+        "password": password_hash,
         "skills": ["Python", "Flask", "MongoDB"],
         "experience": [],
         "education": [],
@@ -74,14 +130,14 @@ def test_user(db):
 
 
 @pytest.fixture
-def test_company(db):
+def test_company(db, password_hash):
     """Create a test company."""
     company_data = {
         "name": "Test Company",
         "industry": "Technology",
         "description": "A test company for testing purposes",
         "email": "company@example.com",
-        "password": hash_password("password123"),
+        "password": password_hash,
         "jobs": [],
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow(),
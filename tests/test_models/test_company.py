@@ -167,3 +167,12 @@ def test_add_job(app, test_company, db):
         # Test with non-existent company
         result = Company.add_job(ObjectId(), job_id)
         assert result is False
+
+
+def test_find_by_ids(app, test_company):
+    with app.app_context():
+        companies = Company.find_by_ids([test_company["_id"], None, ObjectId()])
+
+        assert [company["_id"] for company in companies] == [test_company["_id"]]
+        assert companies[0]["name"] == test_company["name"]
+        assert Company.find_by_ids([]) == []
@@ -3,6 +3,7 @@ from datetime import datetime
 import pytest
 from bson import ObjectId
 
+from app.models.exceptions import ValidationError
 from app.models.job import Job, JobType
 
 
@@ -175,3 +176,45 @@ def test_update_job(app, test_job):
         # Verify job was updated
         updated_job = Job.find_by_id(test_job["_id"])
         assert updated_job["title"] == "Updated Job Title"
+
+
+def test_changes_index_is_created_at_startup(db):
+    keys = [list(index["key"]) for index in db.jobs.index_information().values()]
+    assert Job.CHANGES_INDEX in keys
+
+
+def test_changes_since(app, test_company, db):
+    with app.app_context():
+        updated_at = datetime(2024, 1, 1)
+        ids = [ObjectId() for _ in range(3)]
+        db.jobs.insert_many(
+            [
+                {"_id": ids[1], "title": "Second", "updated_at": updated_at},
+                {"_id": ids[0], "title": "First", "updated_at": updated_at},
+                {"_id": ids[2], "title": "Third", "updated_at": datetime(2024, 1, 2)},
+            ]
+        )
+
+        page = Job.changes_since(limit=2)
+        assert [job["title"] for job in page] == ["First", "Second"]
+
+        # Jobs sharing an updated_at are told apart by _id
+        token = Job.encode_change_token(page[0])
+        assert Job.decode_change_token(token) == (updated_at, ids[0])
+        assert [job["title"] for job in Job.changes_since(token)] == [
+            "Second",
+            "Third",
+        ]
+
+        token = Job.encode_change_token(Job.changes_since(token)[-1])
+        assert Job.changes_since(token) == []
+
+        # Writes still settling are held back
+        Job.update(ids[0], {"title": "First, edited"})
+        assert Job.changes_since(token) == []
+        assert [
+            job["title"] for job in Job.changes_since(token, settle_seconds=-1)
+        ] == ["First, edited"]
+
+        with pytest.raises(ValidationError):
+            Job.decode_change_token("not-a-token")
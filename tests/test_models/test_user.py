@@ -1,3 +1,4 @@
+import time
 from datetime import datetime
 
 import pytest
@@ -127,6 +128,42 @@ def test_authenticate(app, test_user):
         assert failed_auth is None
 
 
+def test_authenticate_upgrades_outdated_hash(app, test_user, db):
+    with app.app_context():
+        # Calibrated cost differs from the one test_user was hashed with
+        app.config["PASSWORD_HASH_ROUNDS"] = 2000
+        assert "$2000$" not in test_user["password"]
+
+        auth_user = User.authenticate(test_user["email"], "password123")
+        assert auth_user is not None
+
+        # The hash is upgraded in the background after the login returns
+        for _ in range(50):
+            stored = db.users.find_one({"_id": test_user["_id"]})["password"]
+            if "$2000$" in stored:
+                break
+            time.sleep(0.05)
+
+        assert "$2000$" in stored
+        assert User.authenticate(test_user["email"], "password123") is not None
+
+
+def test_rehash_does_not_overwrite_changed_password(app, test_user, db):
+    with app.app_context():
+        old_hash = test_user["password"]
+        updated_at = db.users.find_one({"_id": test_user["_id"]})["updated_at"]
+
+        # A rehash of the current hash applies, without touching updated_at
+        assert User._store_rehashed_password(test_user["_id"], old_hash, "new") == 1
+        stored = db.users.find_one({"_id": test_user["_id"]})
+        assert stored["password"] == "new"
+        assert stored["updated_at"] == updated_at
+
+        # A rehash started before a password change is dropped
+        assert User._store_rehashed_password(test_user["_id"], old_hash, "late") == 0
+        assert db.users.find_one({"_id": test_user["_id"]})["password"] == "new"
+
+
 def test_add_experience(app, test_user):
     with app.app_context():
         # Experience data
@@ -0,0 +1,43 @@
+import time
+
+from app.utils.cache import TTLCache
+
+
+def test_ttl_cache_expiry():
+    cache = TTLCache(max_size=10, ttl=60)
+
+    cache.set("default", 1)
+    cache.set("expired", 2, expires_at=time.time() - 1)
+    cache.set("short", 3, ttl=0.05)
+
+    assert cache.get("default") == 1
+    assert cache.get("expired") is None
+    assert cache.get("short") == 3
+
+    time.sleep(0.06)
+    assert cache.get("short", "gone") == "gone"
+    assert cache.stats() == {"size": 1, "hits": 2, "misses": 2}
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_delete_where():
+    cache = TTLCache()
+    cache.set(("jobs", 1), "a")
+    cache.set(("jobs", 2), "b")
+    cache.set(("users", 1), "c")
+
+    assert cache.delete_where(lambda key: key[0] == "jobs") == 2
+    assert len(cache) == 1
+    assert cache.get(("users", 1)) == "c"
@@ -0,0 +1,37 @@
+from unittest import mock
+
+from app.utils.circuit_breaker import CircuitBreaker
+
+
+def test_breaker_opens_on_error_rate():
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, reset_timeout=30)
+
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == breaker.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+    assert not breaker.allow_request()
+    assert breaker.retry_after() == 30
+
+
+def test_breaker_half_open_probe():
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=1, reset_timeout=30)
+    breaker.record_failure()
+
+    with mock.patch("time.time", return_value=breaker.opened_at + 31):
+        # A single probe goes through
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_failure()
+        assert breaker.state == breaker.OPEN
+
+    with mock.patch("time.time", return_value=breaker.opened_at + 31):
+        assert breaker.allow_request()
+        breaker.record_success()
+
+    assert breaker.state == breaker.CLOSED
+    assert breaker.snapshot()["times_opened"] == 2
@@ -0,0 +1,83 @@
+import gzip
+import zlib
+
+import pytest
+from flask import Response, jsonify
+from werkzeug.http import parse_accept_header
+
+from app.utils.compression import GzipEncoder, ResponseCompressor
+
+# Each test adds routes
+pytestmark = pytest.mark.fresh_app
+
+PAYLOAD = {"jobs": [{"title": "Python Developer", "description": "x" * 200}] * 20}
+
+
+def _add_routes(app):
+    @app.route("/test/large")
+    def test_large():
+        response = jsonify(PAYLOAD)
+        response.set_etag("abc")
+        return response
+
+    @app.route("/test/small")
+    def test_small():
+        return jsonify({"ok": True})
+
+    @app.route("/test/stream")
+    def test_stream():
+        chunks = (f"data: {n}\n\n" for n in range(3))
+        return Response(chunks, mimetype="text/event-stream")
+
+
+def test_large_json_is_gzipped(app, client):
+    _add_routes(app)
+
+    response = client.get("/test/large", headers={"Accept-Encoding": "gzip, br;q=0"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.headers["ETag"] == 'W/"abc"'
+    assert int(response.headers["Content-Length"]) == len(response.data)
+    assert gzip.decompress(response.data) == client.get("/test/large").data
+
+    assert "Content-Encoding" not in client.get("/test/large").headers
+    response = client.get("/test/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_stream_is_compressed_per_chunk(app, client):
+    _add_routes(app)
+
+    response = client.get(
+        "/test/stream", headers={"Accept-Encoding": "gzip"}, buffered=False
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+
+    # Each event can be decoded as soon as it arrives
+    decompressor = zlib.decompressobj(31)
+    chunks = response.response
+    assert decompressor.decompress(next(chunks)) == b"data: 0\n\n"
+    assert decompressor.decompress(b"".join(chunks)) == b"data: 1\n\ndata: 2\n\n"
+
+
+def test_negotiation_prefers_configured_order():
+    class Named(GzipEncoder):
+        def __init__(self, name):
+            super().__init__()
+            self.name = name
+
+    compressor = ResponseCompressor([Named("zstd"), Named("br"), Named("gzip")])
+
+    def negotiate(header):
+        return compressor.negotiate(parse_accept_header(header))
+
+    assert negotiate("gzip, deflate, br, zstd") == "zstd"
+    assert negotiate("gzip, br;q=0.9") == "gzip"
+    assert negotiate("*") == "zstd"
+    assert negotiate("identity") is None
+    assert negotiate("gzip;q=0") is None
+
+
+def test_from_config_rejects_unknown_algorithm():
+    with pytest.raises(ValueError):
+        ResponseCompressor.from_config({"COMPRESSION_ALGORITHMS": ["lz4"]})
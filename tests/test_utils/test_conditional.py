@@ -0,0 +1,74 @@
+from datetime import datetime
+
+from bson import ObjectId
+from flask import jsonify
+
+from app.utils.conditional import conditional_response, document_validators
+
+
+def _build(calls):
+    def build():
+        calls.append(True)
+        return jsonify({"ok": True}), 200
+
+    return build
+
+
+def test_document_validators_track_updates():
+    job = {"_id": ObjectId(), "updated_at": datetime(2024, 1, 1, 12, 0, 0, 500)}
+    company = {"_id": ObjectId(), "updated_at": datetime(2024, 1, 2)}
+
+    etag, last_modified = document_validators(job, company)
+    assert last_modified == datetime(2024, 1, 2)
+    assert document_validators(job, company) == (etag, last_modified)
+    assert document_validators(company, job)[0] != etag
+    assert document_validators(job, company, extra=(1, 20))[0] != etag
+
+    company["updated_at"] = datetime(2024, 1, 3)
+    assert document_validators(job, company)[0] != etag
+
+
+def test_conditional_response_if_none_match(app):
+    document = {"_id": ObjectId(), "updated_at": datetime(2024, 1, 1)}
+    calls = []
+
+    with app.test_request_context():
+        response, status_code = conditional_response(_build(calls), document)
+    etag = response.headers["ETag"]
+    assert status_code == 200
+    assert etag.startswith('W/"')
+    assert response.headers["Last-Modified"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+    with app.test_request_context(headers={"If-None-Match": etag}):
+        response = conditional_response(_build(calls), document)
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert len(calls) == 1
+
+    # A changed document no longer matches, even if the date still does
+    document["updated_at"] = datetime(2024, 1, 1, 0, 0, 0, 1000)
+    with app.test_request_context(
+        headers={
+            "If-None-Match": etag,
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+        }
+    ):
+        response, status_code = conditional_response(_build(calls), document)
+    assert status_code == 200
+    assert len(calls) == 2
+
+
+def test_conditional_response_if_modified_since(app):
+    document = {"_id": ObjectId(), "updated_at": datetime(2024, 1, 1, 8, 30, 15, 250)}
+    calls = []
+
+    with app.test_request_context(
+        headers={"If-Modified-Since": "Mon, 01 Jan 2024 08:30:15 GMT"}
+    ):
+        assert conditional_response(_build(calls), document).status_code == 304
+
+    with app.test_request_context(
+        headers={"If-Modified-Since": "Mon, 01 Jan 2024 08:30:14 GMT"}
+    ):
+        assert conditional_response(_build(calls), document)[1] == 200
+    assert len(calls) == 1
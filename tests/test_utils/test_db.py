@@ -1,7 +1,11 @@
+import time
 from datetime import datetime
+from unittest import mock
 
 import pytest
 from bson import ObjectId
+from flask import g
+from pymongo.errors import AutoReconnect, ExecutionTimeout
 
 from app.utils.db import (
     count_documents,
@@ -9,9 +13,14 @@ from app.utils.db import (
     find_by_id,
     find_many,
     find_one,
+    get_circuit_breaker,
+    get_db,
     insert_one,
+    iter_many,
+    mongo_client_options,
     update_one,
 )
+from app.utils.exceptions import CircuitOpenError, DeadlineExceededError
 
 
 def test_insert_one(app, db):
@@ -101,6 +110,36 @@ def test_find_many(app, db):
         assert len(all_docs) >= 5
 
 
+def test_iter_many(app, db):
+    with app.app_context():
+        # Insert test documents
+        collection = "test_stream_collection"
+        for i in range(7):
+            db[collection].insert_one({"name": f"Stream Document {i}", "value": i})
+
+        # Stream single documents with sorting and projection
+        docs = list(
+            iter_many(
+                collection,
+                sort=[("value", 1)],
+                projection={"value": 1},
+                batch_size=2,
+            )
+        )
+        assert [doc["value"] for doc in docs] == list(range(7))
+        assert "name" not in docs[0]
+
+        # Stream in chunks, last chunk holds the remainder
+        chunks = list(iter_many(collection, sort=[("value", 1)], chunk_size=3))
+        assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+        assert chunks[2][0]["value"] == 6
+
+        # Stopping early still works with no_cursor_timeout cursors
+        stream = iter_many(collection, no_cursor_timeout=True)
+        assert next(stream) is not None
+        stream.close()
+
+
 def test_update_one(app, db):
     with app.app_context():
         # Insert test document
@@ -191,3 +230,86 @@ def test_count_documents(app, db):
         # Count with non-matching filter
         count_none = count_documents(collection, {"value": 2})
         assert count_none == 0
+
+
+def test_mongo_client_options():
+    options = mongo_client_options(
+        {
+            "MONGO_MIN_POOL_SIZE": 5,
+            "MONGO_MAX_POOL_SIZE": 20,
+            "MONGO_MAX_IDLE_TIME_MS": 60000,
+            "MONGO_WAIT_QUEUE_TIMEOUT_MS": None,
+            "MONGO_COMPRESSORS": ["zstd", "zlib"],
+            "MONGO_READ_CONCERN": "majority",
+            "MONGO_WRITE_CONCERN": "1",
+        }
+    )
+
+    assert options["minPoolSize"] == 5
+    assert options["maxPoolSize"] == 20
+    assert options["maxIdleTimeMS"] == 60000
+    assert "waitQueueTimeoutMS" not in options
+    assert options["compressors"] == "zstd,zlib"
+    assert options["readConcernLevel"] == "majority"
+    assert options["w"] == 1
+
+
+def test_get_db_reconnects_after_fork(app):
+    app.config["STORAGE_BACKEND"] = "mongodb"
+
+    with app.app_context():
+        inherited_db = app.db
+
+        # Simulate a client created by a parent process before fork()
+        app.mongodb_pid = -1
+        db = get_db()
+
+        assert db is not inherited_db
+        assert app.mongodb_pid != -1
+        assert app.pool_monitor.snapshot()["max_pool_size"] == 50
+        app.mongodb_client.close()
+
+
+def test_queries_respect_request_deadline(app, db):
+    with app.test_request_context():
+        db.deadline_collection.insert_one({"name": "Deadline Document"})
+
+        g.deadline = time.monotonic() + 5
+        assert len(find_many("deadline_collection")) == 1
+
+        # Server-side timeouts surface as deadline errors
+        with mock.patch.object(
+            type(db.deadline_collection),
+            "count_documents",
+            side_effect=ExecutionTimeout("operation exceeded time limit"),
+        ):
+            with pytest.raises(DeadlineExceededError):
+                count_documents("deadline_collection")
+
+        # No new query starts once the deadline has passed
+        g.deadline = time.monotonic() - 1
+        with pytest.raises(DeadlineExceededError):
+            find_one("deadline_collection", {})
+
+
+def test_reads_retry_then_trip_breaker(app, db):
+    app.config.update({"DB_RETRY_BACKOFF_MS": 0, "DB_BREAKER_MIN_CALLS": 4})
+
+    with app.test_request_context():
+        job_id = db.breaker_jobs.insert_one({"title": "Cached Job"}).inserted_id
+        assert find_by_id("breaker_jobs", job_id)["title"] == "Cached Job"
+
+        # Transient errors are retried before failing over to the cache
+        with mock.patch.object(
+            type(db.breaker_jobs), "find_one", side_effect=AutoReconnect("down")
+        ) as find:
+            assert find_by_id("breaker_jobs", job_id)["title"] == "Cached Job"
+            assert find.call_count == 3
+
+        breaker = get_circuit_breaker()
+        assert breaker.state == breaker.OPEN
+
+        # While open, cached documents are served and others fail fast
+        assert find_by_id("breaker_jobs", job_id)["title"] == "Cached Job"
+        with pytest.raises(CircuitOpenError):
+            find_many("breaker_jobs")
@@ -0,0 +1,46 @@
+import pytest
+from flask import jsonify
+
+from app.utils.decorators import get_claims_cache, require_user_type
+
+# Each test adds a route
+pytestmark = pytest.mark.fresh_app
+
+
+def _add_profile_route(app):
+    @app.route("/test/profile")
+    @require_user_type("user")
+    def test_profile(current_user_id, current_user_type):
+        return jsonify({"id": current_user_id, "type": current_user_type})
+
+
+def test_require_user_type_caches_verified_claims(app, client, test_user, user_token):
+    _add_profile_route(app)
+    headers = {"Authorization": f"Bearer {user_token}"}
+
+    for _ in range(3):
+        response = client.get("/test/profile", headers=headers)
+        assert response.status_code == 200
+        assert response.json == {"id": str(test_user["_id"]), "type": "user"}
+
+    # Only the first request verified the signature; the rate limiter and
+    # the route each look the claims up, so every later lookup is a hit
+    cache = get_claims_cache()
+    assert cache.stats() == {"size": 1, "hits": 5, "misses": 1}
+
+
+def test_require_user_type_rejects_cached_wrong_type(app, client, company_token):
+    _add_profile_route(app)
+    headers = {"Authorization": f"Bearer {company_token}"}
+
+    assert client.get("/test/profile", headers=headers).status_code == 403
+    assert client.get("/test/profile", headers=headers).status_code == 403
+
+
+def test_require_user_type_without_cache(app, client, user_token):
+    app.config["JWT_CLAIMS_CACHE_SIZE"] = 0
+    _add_profile_route(app)
+    headers = {"Authorization": f"Bearer {user_token}"}
+
+    assert client.get("/test/profile", headers=headers).status_code == 200
+    assert get_claims_cache() is None
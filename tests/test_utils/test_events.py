@@ -0,0 +1,174 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from flask import jsonify
+from pymongo.errors import OperationFailure
+
+from app.utils.decorators import require_user_type
+from app.utils.events import (
+    STREAM_TOKEN_SCOPE,
+    ChangeStreamSource,
+    EventBroker,
+    event_stream_response,
+    get_event_broker,
+    issue_stream_token,
+    publish_application_status,
+    stream_events,
+)
+from app.utils.exceptions import ServiceUnavailableError
+
+
+def test_broker_delivers_to_topic_subscribers():
+    broker = EventBroker()
+    mine = broker.subscribe("user:1")
+    other = broker.subscribe("user:2")
+
+    assert broker.publish("user:1", "ping", {"n": 1}) == 1
+    assert mine.get(timeout=0) == {"event": "ping", "data": {"n": 1}}
+    assert other.get(timeout=0) is None
+
+    mine.close()
+    other.close()
+    assert broker.publish("user:1", "ping", {"n": 2}) == 0
+    assert broker.snapshot() == {"subscribers": 0, "topics": 0, "published": 2}
+
+
+def test_slow_subscriber_drops_oldest_events():
+    broker = EventBroker(queue_size=2)
+    subscription = broker.subscribe("user:1")
+
+    for n in range(3):
+        broker.publish("user:1", "ping", {"n": n})
+
+    assert subscription.dropped == 1
+    assert subscription.get(timeout=0)["data"] == {"n": 1}
+    assert subscription.get(timeout=0)["data"] == {"n": 2}
+
+
+def test_broker_limits_subscribers():
+    broker = EventBroker(max_subscribers=1)
+    subscription = broker.subscribe("user:1")
+
+    with pytest.raises(ServiceUnavailableError):
+        broker.subscribe("user:2")
+
+    subscription.close()
+    broker.subscribe("user:2")
+
+
+def test_stream_events_formats_sse_and_unsubscribes():
+    broker = EventBroker()
+    subscription = broker.subscribe("user:1")
+    broker.publish("user:1", "application_status", {"status": "accepted"})
+
+    stream = stream_events(subscription, heartbeat=0.01, duration=0.05)
+
+    assert next(stream) == "retry: 3000\n\n"
+    assert next(stream) == (
+        'event: application_status\ndata: {"status": "accepted"}\n\n'
+    )
+    assert next(stream) == ": keep-alive\n\n"
+    assert list(stream)
+    assert broker.subscriber_count == 0
+
+
+def test_publish_application_status(app):
+    user_id = ObjectId()
+    application = {
+        "_id": ObjectId(),
+        "user_id": user_id,
+        "job_id": ObjectId(),
+        "status": "reviewing",
+        "updated_at": datetime(2024, 1, 1),
+    }
+    subscription = get_event_broker().subscribe(f"user:{user_id}")
+
+    assert publish_application_status(application) == 1
+    assert subscription.get(timeout=0)["data"] == {
+        "application_id": str(application["_id"]),
+        "job_id": str(application["job_id"]),
+        "status": "reviewing",
+        "updated_at": "2024-01-01T00:00:00",
+    }
+
+    # The change stream publishes instead
+    app.config["EVENTS_SOURCE"] = "change_stream"
+    assert publish_application_status(application) == 0
+
+    source = ChangeStreamSource(app, get_event_broker())
+    source.handle({"operationType": "update", "fullDocument": application})
+    assert subscription.get(timeout=0)["data"]["status"] == "reviewing"
+
+
+@pytest.mark.fresh_app
+def test_unread_streams_release_their_subscription(app, client):
+    app.config["EVENTS_MAX_SUBSCRIBERS"] = 2
+
+    @app.route("/test/events")
+    def test_events():
+        return event_stream_response("user:1")
+
+    # HEAD never iterates the body; the server closing it must unsubscribe
+    for _ in range(3):
+        response = client.head("/test/events")
+        assert response.status_code == 200
+        response.close()
+    assert get_event_broker().subscriber_count == 0
+
+    response = client.get("/test/events", buffered=False)
+    assert next(response.response) == b"retry: 3000\n\n"
+    assert get_event_broker().subscriber_count == 1
+    response.close()
+    assert get_event_broker().subscriber_count == 0
+
+
+@pytest.mark.fresh_app
+def test_stream_tokens_authenticate_from_the_url(app, client, test_user, user_token):
+    @app.route("/test/events")
+    @require_user_type("user", token_scope=STREAM_TOKEN_SCOPE)
+    def test_events(current_user_id, current_user_type):
+        return jsonify({"id": current_user_id})
+
+    @app.route("/test/profile")
+    @require_user_type("user")
+    def test_profile(current_user_id, current_user_type):
+        return jsonify({"id": current_user_id})
+
+    stream_token = issue_stream_token(test_user["_id"], "user")["token"]
+
+    # EventSource can only pass the token in the URL
+    response = client.get(f"/test/events?jwt={stream_token}")
+    assert response.json == {"id": str(test_user["_id"])}
+    assert client.get("/test/events").status_code == 401
+
+    # Regular tokens still work from the header, but never from the URL
+    headers = {"Authorization": f"Bearer {user_token}"}
+    assert client.get("/test/events", headers=headers).status_code == 200
+    assert client.get(f"/test/events?jwt={user_token}").status_code == 403
+
+    # A stream token opens nothing else
+    headers = {"Authorization": f"Bearer {stream_token}"}
+    assert client.get("/test/profile", headers=headers).status_code == 403
+    assert client.get(f"/test/profile?jwt={stream_token}").status_code == 401
+
+
+def test_standalone_server_falls_back_to_local_events(app, monkeypatch):
+    user_id = ObjectId()
+    application = {"_id": ObjectId(), "user_id": user_id, "status": "accepted"}
+    broker = get_event_broker()
+    app.config["EVENTS_SOURCE"] = "change_stream"
+    subscription = broker.subscribe(f"user:{user_id}")
+
+    class Standalone:
+        def watch(self, *args, **kwargs):
+            raise OperationFailure("not a replica set", code=40573)
+
+    monkeypatch.setattr("app.utils.db.get_db", lambda: {"applications": Standalone()})
+    source = ChangeStreamSource(app, broker)
+    source._run()
+    assert source.available is False
+
+    broker.source = source
+    assert publish_application_status(application) == 1
+    assert subscription.get(timeout=0)["data"]["status"] == "accepted"
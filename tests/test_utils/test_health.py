@@ -0,0 +1,35 @@
+import time
+from unittest import mock
+
+from app.utils.health import HealthMonitor
+from app.utils.pool_monitor import PoolMonitor
+
+
+def test_health_monitor_serves_cached_status(app):
+    monitor = HealthMonitor(app, interval=60)
+    monitor.check()
+
+    with mock.patch.object(monitor, "check") as check:
+        assert monitor.status()["database"] == "connected"
+        check.assert_not_called()
+
+    # A monitor that stopped checking reports a stale status
+    with mock.patch("time.time", return_value=time.time() + 600):
+        assert monitor.status()["database"] == "stale"
+
+
+def test_liveness_and_readiness(app, client):
+    assert client.get("/api/health/live").status_code == 200
+
+    response = client.get("/api/health/ready")
+    assert response.status_code == 200
+    assert response.json["status"] == "ready"
+
+    pool_monitor = PoolMonitor(max_pool_size=2)
+    pool_monitor.in_use = 2
+    app.pool_monitor = pool_monitor
+
+    response = client.get("/api/health/ready")
+    assert response.status_code == 503
+    assert response.json["reasons"] == ["connection pool saturated"]
+    assert client.get("/api/health/live").status_code == 200
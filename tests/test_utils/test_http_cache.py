@@ -0,0 +1,88 @@
+import pytest
+from flask import jsonify
+
+from app.models.company import Company
+from app.models.job import Job
+from app.utils.http_cache import (
+    add_surrogate_keys,
+    cache_policy,
+    company_key,
+    job_key,
+    purge_surrogate_keys,
+    register_purge_hook,
+)
+
+
+def _add_routes(app):
+    @app.route("/test/public/<job_id>")
+    @cache_policy(config_key="CACHE_POLICY_JOB")
+    def test_public(job_id):
+        add_surrogate_keys(job_key(job_id), company_key("c1"), job_key(job_id))
+        if job_id == "missing":
+            return jsonify({"error": "not found"}), 404
+        return jsonify({"id": job_id})
+
+    @app.route("/test/private")
+    @cache_policy("private, no-cache", vary=("Authorization",))
+    def test_private():
+        return jsonify({"ok": True})
+
+
+@pytest.mark.fresh_app
+def test_policy_and_surrogate_keys(app, client):
+    _add_routes(app)
+
+    response = client.get("/test/public/j1")
+    assert response.headers["Cache-Control"] == app.config["CACHE_POLICY_JOB"]
+    assert "s-maxage=" in response.headers["Cache-Control"]
+    assert response.headers["Surrogate-Key"] == "job-j1 company-c1"
+
+    response = client.get("/test/private")
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert "Authorization" in response.headers["Vary"]
+
+
+@pytest.mark.fresh_app
+def test_errors_are_not_cached(app, client):
+    _add_routes(app)
+
+    response = client.get("/test/public/missing")
+    assert response.status_code == 404
+    assert "Cache-Control" not in response.headers
+    assert "Surrogate-Key" not in response.headers
+
+
+@pytest.mark.fresh_app
+def test_policy_can_be_disabled(app, client):
+    _add_routes(app)
+    app.config["HTTP_CACHE_ENABLED"] = False
+
+    response = client.get("/test/public/j1")
+    assert "Cache-Control" not in response.headers
+    assert "Surrogate-Key" not in response.headers
+
+
+def test_model_writes_purge_keys(app, test_job):
+    purged = []
+    register_purge_hook(app, purged.extend)
+
+    Job.update(test_job["_id"], {"title": "Senior Test Job"})
+    assert purged == ["jobs", f"job-{test_job['_id']}"]
+
+    purged.clear()
+    Company.update(test_job["company_id"], {"name": "Renamed Company"})
+    Company.add_job(test_job["company_id"], "5f0000000000000000000001")
+    assert purged == [f"company-{test_job['company_id']}"] * 2
+
+
+def test_failing_hook_does_not_break_purge(app):
+    purged = []
+
+    def broken(keys):
+        raise RuntimeError("CDN down")
+
+    register_purge_hook(app, broken)
+    register_purge_hook(app, purged.extend)
+
+    purge_surrogate_keys(["jobs"])
+    assert purged == ["jobs"]
@@ -0,0 +1,141 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import jsonify, request
+
+from app.utils.idempotency import (
+    MongoIdempotencyStore,
+    idempotent,
+    remember_for_replay,
+)
+from app.utils.response_helpers import success_response
+
+# Each test adds routes
+pytestmark = pytest.mark.fresh_app
+
+
+def _add_routes(app, calls, release=None):
+    @app.route("/test/orders", methods=["POST"])
+    @idempotent()
+    def test_create_order():
+        calls.append(request.get_json())
+        if release is not None:
+            release.wait(5)
+        if request.get_json().get("fail"):
+            return jsonify({"error": "boom"}), 500
+        return jsonify({"order": len(calls)}), 201
+
+
+def _post(client, key, body):
+    return client.post("/test/orders", json=body, headers={"Idempotency-Key": key})
+
+
+@pytest.mark.parametrize("store", ["mongo", "memory"])
+def test_retry_replays_first_response(app, client, store):
+    app.config["IDEMPOTENCY_STORE"] = store
+    calls = []
+    _add_routes(app, calls)
+
+    first = _post(client, "key-1", {"item": "a"})
+    retry = _post(client, "key-1", {"item": "a"})
+    assert first.status_code == retry.status_code == 201
+    assert retry.get_json() == first.get_json() == {"order": 1}
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert len(calls) == 1
+
+    # Another key, or none, runs the route again
+    assert _post(client, "key-2", {"item": "a"}).get_json() == {"order": 2}
+    assert client.post("/test/orders", json={"item": "a"}).get_json() == {"order": 3}
+
+
+def test_key_reused_with_another_body(app, client):
+    calls = []
+    _add_routes(app, calls)
+
+    _post(client, "key-1", {"item": "a"})
+    response = _post(client, "key-1", {"item": "b"})
+    assert response.status_code == 422
+    assert response.get_json()["error"] == "idempotency_key_reused"
+    assert len(calls) == 1
+
+
+def test_credentials_are_not_stored(app, client, db):
+    @app.route("/test/register", methods=["POST"])
+    @idempotent(
+        redact=("access_token",),
+        restore=lambda context: {"access_token": f"new-{context['user_id']}"},
+    )
+    def test_register():
+        remember_for_replay(user_id="u1")
+        return success_response({"user": "u1", "access_token": "secret"}, 201)
+
+    headers = {"Idempotency-Key": "key-1"}
+    first = client.post("/test/register", json={}, headers=headers)
+    assert first.get_json()["data"]["access_token"] == "secret"
+
+    stored = db.idempotency_keys.find_one()
+    assert "secret" not in stored["body"]
+    assert stored["context"] == {"user_id": "u1"}
+
+    retry = client.post("/test/register", json={}, headers=headers)
+    assert retry.status_code == 201
+    assert retry.get_json()["data"] == {"user": "u1", "access_token": "new-u1"}
+
+
+def test_server_errors_are_not_replayed(app, client):
+    calls = []
+    _add_routes(app, calls)
+
+    assert _post(client, "key-1", {"fail": True}).status_code == 500
+    assert _post(client, "key-1", {"fail": True}).status_code == 500
+    assert len(calls) == 2
+
+
+def test_concurrent_duplicate_waits_for_first(app):
+    calls = []
+    release = threading.Event()
+    _add_routes(app, calls, release)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(_post, app.test_client(), "key-1", {"item": "a"})
+        while not calls:
+            time.sleep(0.001)
+        duplicate = pool.submit(_post, app.test_client(), "key-1", {"item": "a"})
+        time.sleep(0.1)
+        release.set()
+
+    assert first.result().get_json() == duplicate.result().get_json()
+    assert duplicate.result().headers["Idempotent-Replayed"] == "true"
+    assert len(calls) == 1
+
+
+def test_duplicate_gives_up_after_wait(app):
+    app.config["IDEMPOTENCY_WAIT_SECONDS"] = 0.1
+    calls = []
+    release = threading.Event()
+    _add_routes(app, calls, release)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        first = pool.submit(_post, app.test_client(), "key-1", {"item": "a"})
+        while not calls:
+            time.sleep(0.001)
+        response = _post(app.test_client(), "key-1", {"item": "a"})
+        release.set()
+
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+    assert first.result().status_code == 201
+
+
+def test_stale_lock_is_taken_over(app):
+    store = MongoIdempotencyStore()
+
+    assert store.claim("key", "fingerprint", lock_seconds=60) is None
+    assert store.claim("key", "fingerprint", lock_seconds=60)["state"] == "in_progress"
+
+    # The holder died without completing: its lock expires
+    assert store.claim("other", "fingerprint", lock_seconds=-1) is None
+    assert store.claim("other", "fingerprint", lock_seconds=60) is None
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.utils.db import find_one, insert_one, update_one
+from app.utils.invalidation import InvalidationBus, get_invalidation_bus
+
+
+def test_local_writes_invalidate_fallback_cache(app, db):
+    job_id = insert_one("jobs", {"title": "Cached Job"})
+    user_id = insert_one("users", {"email": "cached@example.com"})
+    find_one("jobs", {"_id": job_id})
+    find_one("users", {"_id": user_id})
+
+    cache = app.extensions["db_fallback_cache"]
+    assert len(cache) == 2
+    assert get_invalidation_bus().mode == "local"
+
+    update_one("jobs", job_id, {"title": "Renamed Job"})
+    assert len(cache) == 1
+    assert cache.get(("users", repr({"_id": user_id}), repr(None))) is not None
+
+
+def test_bus_fans_out_change_stream_events(app):
+    bus = InvalidationBus(app, source="local")
+    changes = []
+    bus.register(
+        lambda collection, document_id: changes.append((collection, document_id))
+    )
+    bus.register(lambda collection, document_id: 1 / 0, collections=["jobs"])
+
+    job_id = ObjectId()
+    bus.handle_change(
+        {
+            "operationType": "update",
+            "ns": {"coll": "jobs"},
+            "documentKey": {"_id": job_id},
+        }
+    )
+    bus.handle_change({"operationType": "drop", "ns": {"coll": "companies"}})
+    bus.handle_change({"operationType": "invalidate"})
+
+    assert changes == [
+        ("jobs", job_id),
+        ("companies", None),
+        ("jobs", None),
+        ("companies", None),
+        ("users", None),
+    ]
+
+
+def test_bus_polls_updated_at(app, db):
+    bus = InvalidationBus(app, source="poll", poll_overlap=0)
+    changes = []
+    bus.register(
+        lambda collection, document_id: changes.append((collection, document_id))
+    )
+
+    bus.poll()
+    assert changes == []
+
+    # Written by another worker, so only polling can see it
+    updated_at = datetime.utcnow() + timedelta(seconds=1)
+    company_id = db.companies.insert_one({"updated_at": updated_at}).inserted_id
+    bus.poll()
+    assert changes == [("companies", company_id)]
+
+    bus.poll()
+    assert changes == [("companies", company_id)]
@@ -0,0 +1,59 @@
+import pytest
+from flask import jsonify
+
+from app.utils.load_shedding import AdaptiveConcurrencyLimiter, priority
+
+
+def test_low_priority_shed_first():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, min_limit=1)
+
+    assert limiter.try_acquire("low")
+    assert limiter.try_acquire("low")
+    assert not limiter.try_acquire("low")
+
+    assert limiter.try_acquire("high")
+    assert limiter.try_acquire("high")
+    assert not limiter.try_acquire("high")
+
+    # Critical routes are always admitted
+    assert limiter.try_acquire("critical")
+    assert limiter.snapshot()["shed"] == 2
+
+
+def test_limit_follows_latency():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=20, min_limit=4, max_limit=40)
+
+    for _ in range(50):
+        limiter.try_acquire()
+        limiter.release(10)
+    assert limiter.limit == 20
+
+    # Saturated at steady latency: the limit grows
+    for _ in range(20):
+        limiter.in_flight = int(limiter.limit)
+        limiter.release(10)
+    assert limiter.limit > 20
+
+    # Latency spikes: the limit shrinks
+    grown = limiter.limit
+    for _ in range(10):
+        limiter.try_acquire()
+        limiter.release(500)
+    assert limiter.limit < grown * 0.6
+
+
+@pytest.mark.fresh_app
+def test_shed_request_gets_503(app, client):
+    @app.route("/test/search")
+    @priority("low")
+    def test_search():
+        return jsonify({"ok": True})
+
+    limiter = app.extensions["concurrency_limiter"]
+    assert client.get("/test/search").status_code == 200
+    assert limiter.in_flight == 0
+
+    limiter.in_flight = int(limiter.limit)
+    response = client.get("/test/search")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
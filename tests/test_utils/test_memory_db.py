@@ -0,0 +1,151 @@
+import datetime
+import re
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from app.utils.memory_db import MemoryClient
+
+
+@pytest.fixture
+def collection():
+    collection = MemoryClient()["test"]["jobs"]
+    collection.insert_many(
+        [
+            {"title": "Python Developer", "salary": 50000, "skills": ["python"]},
+            {"title": "Java Developer", "salary": 45000, "skills": ["java", "sql"]},
+            {"title": "Data Engineer", "salary": 60000, "skills": ["python", "sql"]},
+            {"title": "Designer", "salary": 40000, "status": "closed"},
+        ]
+    )
+    return collection
+
+
+def titles(cursor):
+    return [doc["title"] for doc in cursor]
+
+
+def test_memory_collection_queries(collection):
+    assert titles(collection.find({"skills": "python"})) == [
+        "Python Developer",
+        "Data Engineer",
+    ]
+    assert titles(collection.find({"salary": {"$gte": 50000}})) == [
+        "Python Developer",
+        "Data Engineer",
+    ]
+    assert titles(
+        collection.find(
+            {
+                "$or": [
+                    {"title": {"$regex": "java", "$options": "i"}},
+                    {"status": {"$exists": True}},
+                ]
+            }
+        )
+    ) == ["Java Developer", "Designer"]
+    assert titles(collection.find({"title": re.compile("^D")})) == [
+        "Data Engineer",
+        "Designer",
+    ]
+    assert titles(collection.find({"skills": {"$all": ["python", "sql"]}})) == [
+        "Data Engineer"
+    ]
+    assert titles(collection.find({"status": None, "skills": {"$size": 1}})) == [
+        "Python Developer"
+    ]
+    assert collection.count_documents({"skills": {"$in": ["sql"]}}) == 2
+    assert collection.count_documents({"skills": {"$nin": ["sql"]}}) == 2
+
+
+def test_memory_cursor_sort_skip_limit_and_projection(collection):
+    cursor = collection.find({}, {"title": 1, "_id": 0}).sort("salary", -1)
+
+    assert list(cursor.skip(1).limit(2)) == [
+        {"title": "Python Developer"},
+        {"title": "Java Developer"},
+    ]
+
+
+def test_memory_collection_returns_copies(collection):
+    document = collection.find_one({"title": "Designer"})
+    document["salary"] = 0
+
+    assert collection.find_one({"title": "Designer"})["salary"] == 40000
+
+
+def test_memory_indexes(collection):
+    collection.create_index("skills")
+    collection.create_index("title", unique=True)
+
+    assert collection.count_documents({"skills": "sql"}) == 2
+    assert "title_1" in collection.index_information()
+
+    with pytest.raises(DuplicateKeyError):
+        collection.insert_one({"title": "Designer"})
+
+    collection.update_one({"title": "Designer"}, {"$push": {"skills": "sql"}})
+    assert collection.count_documents({"skills": "sql"}) == 3
+
+    collection.delete_one({"title": "Java Developer"})
+    assert collection.count_documents({"skills": "sql"}) == 2
+
+
+def test_memory_update_operators(collection):
+    result = collection.update_one(
+        {"title": "Python Developer"},
+        {
+            "$set": {"location.city": "Paris"},
+            "$inc": {"salary": 1000},
+            "$addToSet": {"skills": {"$each": ["python", "flask"]}},
+            "$unset": {"status": ""},
+        },
+    )
+    document = collection.find_one({"title": "Python Developer"})
+
+    assert result.modified_count == 1
+    assert document["location"] == {"city": "Paris"}
+    assert document["salary"] == 51000
+    assert document["skills"] == ["python", "flask"]
+
+    collection.update_many({}, {"$pull": {"skills": "sql"}})
+    assert collection.count_documents({"skills": "sql"}) == 0
+
+    result = collection.update_one(
+        {"title": "Tester"}, {"$setOnInsert": {"salary": 30000}}, upsert=True
+    )
+    assert result.upserted_id is not None
+    assert collection.find_one({"title": "Tester"})["salary"] == 30000
+
+
+def test_memory_aggregate(collection):
+    result = list(
+        collection.aggregate(
+            [
+                {"$unwind": "$skills"},
+                {"$group": {"_id": "$skills", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}},
+            ]
+        )
+    )
+
+    assert result == [
+        {"_id": "python", "count": 2},
+        {"_id": "sql", "count": 2},
+        {"_id": "java", "count": 1},
+    ]
+
+
+def test_memory_ttl_index(collection):
+    collection.create_index("created_at", expireAfterSeconds=60)
+    collection.TTL_SWEEP_INTERVAL = 0
+    collection.insert_one(
+        {
+            "title": "Expired",
+            "created_at": datetime.datetime.utcnow() - datetime.timedelta(minutes=5),
+        }
+    )
+    collection.insert_one({"title": "Fresh", "created_at": datetime.datetime.utcnow()})
+
+    assert collection.find_one({"title": "Expired"}) is None
+    assert collection.find_one({"title": "Fresh"}) is not None
@@ -0,0 +1,110 @@
+import time
+
+import pytest
+from flask import jsonify
+
+from app import create_app
+from app.utils.rate_limit import (
+    SharedMemoryBackend,
+    get_client_key,
+    parse_limit,
+    rate_limit,
+)
+from config import get_config
+
+
+def test_parse_limit():
+    assert parse_limit("100/minute") == (100, 100 / 60)
+    assert parse_limit("5 per second") == (5, 5)
+    with pytest.raises(ValueError):
+        parse_limit("fast")
+
+
+def test_token_bucket_refills():
+    backend = SharedMemoryBackend(slots=16)
+
+    assert backend.hit("login:ip:1", 2, 1000).allowed
+    assert backend.hit("login:ip:1", 2, 1000).remaining == 0
+    # A separate bucket for another client
+    assert backend.hit("login:ip:2", 2, 1000).allowed
+
+    backend = SharedMemoryBackend(slots=16)
+    backend.hit("login:ip:1", 1, 0.5)
+    result = backend.hit("login:ip:1", 1, 0.5)
+    assert not result.allowed
+    assert result.retry_after == 2
+
+
+def test_colliding_keys_keep_their_own_buckets():
+    backend = SharedMemoryBackend(slots=16)
+    capacity, rate = parse_limit("5/minute")
+
+    first = "auth.login_user:ip:10.0.0.12"
+    start = backend._locate(first)[0]
+    second = next(
+        key
+        for key in (f"auth.login_user:ip:10.0.1.{n}" for n in range(1000))
+        if backend._locate(key)[0] == start
+    )
+
+    for _ in range(5):
+        assert backend.hit(first, capacity, rate).allowed
+        assert backend.hit(second, capacity, rate).allowed
+    assert not backend.hit(first, capacity, rate).allowed
+    assert not backend.hit(second, capacity, rate).allowed
+
+
+def test_full_table_refuses_new_keys():
+    backend = SharedMemoryBackend(slots=2)
+    capacity, rate = parse_limit("5/minute")
+
+    assert backend.hit("ip:1", capacity, rate).allowed
+    assert backend.hit("ip:2", capacity, rate).allowed
+    result = backend.hit("ip:3", capacity, rate)
+    assert not result.allowed
+    assert result.retry_after == 1
+
+    # A bucket that has refilled completely can be reused
+    backend = SharedMemoryBackend(slots=1)
+    assert backend.hit("ip:1", 5, 1000).allowed
+    time.sleep(0.01)
+    assert backend.hit("ip:2", 5, 1000).allowed
+
+
+@pytest.mark.fresh_app
+def test_rate_limited_route(app, client, user_token):
+    @app.route("/test/limited")
+    @rate_limit("2/minute")
+    def test_limited():
+        return jsonify({"ok": True})
+
+    for remaining in (1, 0):
+        response = client.get("/test/limited")
+        assert response.status_code == 200
+        assert response.headers["X-RateLimit-Remaining"] == str(remaining)
+
+    response = client.get("/test/limited")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+
+    # Authenticated users get their own bucket
+    headers = {"Authorization": f"Bearer {user_token}"}
+    assert client.get("/test/limited", headers=headers).status_code == 200
+
+    # Health checks are never limited
+    assert "X-RateLimit-Limit" not in client.get("/api/health").headers
+
+
+@pytest.mark.parametrize("hops, client_ip", [(0, "127.0.0.1"), (1, "203.0.113.7")])
+def test_client_ip_behind_trusted_proxies(monkeypatch, hops, client_ip):
+    monkeypatch.setattr(get_config(), "TRUSTED_PROXY_HOPS", hops)
+    app = create_app()
+
+    @app.route("/test/client")
+    def test_client():
+        return jsonify({"key": get_client_key()})
+
+    # Only the entry added by the trusted proxy counts, not what clients send
+    headers = {"X-Forwarded-For": "10.6.6.6, 203.0.113.7"}
+    response = app.test_client().get("/test/client", headers=headers)
+    assert response.json == {"key": f"ip:{client_ip}"}
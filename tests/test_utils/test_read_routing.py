@@ -0,0 +1,126 @@
+from unittest import mock
+
+import pytest
+from bson import Timestamp
+from flask import g
+from pymongo.read_preferences import Primary, SecondaryPreferred
+
+from app.models.job import Job
+from app.utils import db as db_module
+from app.utils.db import end_session, find_by_id, get_session, update_one
+
+
+class SessionStandIn:
+    """Causally consistent session of a replica set, for mongomock tests"""
+
+    def __init__(self):
+        self.cluster_time = None
+        self.operation_time = None
+        self.ended = False
+
+    def advance_cluster_time(self, cluster_time):
+        self.cluster_time = cluster_time
+
+    def advance_operation_time(self, operation_time):
+        self.operation_time = operation_time
+
+    def end_session(self):
+        self.ended = True
+
+
+class RecordingCollection:
+    """Forward calls to mongomock, recording read preference and session"""
+
+    def __init__(self, collection, read_preference, calls):
+        self._collection = collection
+        self._read_preference = read_preference
+        self._calls = calls
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+
+        def call(*args, session=None, **kwargs):
+            self._calls.append((name, self._read_preference, session))
+            return method(*args, **kwargs)
+
+        return call
+
+
+@pytest.fixture
+def replica_set(app):
+    """Route db helpers through recording collections and stand-in sessions"""
+    calls = []
+    sessions = []
+
+    def collection(db, name, read_preference=None):
+        return RecordingCollection(db[name], read_preference, calls)
+
+    def start_session(causal_consistency=False):
+        assert causal_consistency
+        sessions.append(SessionStandIn())
+        return sessions[-1]
+
+    with mock.patch.object(db_module, "_collection", side_effect=collection):
+        with mock.patch.object(
+            type(app.mongodb_client), "start_session", side_effect=start_session
+        ):
+            yield calls, sessions
+
+
+def test_read_preference_options(app):
+    with app.app_context():
+        preference = db_module._read_preference("secondaryPreferred")
+        assert isinstance(preference, SecondaryPreferred)
+        assert preference.max_staleness == 90
+        assert isinstance(db_module._read_preference("primary"), Primary)
+
+        app.config["MONGO_SECONDARY_READS"] = False
+        assert db_module._read_preference("secondaryPreferred") is None
+
+
+def test_search_reads_from_secondaries(app, replica_set):
+    calls, _ = replica_set
+
+    with app.test_request_context():
+        Job.search({"title": "Python"})
+        Job.count({"title": "Python"})
+
+    assert [(name, pref) for name, pref, _ in calls] == [
+        ("find", "secondaryPreferred"),
+        ("count_documents", "secondaryPreferred"),
+    ]
+
+
+def test_causal_session_read_your_writes(app, db, replica_set):
+    calls, sessions = replica_set
+    user_id = db.users.insert_one({"first_name": "Test"}).inserted_id
+
+    with app.test_request_context():
+        # Anonymous requests run without a session
+        assert get_session() is None
+
+        g.jwt_claims = {"sub": str(user_id)}
+        update_one("users", user_id, {"first_name": "Updated"})
+        assert find_by_id("users", user_id)["first_name"] == "Updated"
+
+        # The write and the read share one causally consistent session
+        assert [session for _, _, session in calls] == [sessions[0]] * 2
+
+        sessions[0].cluster_time = {"clusterTime": Timestamp(100, 1)}
+        sessions[0].operation_time = Timestamp(100, 1)
+        end_session()
+        assert sessions[0].ended
+
+    # The user's next request continues from the last write it saw
+    with app.test_request_context():
+        g.jwt_claims = {"sub": str(user_id)}
+        assert get_session().operation_time == Timestamp(100, 1)
+
+
+def test_sessions_unavailable_on_standalone_stand_in(app):
+    with app.test_request_context():
+        g.jwt_claims = {"sub": "user"}
+
+        # mongomock has no sessions: operations run without one
+        assert get_session() is None
+        assert app.extensions["db_sessions_supported"] is False
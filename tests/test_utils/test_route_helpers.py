@@ -0,0 +1,64 @@
+import pytest
+from bson import ObjectId
+
+from app.models.company import Company
+from app.models.user import User
+from app.utils.exceptions import DatabaseError
+from app.utils.route_helpers import populate_applications_data, populate_jobs_data
+
+
+@pytest.mark.parametrize("max_workers", [0, 4])
+def test_populate_applications_data(app, test_application, test_job, max_workers):
+    with app.app_context():
+        app.config["HYDRATION_MAX_WORKERS"] = max_workers
+
+        applications = populate_applications_data(
+            [dict(test_application), dict(test_application)]
+        )
+
+        for application in applications:
+            assert application["job"]["_id"] == test_job["_id"]
+            assert application["job"]["company"]["name"] == "Test Company"
+            assert "password" not in application["job"]["company"]
+            assert application["user"]["email"] == "test@example.com"
+            assert "password" not in application["user"]
+
+        # Rows never share a mutable job document
+        assert applications[0]["job"] is not applications[1]["job"]
+
+
+def test_populate_jobs_data_missing_company(app, test_job):
+    with app.app_context():
+        app.config["HYDRATION_MAX_WORKERS"] = 4
+        orphan = {"title": "Orphan", "company_id": ObjectId()}
+
+        jobs = populate_jobs_data([dict(test_job), orphan])
+
+        assert jobs[0]["company"]["name"] == "Test Company"
+        assert "company" not in jobs[1]
+
+
+def test_populate_jobs_data_reuses_companies(app, test_job, monkeypatch):
+    with app.app_context():
+        companies = Company.find_by_ids([test_job["company_id"]])
+        monkeypatch.setattr(Company, "find_by_id", None)
+
+        jobs = populate_jobs_data([dict(test_job)], companies)
+
+        assert jobs[0]["company"]["name"] == "Test Company"
+        assert "password" not in jobs[0]["company"]
+
+
+def test_populate_applications_data_propagates_errors(
+    app, test_application, monkeypatch
+):
+    with app.app_context():
+        app.config["HYDRATION_MAX_WORKERS"] = 4
+
+        def failing_find_by_id(item_id):
+            raise DatabaseError("lookup failed")
+
+        monkeypatch.setattr(User, "find_by_id", failing_find_by_id)
+
+        with pytest.raises(DatabaseError):
+            populate_applications_data([dict(test_application)])
@@ -1,9 +1,14 @@
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
 
 import jwt
 import pytest
 from bson import ObjectId
 
+from app.utils import security
+from app.utils.exceptions import ServiceUnavailableError
 from app.utils.security import generate_token, hash_password, verify_password
 
 
@@ -38,6 +43,77 @@ def test_verify_password():
     assert verify_password("another_wrong_password", hashed) is False
 
 
+def test_hash_password_in_process_pool(app):
+    with app.app_context():
+        app.config.update(
+            {"PASSWORD_HASH_POOL_SIZE": 1, "PASSWORD_HASH_QUEUE_LIMIT": 0}
+        )
+
+        hashed = hash_password("pool_password")
+        assert verify_password("pool_password", hashed) is True
+        assert verify_password("wrong_password", hashed) is False
+
+        # With every slot taken, requests fail fast instead of queueing
+        pool, slots = security._get_hash_pool()
+        assert slots.acquire(blocking=False)
+        try:
+            with pytest.raises(ServiceUnavailableError):
+                hash_password("pool_password")
+            with pytest.raises(ServiceUnavailableError):
+                verify_password("pool_password", hashed)
+        finally:
+            slots.release()
+
+
+def test_timed_out_hash_keeps_its_slot(app, monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    running = Future()
+    running.set_running_or_notify_cancel()
+
+    class StuckPool:
+        def submit(self, fn, *args):
+            return running
+
+    monkeypatch.setattr(security, "_get_hash_pool", lambda: (StuckPool(), slots))
+    app.config["PASSWORD_HASH_TIMEOUT"] = 0.01
+
+    with pytest.raises(ServiceUnavailableError, match="timed out"):
+        hash_password("pool_password")
+
+    # The job still runs in the pool, so its slot is not handed out again
+    with pytest.raises(ServiceUnavailableError, match="capacity"):
+        hash_password("pool_password")
+
+    running.set_result("hash")
+    assert slots.acquire(blocking=False)
+
+
+@pytest.mark.parametrize("fails_on", ["submit", "result"])
+def test_broken_pool_is_unavailable_not_invalid(app, monkeypatch, fails_on):
+    slots = threading.BoundedSemaphore(1)
+    resets = []
+
+    class BrokenPool:
+        def submit(self, fn, *args):
+            if fails_on == "submit":
+                raise BrokenProcessPool("worker died")
+            crashed = Future()
+            crashed.set_exception(BrokenProcessPool("worker died"))
+            return crashed
+
+    monkeypatch.setattr(security, "_get_hash_pool", lambda: (BrokenPool(), slots))
+    monkeypatch.setattr(security, "_reset_hash_pool", lambda: resets.append(True))
+
+    # A correct password must not come back as invalid credentials
+    with pytest.raises(ServiceUnavailableError):
+        verify_password("pool_password", "hash")
+    with pytest.raises(ServiceUnavailableError):
+        hash_password("pool_password")
+
+    assert len(resets) == 2
+    assert slots.acquire(blocking=False)
+
+
 def test_generate_token(app):
     with app.app_context():
         # Test token generation for user
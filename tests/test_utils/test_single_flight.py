@@ -0,0 +1,113 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import g
+
+from app.utils.exceptions import DeadlineExceededError
+from app.utils.single_flight import SingleFlight, coalesce, get_single_flight
+
+
+def _blocking_load(started, release, result):
+    calls = []
+
+    def load():
+        calls.append(True)
+        started.set()
+        release.wait(5)
+        if isinstance(result, Exception):
+            raise result
+        return {"_id": "j1", "company": {"name": "Acme"}}
+
+    return load, calls
+
+
+def _run_concurrently(group, key, load, callers, started, release):
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        leader = pool.submit(group.do, key, load)
+        started.wait(5)
+        followers = [pool.submit(group.do, key, load) for _ in range(callers - 1)]
+
+        # Followers are waiting once all of them are counted
+        while group.snapshot()["coalesced"] < callers - 1:
+            time.sleep(0.001)
+        release.set()
+    return leader, followers
+
+
+def test_concurrent_loads_are_coalesced():
+    group = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    load, calls = _blocking_load(started, release, None)
+
+    leader, followers = _run_concurrently(group, "job", load, 5, started, release)
+
+    results = [leader.result()] + [future.result() for future in followers]
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+    assert len({id(result) for result in results}) == 5
+
+    # Each caller owns its copy
+    results[1]["company"]["name"] = "Changed"
+    assert results[0]["company"]["name"] == "Acme"
+
+    snapshot = group.snapshot()
+    assert snapshot["executions"] == 1
+    assert snapshot["coalesced"] == 4
+    assert snapshot["max_waiters"] == 4
+    assert snapshot["in_flight"] == 0
+
+    # Nothing is cached once the call completes
+    group.do("job", load)
+    assert len(calls) == 2
+
+
+def test_errors_reach_every_caller():
+    group = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    load, calls = _blocking_load(started, release, LookupError("not found"))
+
+    leader, followers = _run_concurrently(group, "job", load, 3, started, release)
+
+    for future in [leader] + followers:
+        with pytest.raises(LookupError):
+            future.result()
+    assert len(calls) == 1
+    assert group.snapshot()["errors"] == 1
+
+
+def test_follower_gives_up_at_its_deadline(app):
+    group = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    load, calls = _blocking_load(started, release, None)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        leader = pool.submit(group.do, "job", load)
+        started.wait(5)
+
+        with app.test_request_context():
+            g.deadline = time.monotonic() + 0.05
+            with pytest.raises(DeadlineExceededError):
+                group.do("job", load)
+        release.set()
+
+    # The leader is unaffected
+    assert leader.result()["_id"] == "j1"
+    assert len(calls) == 1
+
+
+def test_distinct_keys_are_not_coalesced():
+    group = SingleFlight()
+
+    assert group.do("a", lambda: 1) == 1
+    assert group.do("b", lambda: 2) == 2
+    assert group.snapshot()["executions"] == 2
+    assert group.snapshot()["coalesced"] == 0
+
+
+def test_coalesce_can_be_disabled(app):
+    app.config["SINGLE_FLIGHT_ENABLED"] = False
+
+    assert coalesce("job", lambda: 1) == 1
+    assert get_single_flight().snapshot()["executions"] == 0
@@ -0,0 +1,41 @@
+import time
+
+import pytest
+
+from app.utils.token_store import (
+    MemoryRevocationStore,
+    MongoRevocationStore,
+    get_revocation_store,
+)
+
+
+@pytest.mark.parametrize("store_class", [MemoryRevocationStore, MongoRevocationStore])
+def test_revoke_once(app, store_class):
+    with app.app_context():
+        store = store_class()
+        expires_at = time.time() + 3600
+
+        assert store.is_revoked("token-1") is False
+
+        # First use of a refresh token succeeds, replays are rejected
+        assert store.revoke("token-1", expires_at) is True
+        assert store.revoke("token-1", expires_at) is False
+        assert store.is_revoked("token-1") is True
+        assert store.is_revoked("token-2") is False
+
+
+def test_memory_store_forgets_expired_tokens():
+    store = MemoryRevocationStore()
+
+    assert store.revoke("expired", time.time() - 1) is True
+    assert store.is_revoked("expired") is False
+
+
+def test_get_revocation_store_uses_config(app):
+    with app.app_context():
+        app.extensions.pop("token_revocation_store", None)
+        app.config["TOKEN_REVOCATION_STORE"] = "memory"
+
+        store = get_revocation_store()
+        assert isinstance(store, MemoryRevocationStore)
+        assert get_revocation_store() is store